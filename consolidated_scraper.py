@@ -12,7 +12,17 @@ import asyncio
 import argparse
 import subprocess
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+# Seconds a bank script may run before it is stopped
+DEFAULT_SCRIPT_TIMEOUT = 300
+
+# BDO allows one request every 10 seconds (robots.txt). A full crawl is up to
+# 100 Show More clicks plus one detail page per listed property; the limit
+# leaves twice the time that many requests need at the crawl delay.
+BDO_CRAWL_DELAY = 10
+BDO_EXPECTED_REQUESTS = 100 + 1500
+BDO_SCRIPT_TIMEOUT = 2 * BDO_CRAWL_DELAY * BDO_EXPECTED_REQUESTS
 
 class ConsolidatedScraper:
     """Consolidated scraper for all Philippine banks."""
@@ -29,7 +39,11 @@ class ConsolidatedScraper:
                 "description": "Bank of the Philippine Islands",
                 "status": "✅ Working (Automated)",
                 "scraper_type": "automated",
-                "script": "foreclosed_scraper/scrapers/bdo_scraper.py"
+                "script": "foreclosed_scraper/scrapers/bdo_scraper.py",
+                # Unattended: headless, assets blocked, exits on its own.
+                # The Show More crawl easily outlasts the default timeout.
+                "args": ["--headless"],
+                "timeout": BDO_SCRIPT_TIMEOUT
             },
             "bpi": {
                 "name": "BPI",
@@ -80,11 +94,18 @@ class ConsolidatedScraper:
             print(f"   Type: {bank_info['scraper_type']}")
             print()
     
-    def run_script(self, script_path: str) -> bool:
-        """Run a Python script and return success status."""
+    def run_script(self, script_path: str, args: Optional[List[str]] = None,
+                   timeout: Optional[int] = DEFAULT_SCRIPT_TIMEOUT) -> bool:
+        """Run a Python script and return success status.
+        
+        Args:
+            script_path: Path of the script
+            args: Command-line arguments for the script
+            timeout: Seconds before the script is stopped; None waits forever
+        """
         try:
-            result = subprocess.run([sys.executable, script_path], 
-                                  capture_output=True, text=True, timeout=300)
+            result = subprocess.run([sys.executable, script_path] + (args or []), 
+                                  capture_output=True, text=True, timeout=timeout)
             if result.returncode == 0:
                 print(f"✅ Script {script_path} completed successfully")
                 if result.stdout:
@@ -96,7 +117,7 @@ class ConsolidatedScraper:
                     print(f"Error: {result.stderr}")
                 return False
         except subprocess.TimeoutExpired:
-            print(f"❌ Script {script_path} timed out")
+            print(f"❌ Script {script_path} timed out after {timeout} seconds")
             return False
         except Exception as e:
             print(f"❌ Error running script {script_path}: {e}")
@@ -120,7 +141,11 @@ class ConsolidatedScraper:
             return False
         
         # Run the script
-        success = self.run_script(script_path)
+        success = self.run_script(
+            script_path,
+            args=bank_info.get("args"),
+            timeout=bank_info.get("timeout", DEFAULT_SCRIPT_TIMEOUT)
+        )
         
         if success:
             print(f"✅ Successfully completed {bank_info['name']} scraping")
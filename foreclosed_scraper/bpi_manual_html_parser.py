@@ -8,23 +8,110 @@ This bypasses Cloudflare protection by using HTML files saved manually by the us
 import os
 import json
 import re
+import hashlib
+import tarfile
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+
+try:
+    from .utils.json_stream import StreamingJSONWriter
+    from .utils.bpi_fields import DETAIL_REGIONS, extract_detail_fields
+    from .utils.config import HTML_PARSER
+    from .utils.html_parsing import HTML_PARSERS, HTML_PARSING_VERSION, only_classes, parse_html, parsed_html, resolve_parser
+    from .utils.pdf_cache import parser_version
+except ImportError:
+    from utils.json_stream import StreamingJSONWriter
+    from utils.bpi_fields import DETAIL_REGIONS, extract_detail_fields
+    from utils.config import HTML_PARSER
+    from utils.html_parsing import HTML_PARSERS, HTML_PARSING_VERSION, only_classes, parse_html, parsed_html, resolve_parser
+    from utils.pdf_cache import parser_version
+
+# Search results pages are parsed only inside their property containers
+RESULTS_REGIONS = only_classes('result-each')
+
+
+def _sha256_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Archive formats read directly, without unpacking them to disk
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz')
+
+# Pages saved by a browser; members under "<page>_files/" are assets
+HTML_SUFFIXES = ('.html', '.htm')
+
+
+def _is_archive(path: Path) -> bool:
+    """Return True if the path is a supported archive."""
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _is_page_member(name: str) -> bool:
+    """Return True for saved pages in an archive, skipping asset folders."""
+    parts = name.replace('\\', '/').split('/')
+    return (parts[-1].lower().endswith(HTML_SUFFIXES)
+            and not any(part.endswith('_files') for part in parts[:-1]))
+
+
+def _empty_summary() -> Dict[str, Any]:
+    """Return the counts of a run before any record is seen."""
+    return {'total': 0, 'with_ids': 0, 'with_prices': 0, 'with_addresses': 0, 'sample': None}
+
+
+def _parse_html_file_worker(html_directory: str, html_file: str,
+                            html_parser: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Parse one HTML file or archive in a worker process.
+    
+    Args:
+        html_directory: Directory the parser was created for
+        html_file: Path of the HTML file or archive to parse
+        html_parser: Tree builder of the parent's parser
+        
+    Returns:
+        Plain-dict records extracted from the file, and whether it was
+        read and parsed without errors
+    """
+    return BPIManualHTMLParser(html_directory, html_parser=html_parser)._parse_source(Path(html_file))
+
 
 class BPIManualHTMLParser:
     """Parser for manually downloaded BPI/Buena Mano HTML files."""
     
-    def __init__(self, html_directory: str = "foreclosed_scraper/bpi_manual_html"):
+    def __init__(self, html_directory: str = "foreclosed_scraper/bpi_manual_html", workers: int = 1,
+                 use_cache: bool = True, html_parser: Optional[str] = None):
         """
         Initialize the parser.
         
         Args:
             html_directory: Directory containing manually downloaded HTML files
+            workers: Number of processes used to parse files (1 parses serially)
+            use_cache: Reuse records of files that have not changed since the last run
+            html_parser: BeautifulSoup tree builder, see ``resolve_parser``;
+                the HTML_PARSER setting by default
         """
         self.html_directory = Path(html_directory)
         self.html_directory.mkdir(parents=True, exist_ok=True)
         self.output_file = Path("data/bpi_manual_parsed.json")
+        self.manifest_file = self.output_file.with_name("bpi_manual_manifest.json")
+        self.records_dir = self.output_file.with_name("bpi_manual_records")
+        self.workers = max(1, workers)
+        self.use_cache = use_cache
+        self.html_parser = resolve_parser(html_parser or HTML_PARSER)
+        # Cached records are dropped whenever the extraction code, the
+        # parsing helpers (regions kept, "auto" choice), the tree builder or
+        # the parsing libraries change
+        self.parser_version = parser_version(
+            BPIManualHTMLParser, extract_detail_fields, parse_html, HTML_PARSING_VERSION, self.html_parser
+        )
         
     def extract_properties_from_html(self, html_content: str, source_file: str = "unknown") -> List[Dict[str, Any]]:
         """
@@ -38,22 +125,21 @@ class BPIManualHTMLParser:
             List of property dictionaries
         """
         properties = []
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Find all property result containers
-        property_containers = soup.find_all('div', class_='result-each')
-        
-        print(f"Found {len(property_containers)} properties in {source_file}")
-        
-        for container in property_containers:
-            try:
-                property_data = self._extract_single_property(container)
-                if property_data:
-                    property_data['source_file'] = source_file
-                    properties.append(property_data)
-            except Exception as e:
-                print(f"Error extracting property from {source_file}: {e}")
-                continue
+        with parsed_html(html_content, RESULTS_REGIONS, self.html_parser) as soup:
+            # Find all property result containers
+            property_containers = soup.find_all('div', class_='result-each')
+            
+            print(f"Found {len(property_containers)} properties in {source_file}")
+            
+            for container in property_containers:
+                try:
+                    property_data = self._extract_single_property(container)
+                    if property_data:
+                        property_data['source_file'] = source_file
+                        properties.append(property_data)
+                except Exception as e:
+                    print(f"Error extracting property from {source_file}: {e}")
+                    continue
         
         return properties
     
@@ -181,224 +267,565 @@ class BPIManualHTMLParser:
             'alternate_no': 'NA'
         }
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        with parsed_html(html_content, DETAIL_REGIONS, self.html_parser) as soup:
+            detailed_info.update(extract_detail_fields(soup, address_field='full_address'))
+        
+        return detailed_info
+    
+    def parse_html_file(self, html_file: Path) -> List[Dict[str, Any]]:
+        """
+        Parse a single saved HTML file, either a search results or a detail page.
         
-        # Extract from property-summary div
-        property_summary = soup.find('div', class_='property-summary')
-        if property_summary:
-            # Extract title
-            h3 = property_summary.find('h3')
-            if h3:
-                detailed_info['title'] = h3.get_text(strip=True)
+        Args:
+            html_file: Path of the HTML file
             
-            # Extract location and address
-            p_elements = property_summary.find_all('p')
-            for p in p_elements:
-                text = p.get_text(strip=True)
-                
-                if 'Location :' in text:
-                    location = text.replace('Location :', '').strip()
-                    detailed_info['location'] = location
-                
-                elif 'Lot Area (sqm) :' in text:
-                    lot_area = text.replace('Lot Area (sqm) :', '').strip()
-                    detailed_info['lot_area_sqm'] = lot_area
-                
-                elif 'Floor Area (sqm) :' in text:
-                    floor_area = text.replace('Floor Area (sqm) :', '').strip()
-                    detailed_info['floor_area_sqm'] = floor_area
-                
-                elif 'Price (Php) :' in text:
-                    price = text.replace('Price (Php) :', '').strip()
-                    detailed_info['price_php'] = price
-                
-                elif 'Storeys :' in text:
-                    storeys = text.replace('Storeys :', '').strip()
-                    detailed_info['storeys'] = storeys
-                
-                elif 'Bedrooms :' in text:
-                    bedrooms = text.replace('Bedrooms :', '').strip()
-                    detailed_info['bedrooms'] = bedrooms
-                
-                elif 'Bathrooms :' in text:
-                    bathrooms = text.replace('Bathrooms :', '').strip()
-                    detailed_info['bathrooms'] = bathrooms
-                
-                elif 'Usage Classification :' in text:
-                    usage = text.replace('Usage Classification :', '').strip()
-                    detailed_info['usage_classification'] = usage
+        Returns:
+            List of property dictionaries found in the file
+        """
+        return self._parse_html_file(html_file)[0]
+    
+    def _parse_html_file(self, html_file: Path) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Parse a single saved HTML file, reporting whether it failed.
+        
+        Args:
+            html_file: Path of the HTML file
             
-            # Extract address (it's usually in a separate p element)
-            address_p = property_summary.find('p', string=lambda text: text and 'Lot' in text and 'Block' in text)
-            if address_p:
-                detailed_info['full_address'] = address_p.get_text(strip=True)
-        
-        # Extract from property-location-content div
-        property_location = soup.find('div', class_='property-location-content')
-        if property_location:
-            p_elements = property_location.find_all('p')
-            for p in p_elements:
-                text = p.get_text(strip=True)
-                
-                if 'Property Classification:' in text:
-                    classification = text.replace('Property Classification:', '').strip()
-                    detailed_info['property_classification'] = classification
-                
-                elif 'Sales Advisor :' in text:
-                    advisor = text.replace('Sales Advisor :', '').strip()
-                    detailed_info['sales_advisor'] = advisor
-                
-                elif 'Contact No. :' in text:
-                    contact = text.replace('Contact No. :', '').strip()
-                    detailed_info['contact_no'] = contact
-                
-                elif 'Alternate :' in text:
-                    alternate = text.replace('Alternate :', '').strip()
-                    detailed_info['alternate'] = alternate
-                
-                elif "Alternate's No. :" in text:
-                    alternate_no = text.replace("Alternate's No. :", '').strip()
-                    detailed_info['alternate_no'] = alternate_no
+        Returns:
+            List of property dictionaries found in the file, and False if
+            the file could not be read or parsed
+        """
+        try:
+            with open(html_file, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+            return self.parse_html_content(html_content, html_file.name), True
+        
+        except Exception as e:
+            print(f"Error parsing {html_file.name}: {e}")
+        
+        return [], False
+    
+    def parse_html_content(self, html_content: str, source_name: str) -> List[Dict[str, Any]]:
+        """
+        Parse the content of one saved page, either a search results or a detail page.
+        
+        Args:
+            html_content: HTML content as string
+            source_name: Name of the page used as source_file and in messages
             
-            # Extract special concerns
-            special_concerns = property_location.find('p', string=lambda text: text and 'Special Concerns:' in text)
-            if special_concerns:
-                next_elem = special_concerns.find_next_sibling()
-                if next_elem:
-                    concerns_text = next_elem.get_text(strip=True)
-                    if concerns_text and concerns_text != '-':
-                        detailed_info['special_concerns'] = concerns_text
+        Returns:
+            List of property dictionaries found in the page
+        """
+        # Check if this is a search results page or a detail page
+        if 'search-results' in html_content or 'result-each' in html_content:
+            # This is a search results page
+            properties = self.extract_properties_from_html(html_content, source_name)
+            print(f"Found {len(properties)} properties in {source_name}")
+            return properties
         
-        return detailed_info
+        elif 'property-summary' in html_content:
+            # This is a property detail page
+            detailed_info = self.extract_detailed_property_info(html_content, source_name)
+            if detailed_info.get('title') != 'NA':
+                print(f"Found detailed info from {source_name}")
+                return [detailed_info]
+        
+        else:
+            print(f"Unknown page type in {source_name}")
+        
+        return []
+    
+    def parse_archive(self, archive_file: Path) -> List[Dict[str, Any]]:
+        """
+        Parse the saved pages inside a zip or tar archive without extracting it.
+        
+        Members are read one at a time and parsed as they are read; asset
+        folders and other non-HTML members are never read from zip files.
+        Compressed tar files are a single stream, so their assets are still
+        decompressed to be skipped, but nothing is written to disk.
+        
+        Args:
+            archive_file: Path of the archive
+            
+        Returns:
+            List of property dictionaries from all pages, in archive order
+        """
+        return self._parse_archive(archive_file)[0]
+    
+    def _parse_archive(self, archive_file: Path) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Parse the saved pages inside an archive, reporting whether any failed.
+        
+        Args:
+            archive_file: Path of the archive
+            
+        Returns:
+            List of property dictionaries from all pages, in archive order,
+            and False if the archive or one of its pages could not be read
+            or parsed
+        """
+        properties = []
+        ok = True
+        
+        def parse_member(name: str, data: bytes) -> None:
+            nonlocal ok
+            source_name = f"{archive_file.name}:{name}"
+            try:
+                properties.extend(self.parse_html_content(data.decode('utf-8'), source_name))
+            except Exception as e:
+                print(f"Error parsing {source_name}: {e}")
+                ok = False
+        
+        try:
+            if archive_file.name.lower().endswith('.zip'):
+                with zipfile.ZipFile(archive_file) as archive:
+                    for info in archive.infolist():
+                        if not info.is_dir() and _is_page_member(info.filename):
+                            parse_member(info.filename, archive.read(info))
+            else:
+                with tarfile.open(archive_file, 'r|*') as archive:
+                    for member in archive:
+                        if member.isfile() and _is_page_member(member.name):
+                            parse_member(member.name, archive.extractfile(member).read())
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            print(f"Error reading archive {archive_file.name}: {e}")
+            ok = False
+        
+        return properties, ok
+    
+    def parse_source(self, source: Path) -> List[Dict[str, Any]]:
+        """
+        Parse an HTML file or an archive of saved pages.
+        
+        Args:
+            source: Path of the HTML file or archive
+            
+        Returns:
+            List of property dictionaries
+        """
+        return self._parse_source(source)[0]
+    
+    def _parse_source(self, source: Path) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Parse an HTML file or an archive, reporting whether anything failed.
+        
+        Args:
+            source: Path of the HTML file or archive
+            
+        Returns:
+            List of property dictionaries, and False if the source could
+            not be read or parsed completely
+        """
+        if _is_archive(source):
+            return self._parse_archive(source)
+        return self._parse_html_file(source)
+    
+    def _parse_files(self, html_files: List[Path]) -> Iterator[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        Parse files serially or across worker processes.
+        
+        Args:
+            html_files: Files to parse
+            
+        Yields:
+            The records of each file as soon as it is parsed, in the same
+            order as ``html_files``, with False if the file failed
+        """
+        if self.workers > 1 and len(html_files) > 1:
+            # Files are spread across processes; map() yields results in
+            # file order, so the merged output matches a serial run
+            workers = min(self.workers, len(html_files))
+            print(f"Using {workers} worker processes")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                yield from executor.map(
+                    _parse_html_file_worker,
+                    [str(self.html_directory)] * len(html_files),
+                    [str(html_file) for html_file in html_files],
+                    [self.html_parser] * len(html_files),
+                    chunksize=max(1, len(html_files) // (workers * 4))
+                )
+            return
+        
+        for i, html_file in enumerate(html_files, 1):
+            print(f"Processing file {i}/{len(html_files)}: {html_file.name}")
+            yield self._parse_source(html_file)
+    
+    def _file_fingerprint(self, html_file: Path, sha256: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Describe a file by size, mtime and content hash.
+        
+        Args:
+            html_file: File to describe
+            sha256: Content hash if it is already known
+            
+        Returns:
+            Manifest entry without the record count
+        """
+        stat = html_file.stat()
+        return {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': sha256 or _sha256_file(html_file)
+        }
+    
+    def _cached_entry(self, entry: Optional[Dict[str, Any]], html_file: Path, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the manifest entry for a file if its stored records are still valid.
+        
+        Matching size and mtime are trusted without reading the file; otherwise
+        the content hash decides, so a touched but unchanged file is not reparsed.
+        
+        Args:
+            entry: The file's entry from the previous manifest, if any
+            html_file: The file on disk
+            key: The file's manifest key
+            
+        Returns:
+            An up-to-date entry, or None if the file must be parsed
+        """
+        if not entry or not self._records_path(key).exists():
+            return None
+        stat = html_file.stat()
+        if entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+            return entry
+        sha256 = _sha256_file(html_file)
+        if entry.get('size') == stat.st_size and entry.get('sha256') == sha256:
+            refreshed = self._file_fingerprint(html_file, sha256)
+            refreshed['count'] = entry.get('count', 0)
+            return refreshed
+        return None
+    
+    def _records_path(self, key: str) -> Path:
+        """
+        Return where the records of one file are stored between runs.
+        
+        Args:
+            key: The file's manifest key
+        """
+        return self.records_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json"
+    
+    def _load_records(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read the stored records of one file.
+        
+        Args:
+            key: The file's manifest key
+            
+        Returns:
+            The records, or None if they are missing or unreadable
+        """
+        try:
+            with open(self._records_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not read cached records of {key}: {e}")
+            return None
+    
+    def _save_records(self, key: str, records: List[Dict[str, Any]]) -> None:
+        """
+        Store the records of one file atomically.
+        
+        Args:
+            key: The file's manifest key
+            records: Records extracted from the file
+        """
+        records_file = self._records_path(key)
+        records_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = records_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+        os.replace(tmp_file, records_file)
+    
+    def _prune_records(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Delete stored records of files that are no longer in the manifest.
+        
+        Args:
+            entries: Every file entry of the saved manifest, keyed by resolved path
+        """
+        if not self.records_dir.exists():
+            return
+        keep = {self._records_path(key).name for key in entries}
+        for records_file in self.records_dir.iterdir():
+            if records_file.name not in keep:
+                records_file.unlink()
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the per-file manifest of the previous run.
+        
+        Returns:
+            File entries keyed by resolved path, empty if missing, unreadable or
+            written by a different version of the parser
+        """
+        if not self.manifest_file.exists():
+            return {}
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not read manifest {self.manifest_file}: {e}")
+            return {}
+        if manifest.get('parser_version') != self.parser_version:
+            print("Parser changed since the last run - reparsing all files")
+            return {}
+        return manifest.get('files', {})
+    
+    def _save_manifest(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Write the manifest atomically.
+        
+        Args:
+            entries: File entries keyed by resolved path, of every directory
+        """
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'parser_version': self.parser_version, 'files': entries}, f, ensure_ascii=False)
+        os.replace(tmp_file, self.manifest_file)
     
     def parse_all_html_files(self) -> List[Dict[str, Any]]:
         """
-        Parse all HTML files in the directory.
+        Parse all HTML files and archives of saved pages in the directory.
+        
+        Holds every record in memory; ``iter_all_html_files`` and
+        ``write_all_html_files`` do the same work with bounded memory.
         
         Returns:
             List of all extracted properties
         """
-        all_properties = []
+        return list(self.iter_all_html_files())
+    
+    def write_all_html_files(self) -> Dict[str, Any]:
+        """
+        Parse all HTML files and archives into the output file, keeping only counts.
+        
+        Returns:
+            Counts of the extracted properties, see ``_count_record``
+        """
+        summary = _empty_summary()
+        for record in self.iter_all_html_files():
+            self._count_record(summary, record)
+        return summary
+    
+    def iter_all_html_files(self) -> Iterator[Dict[str, Any]]:
+        """
+        Parse all HTML files and archives of saved pages in the directory.
         
-        # Find all HTML files in the directory
-        html_files = list(self.html_directory.glob("*.html"))
+        Each record is written to the output file and then yielded, so
+        memory does not grow with the number of files. The output and the
+        manifest are committed once the iteration is exhausted; stopping
+        early leaves the previous output in place.
+        
+        Yields:
+            The extracted properties in file order, duplicates included
+        """
+        # Find all HTML files and archives of saved pages in the directory
+        # (sorted so output order is stable)
+        html_files = sorted(
+            path for path in self.html_directory.iterdir()
+            if path.is_file() and (path.suffix.lower() in HTML_SUFFIXES or _is_archive(path))
+        )
+        archive_count = sum(1 for path in html_files if _is_archive(path))
         
         print(f"Looking for HTML files in: {self.html_directory}")
-        print(f"Found {len(html_files)} HTML files")
+        print(f"Found {len(html_files) - archive_count} HTML files")
+        if archive_count:
+            print(f"Found {archive_count} archives of saved pages")
         
         if not html_files:
             print("No HTML files found. Please download BPI pages manually first.")
-            return []
+            return
         
-        print(f"Processing {len(html_files)} HTML files...")
+        # Reuse the stored records of files whose size/mtime or content hash
+        # is unchanged (keyed by resolved path, so same-named files in
+        # different --html-dir directories do not share an entry)
+        manifest = self._load_manifest() if self.use_cache else {}
+        current_keys = {str(html_file.resolve()) for html_file in html_files}
+        # Entries of other directories are kept while their files exist, so
+        # alternating between --html-dir folders keeps both caches
+        entries = {
+            key: entry for key, entry in manifest.items()
+            if key not in current_keys and Path(key).is_file()
+        }
+        other_directories = len(entries)
+        to_parse = []
+        for html_file in html_files:
+            key = str(html_file.resolve())
+            entry = self._cached_entry(manifest.get(key), html_file, key)
+            if entry is not None:
+                entries[key] = entry
+            else:
+                to_parse.append(html_file)
         
-        for i, html_file in enumerate(html_files, 1):
-            print(f"Processing file {i}/{len(html_files)}: {html_file.name}")
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                
-                # Check if this is a search results page or a detail page
-                if 'search-results' in html_content or 'result-each' in html_content:
-                    # This is a search results page
-                    properties = self.extract_properties_from_html(html_content, html_file.name)
-                    print(f"Found {len(properties)} properties in {html_file.name}")
-                    all_properties.extend(properties)
-                
-                elif 'property-summary' in html_content:
-                    # This is a property detail page
-                    detailed_info = self.extract_detailed_property_info(html_content, html_file.name)
-                    if detailed_info.get('title') != 'NA':
-                        all_properties.append(detailed_info)
-                        print(f"Found detailed info from {html_file.name}")
+        if len(entries) > other_directories:
+            print(f"Reusing cached records for {len(entries) - other_directories} unchanged files")
+        print(f"Processing {len(to_parse)} HTML files...")
+        
+        # Records are written out in file order as each file is parsed or
+        # read back from the store, then dropped; the manifest only keeps
+        # fingerprints and counts. Duplicates are dropped by the writer's
+        # index. Files that failed get no manifest entry, so the next run
+        # retries them
+        parsed = self._parse_files(to_parse)
+        failed = 0
+        total = 0
+        with StreamingJSONWriter(self.output_file) as writer:
+            for html_file in html_files:
+                key = str(html_file.resolve())
+                entry = entries.get(key)
+                records = self._load_records(key) if entry is not None else None
+                if records is None:
+                    if entry is None:
+                        records, ok = next(parsed)
+                    else:
+                        # Stored records vanished since the manifest was checked
+                        records, ok = self._parse_source(html_file)
+                    if not ok:
+                        entries.pop(key, None)
+                        failed += 1
+                    elif self.use_cache:
+                        # Hashed only when the entry is kept; --no-cache never reads a file twice
+                        entry = self._file_fingerprint(html_file)
+                        entry['count'] = len(records)
+                        entries[key] = entry
+                        self._save_records(key, records)
                 
-                else:
-                    print(f"Unknown page type in {html_file.name}")
+                total += len(records)
+                for record in records:
+                    writer.write(record)
+                    yield record
+                del records
             
-            except Exception as e:
-                print(f"Error parsing {html_file.name}: {e}")
-                continue
+            if not total:
+                writer.abort()
+        
+        if self.use_cache:
+            self._save_manifest(entries)
+            self._prune_records(entries)
         
-        print(f"Total properties found: {len(all_properties)}")
+        print(f"Total properties found: {total}")
+        if failed:
+            print(f"Warning: {failed} files had errors and will be parsed again on the next run")
         
-        # Save results
-        if all_properties:
-            self.save_properties(all_properties)
+        if total:
+            self._report_saved(writer)
             print(f"Results saved to: {self.output_file}")
+    
+    @staticmethod
+    def _count_record(summary: Dict[str, Any], record: Dict[str, Any]) -> None:
+        """
+        Add one extracted record to a run summary.
         
-        return all_properties
+        Args:
+            summary: Counts from ``_empty_summary``: 'total', 'with_ids',
+                'with_prices', 'with_addresses', and the first record as 'sample'
+            record: The extracted record
+        """
+        summary['total'] += 1
+        summary['with_ids'] += record.get('property_id') != 'NA'
+        summary['with_prices'] += record.get('price') != 'NA'
+        summary['with_addresses'] += record.get('address') != 'NA'
+        if summary['sample'] is None:
+            summary['sample'] = record
     
     def save_properties(self, properties: List[Dict[str, Any]]) -> None:
         """
         Save extracted properties to JSON file.
         
+        Duplicates are removed based on property_id, or detail_url for
+        records without an ID; records with neither are always kept.
+        
         Args:
             properties: List of property dictionaries
         """
-        # Remove duplicates based on property_id or detail_url
-        unique_properties = []
-        seen_ids = set()
-        seen_urls = set()
-        
-        for prop in properties:
-            prop_id = prop.get('property_id', '')
-            detail_url = prop.get('detail_url', '')
-            
-            if prop_id and prop_id != 'NA':
-                if prop_id not in seen_ids:
-                    seen_ids.add(prop_id)
-                    unique_properties.append(prop)
-            elif detail_url and detail_url != 'NA':
-                if detail_url not in seen_urls:
-                    seen_urls.add(detail_url)
-                    unique_properties.append(prop)
-            else:
-                # If no ID or URL, include it anyway
-                unique_properties.append(prop)
-        
-        # Save to JSON
-        with open(self.output_file, 'w', encoding='utf-8') as f:
-            json.dump(unique_properties, f, indent=2, ensure_ascii=False)
+        with StreamingJSONWriter(self.output_file) as writer:
+            for prop in properties:
+                writer.write(prop)
+        self._report_saved(writer)
+    
+    def _report_saved(self, writer: StreamingJSONWriter) -> None:
+        """
+        Print how many records a finished writer kept and dropped.
         
-        print(f"\nSaved {len(unique_properties)} unique properties to {self.output_file}")
-        print(f"Removed {len(properties) - len(unique_properties)} duplicates")
+        Args:
+            writer: The closed writer
+        """
+        print(f"\nSaved {writer.written} unique properties to {self.output_file}")
+        print(f"Removed {writer.duplicates} duplicates")
     
     def run(self) -> List[Dict[str, Any]]:
         """
         Run the complete parsing process.
         
         Returns:
-            List of extracted properties
+            List of extracted properties; ``run_streaming`` keeps only counts
         """
+        self._print_banner()
+        
+        # parse_all_html_files already wrote the deduplicated output
+        properties = self.parse_all_html_files()
+        summary = _empty_summary()
+        for prop in properties:
+            self._count_record(summary, prop)
+        self._print_summary(summary)
+        return properties
+    
+    def run_streaming(self) -> Dict[str, Any]:
+        """
+        Run the complete parsing process without holding the records in memory.
+        
+        Returns:
+            Counts of the extracted properties, see ``_count_record``
+        """
+        self._print_banner()
+        summary = self.write_all_html_files()
+        self._print_summary(summary)
+        return summary
+    
+    def _print_banner(self) -> None:
+        """Print what the parser is about to do."""
         print("=== BPI Manual HTML Parser ===")
         print(f"Looking for HTML files in: {self.html_directory}")
         print("This parser extracts property data from manually downloaded HTML files")
         print("=" * 50)
+    
+    def _print_summary(self, summary: Dict[str, Any]) -> None:
+        """
+        Print the counts of a run and a sample record.
         
-        properties = self.parse_all_html_files()
-        
-        if properties:
-            self.save_properties(properties)
-            
+        Args:
+            summary: Counts from ``_count_record``
+        """
+        if summary['total']:
             print(f"\nSummary:")
-            print(f"   - Total properties extracted: {len(properties)}")
-            print(f"   - Properties with IDs: {len([p for p in properties if p.get('property_id') != 'NA'])}")
-            print(f"   - Properties with prices: {len([p for p in properties if p.get('price') != 'NA'])}")
-            print(f"   - Properties with addresses: {len([p for p in properties if p.get('address') != 'NA'])}")
+            print(f"   - Total properties extracted: {summary['total']}")
+            print(f"   - Properties with IDs: {summary['with_ids']}")
+            print(f"   - Properties with prices: {summary['with_prices']}")
+            print(f"   - Properties with addresses: {summary['with_addresses']}")
             
             # Show sample data
-            if properties:
-                print(f"\nSample extracted data:")
-                print(json.dumps(properties[0], indent=2))
+            print(f"\nSample extracted data:")
+            print(json.dumps(summary['sample'], indent=2))
         else:
             print("No properties extracted. Please ensure HTML files are in the correct directory.")
-        
-        return properties
 
 def main():
     """Main function to run the parser."""
-    parser = BPIManualHTMLParser()
-    parser.run()
+    arg_parser = argparse.ArgumentParser(description="Parse manually saved BPI/Buena Mano HTML files")
+    arg_parser.add_argument("--html-dir", default="foreclosed_scraper/bpi_manual_html",
+                            help="Directory containing the saved HTML files")
+    arg_parser.add_argument("--workers", type=int, default=1,
+                            help="Number of processes used to parse files (default: 1, serial)")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="Reparse every file instead of reusing records of unchanged files")
+    arg_parser.add_argument("--html-parser", choices=HTML_PARSERS, default=None,
+                            help="BeautifulSoup tree builder (default: the HTML_PARSER setting, html.parser)")
+    args = arg_parser.parse_args()
+    
+    parser = BPIManualHTMLParser(args.html_dir, workers=args.workers, use_cache=not args.no_cache,
+                                 html_parser=args.html_parser)
+    parser.run_streaming()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
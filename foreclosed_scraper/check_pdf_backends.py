@@ -0,0 +1,124 @@
+"""Check that every PDF backend extracts the same records from the bundled PDFs.
+
+Run from the repository root before switching PDF_BACKEND:
+
+    python -m foreclosed_scraper.check_pdf_backends
+
+Each available backend parses every bundled bank PDF from scratch, with a
+throwaway cache, and its records are compared with pdfplumber's. The exit
+code is non-zero if any backend disagrees.
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .utils.pdf_backends import BACKEND_PDFPLUMBER, BACKENDS, HAS_PDFIUM, BACKEND_PDFIUM
+from .utils.pdf_batch import find_bank_pdfs
+from .utils.pdf_cache import PDFCache
+from .scrapers.metrobank_scraper import MetrobankScraper
+from .scrapers.security_bank_scraper import PDF_PREFIX as SECURITY_BANK_PREFIX, SecurityBankPDFScraper
+
+# Differing records printed per bank and backend
+MAX_SHOWN_DIFFERENCES = 3
+
+Record = Dict[str, Any]
+
+
+def _metrobank_records(backend: str, cache: PDFCache) -> List[Record]:
+    scraper = MetrobankScraper(workers=1, backend=backend)
+    if not scraper.pdf_path:
+        return []
+    scraper.pdf_cache = cache
+    return list(scraper._iter_properties())
+
+
+def _security_bank_records(backend: str, cache: PDFCache) -> List[Record]:
+    scraper = SecurityBankPDFScraper(workers=1, backend=backend)
+    pdf_files = find_bank_pdfs(SECURITY_BANK_PREFIX, scraper.pdf_folder, case_sensitive=True)
+    if not pdf_files:
+        return []
+    scraper.pdf_cache = cache
+    return scraper._extract_with_layout(pdf_files[0][0]) or []
+
+
+# Bank name and a function extracting the bundled PDF's records with a backend
+PDF_BANKS: List[Tuple[str, Callable[[str, PDFCache], List[Record]]]] = [
+    ("metrobank", _metrobank_records),
+    ("security_bank", _security_bank_records),
+]
+
+
+def compare_records(expected: List[Record], actual: List[Record]) -> List[str]:
+    """Describe how two record lists differ.
+
+    Args:
+        expected: Records of the reference backend
+        actual: Records of the backend under test
+
+    Returns:
+        One line per difference, empty if the lists are identical
+    """
+    differences = []
+    if len(expected) != len(actual):
+        differences.append(f"{len(actual)} records instead of {len(expected)}")
+    for index, (want, got) in enumerate(zip(expected, actual)):
+        for field in sorted(set(want) | set(got)):
+            if want.get(field) != got.get(field):
+                differences.append(f"record {index} {field}: {want.get(field)!r} != {got.get(field)!r}")
+    return differences
+
+
+def check_backends(backends: List[str]) -> bool:
+    """Extract the bundled PDFs with each backend and compare with pdfplumber.
+
+    Args:
+        backends: Backends to check against pdfplumber
+
+    Returns:
+        True if every backend produced the same records
+    """
+    identical = True
+    for bank, extract in PDF_BANKS:
+        results = {}
+        for backend in [BACKEND_PDFPLUMBER] + [b for b in backends if b != BACKEND_PDFPLUMBER]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                cache = PDFCache(Path(tmp_dir) / "pdf_cache.json", Path(tmp_dir) / "records", Path(tmp_dir) / "pages")
+                start = time.perf_counter()
+                results[backend] = extract(backend, cache)
+                elapsed = time.perf_counter() - start
+            print(f"{bank} [{backend}]: {len(results[backend])} records in {elapsed:.1f}s")
+
+        expected = results.pop(BACKEND_PDFPLUMBER)
+        if not expected:
+            print(f"{bank}: no bundled PDF or no records, skipped")
+            continue
+        for backend, actual in results.items():
+            differences = compare_records(expected, actual)
+            if differences:
+                identical = False
+                print(f"{bank} [{backend}]: {len(differences)} differences from {BACKEND_PDFPLUMBER}")
+                for line in differences[:MAX_SHOWN_DIFFERENCES]:
+                    print(f"  {line}")
+            else:
+                print(f"{bank} [{backend}]: identical to {BACKEND_PDFPLUMBER}")
+    return identical
+
+
+def main(argv=None) -> int:
+    """Run the check and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Compare the records of each PDF backend on the bundled PDFs")
+    parser.add_argument("--backend", action="append", choices=BACKENDS,
+                        help="Backend to check against pdfplumber (default: every installed backend)")
+    args = parser.parse_args(argv)
+    backends = args.backend or ([BACKEND_PDFIUM] if HAS_PDFIUM else [])
+    if BACKEND_PDFIUM in backends and not HAS_PDFIUM:
+        print("pypdfium2 not installed. Install with: pip install pypdfium2")
+        return 1
+    return 0 if check_backends(backends) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,11 +7,12 @@ from tqdm import tqdm
 
 # Import configuration
 from .utils.config import BANKS
+from .utils.executors import LoopLagMonitor, run_in_thread, shutdown_executors
 
 # Import the bank scrapers
-from .scrapers.bdo_scraper import BDOScraper
+from .scrapers.bdo_playwright_scraper import BDOPlaywrightScraper
 from .scrapers.bpi_scraper import BPIScraper
-from .scrapers.security_bank_scraper import SecurityBankScraper
+from .scrapers.security_bank_scraper import SecurityBankPDFScraper as SecurityBankScraper
 from .scrapers.metrobank_scraper import MetrobankScraper
 from .scrapers.eastwest_bank_scraper import EastwestBankScraper
 from .scrapers.pnb_scraper import PNBScraper
@@ -21,7 +22,8 @@ nest_asyncio.apply()
 
 # Bank scraper mapping
 BANK_SCRAPERS = {
-    "bdo": BDOScraper,
+    "bdo": BDOPlaywrightScraper,
+    "bdo_playwright": BDOPlaywrightScraper,
     "bpi": BPIScraper,
     "security_bank": SecurityBankScraper,
     "metrobank": MetrobankScraper,
@@ -29,12 +31,36 @@ BANK_SCRAPERS = {
     "pnb": PNBScraper,
 }
 
-async def scrape_bank(bank_id: str, bank_config: dict) -> None:
+def unique_scrapers(bank_ids: list) -> list:
+    """Drop bank IDs served by a scraper already selected, e.g. the "bdo_playwright" alias of "bdo".
+    
+    Args:
+        bank_ids: Bank IDs in the order they were selected
+        
+    Returns:
+        The bank IDs to scrape, each scraper class once
+    """
+    selected = []
+    seen_scrapers = {}
+    for bank_id in bank_ids:
+        scraper_class = BANK_SCRAPERS.get(bank_id)
+        if scraper_class is not None and scraper_class in seen_scrapers:
+            print(f"Skipping '{bank_id}': same scraper as '{seen_scrapers[scraper_class]}'")
+            continue
+        if scraper_class is not None:
+            seen_scrapers[scraper_class] = bank_id
+        selected.append(bank_id)
+    return selected
+
+
+async def scrape_bank(bank_id: str, bank_config: dict, batch: bool = False, bdo_partition: bool = False) -> None:
     """Scrape a specific bank's foreclosed properties.
     
     Args:
         bank_id: The ID of the bank to scrape
         bank_config: The configuration for the bank
+        batch: Extract every PDF of a PDF bank instead of the newest one
+        bdo_partition: Split the BDO listing on a site filter, see BDOPlaywrightScraper
     """
     try:
         print(f"Scraping {bank_config['name']} foreclosed properties...")
@@ -43,8 +69,15 @@ async def scrape_bank(bank_id: str, bank_config: dict) -> None:
         scraper_class = BANK_SCRAPERS.get(bank_id)
         
         if scraper_class:
-            scraper = scraper_class()
-            properties = await scraper.scrape()
+            if scraper_class is BDOPlaywrightScraper:
+                scraper = scraper_class(partition=bdo_partition)
+            else:
+                scraper = scraper_class()
+            if batch and hasattr(scraper, "scrape_batch"):
+                # Blocks while its PDFs are parsed; a thread keeps other banks' requests going
+                properties = await run_in_thread(scraper.scrape_batch)
+            else:
+                properties = await scraper.scrape()
             print(f"Found {len(properties)} properties from {bank_config['name']}.")
         else:
             # For other banks, we'll use the placeholder for now
@@ -58,23 +91,50 @@ async def scrape_bank(bank_id: str, bank_config: dict) -> None:
         print(f"Error scraping {bank_config['name']}: {str(e)}")
 
 
-async def scrape_multiple_banks(bank_ids: list) -> None:
+async def scrape_multiple_banks(bank_ids: list, batch: bool = False, bdo_partition: bool = False) -> None:
     """Scrape foreclosed properties from multiple specified banks.
     
     Args:
         bank_ids: List of bank IDs to scrape
+        batch: Extract every PDF of a PDF bank instead of the newest one
+        bdo_partition: Split the BDO listing on a site filter
     """
-    for bank_id in tqdm(bank_ids, desc="Scraping selected banks"):
+    for bank_id in tqdm(unique_scrapers(bank_ids), desc="Scraping selected banks"):
         if bank_id in BANKS:
-            await scrape_bank(bank_id, BANKS[bank_id])
+            await scrape_bank(bank_id, BANKS[bank_id], batch, bdo_partition)
         else:
             print(f"Error: Bank '{bank_id}' not found. Skipping.")
 
 
-async def scrape_all_banks() -> None:
-    """Scrape foreclosed properties from all banks."""
-    for bank_id, bank_config in tqdm(BANKS.items(), desc="Scraping all banks"):
-        await scrape_bank(bank_id, bank_config)
+async def scrape_all_banks(batch: bool = False, bdo_partition: bool = False) -> None:
+    """Scrape foreclosed properties from all banks.
+    
+    Args:
+        batch: Extract every PDF of a PDF bank instead of the newest one
+        bdo_partition: Split the BDO listing on a site filter
+    """
+    for bank_id in tqdm(unique_scrapers(list(BANKS)), desc="Scraping all banks"):
+        await scrape_bank(bank_id, BANKS[bank_id], batch, bdo_partition)
+
+
+async def scrape_banks_concurrently(bank_ids: list, batch: bool = False, bdo_partition: bool = False) -> None:
+    """Scrape several banks at the same time in one event loop.
+    
+    Each bank keeps its own rate limiting; only different hosts overlap.
+    IDs sharing a scraper run once, so a host is never crawled twice at once.
+    PDF and HTML parsing run in the shared executors, and the event loop's
+    lag is reported at the end to show that no bank stalled the others.
+    
+    Args:
+        bank_ids: List of bank IDs to scrape
+        batch: Extract every PDF of a PDF bank instead of the newest one
+        bdo_partition: Split the BDO listing on a site filter
+    """
+    async with LoopLagMonitor() as monitor:
+        await asyncio.gather(*(
+            scrape_bank(bank_id, BANKS[bank_id], batch, bdo_partition) for bank_id in unique_scrapers(bank_ids)
+        ))
+    print(monitor.summary())
 
 
 def main():
@@ -83,6 +143,9 @@ def main():
     parser.add_argument("--bank", type=str, action="append", help="Specific bank to scrape (e.g., 'bdo', 'bpi', etc.). Can be used multiple times.")
     parser.add_argument("--all", action="store_true", help="Scrape all banks")
     parser.add_argument("--list", action="store_true", help="List available banks")
+    parser.add_argument("--concurrent", action="store_true", help="Scrape the selected banks at the same time instead of one after another")
+    parser.add_argument("--batch", action="store_true", help="For PDF banks, extract every PDF in pdf_input (e.g. archived lists) instead of the newest one")
+    parser.add_argument("--bdo-partition", action="store_true", help="Split the BDO listing on one of the site's filters and crawl the parts concurrently; falls back to the serial crawl if they do not add up to the site's total")
     
     args = parser.parse_args()
     
@@ -108,11 +171,18 @@ def main():
             print("Use --list to see available banks.")
             return
         
-        asyncio.run(scrape_multiple_banks(unique_banks))
+        if args.concurrent:
+            asyncio.run(scrape_banks_concurrently(unique_banks, args.batch, args.bdo_partition))
+        else:
+            asyncio.run(scrape_multiple_banks(unique_banks, args.batch, args.bdo_partition))
     elif args.all:
-        asyncio.run(scrape_all_banks())
+        if args.concurrent:
+            asyncio.run(scrape_banks_concurrently(list(BANKS), args.batch, args.bdo_partition))
+        else:
+            asyncio.run(scrape_all_banks(args.batch, args.bdo_partition))
     else:
         parser.print_help()
+    shutdown_executors()
 
 
 if __name__ == "__main__":
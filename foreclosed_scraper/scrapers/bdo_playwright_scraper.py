@@ -0,0 +1,580 @@
+import sys
+import os
+# Add the parent directory to sys.path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import asyncio
+from typing import Dict, List, Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Route
+
+try:
+    from ..utils.base_scraper import BaseBankScraper
+    from ..utils.config import BANKS, USER_AGENT
+    from ..utils.rate_limit import AsyncCrawlDelayLimiter
+    from ..utils.page_readiness import StepTimer, COUNT_INCREASED_SCRIPT
+    from ..utils.bdo_site import (
+        CRAWL_DELAY, DETAIL_FIELD_SELECTORS, DETAIL_MIN_LENGTHS, DETAIL_EXTRACTION_FN,
+        LISTING_ITEM_SELECTOR, LOADER_SELECTOR, SHOW_MORE_SELECTOR
+    )
+except ImportError:
+    from utils.base_scraper import BaseBankScraper
+    from utils.config import BANKS, USER_AGENT
+    from utils.rate_limit import AsyncCrawlDelayLimiter
+    from utils.page_readiness import StepTimer, COUNT_INCREASED_SCRIPT
+    from utils.bdo_site import (
+        CRAWL_DELAY, DETAIL_FIELD_SELECTORS, DETAIL_MIN_LENGTHS, DETAIL_EXTRACTION_FN,
+        LISTING_ITEM_SELECTOR, LOADER_SELECTOR, SHOW_MORE_SELECTOR
+    )
+
+# Resource types dropped at the route level; the scraper only needs the DOM
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# One limiter for the BDO host, shared by every scraper instance in the
+# process, so two instances running at once still honour the crawl delay
+BDO_LIMITER = AsyncCrawlDelayLimiter(CRAWL_DELAY)
+
+# Facet names tried in order when choosing how to partition the search space
+FACET_PREFERENCE = ("province", "region", "city", "type", "price")
+
+# Total result count printed on the results page, e.g. "1,234 properties found".
+# Partitioning is only trusted when the partitions add up to this number.
+RESULT_TOTAL_PATTERN = re.compile(r'(\d[\d,]*)\s+(?:results?|properties|listings)\b', re.IGNORECASE)
+
+# Number of partitions crawled at the same time, each in its own context
+PARTITION_CONCURRENCY = 4
+
+# Lists the filter dropdowns on the results page with their real options
+# (placeholders such as "All" or "Select ..." are left out)
+FACET_DISCOVERY_FN = """
+() => Array.from(document.querySelectorAll("select")).map((select, index) => {
+    const key = (select.name || select.id || select.getAttribute("aria-label") || "").toLowerCase();
+    const options = Array.from(select.options)
+        .filter(o => o.value && !/^(all|any|select)\\b/i.test(o.text.trim()))
+        .map(o => ({value: o.value, label: o.text.trim()}));
+    return {index: index, key: key, param: select.name || "", options: options};
+}).filter(facet => facet.options.length > 1)
+"""
+
+# Playwright passes a single argument, so the Selenium-style predicate that
+# reads ``arguments`` is wrapped in a regular function and applied to it
+COUNT_INCREASED_FN = f"args => (function () {{ {COUNT_INCREASED_SCRIPT} }}).apply(null, args)"
+
+# Value of the dropdown with the given name, to confirm a filtered URL was applied
+SELECTED_VALUE_FN = """
+(name) => {
+    const select = document.querySelector(`select[name="${CSS.escape(name)}"]`);
+    return select ? select.value : null;
+}
+"""
+
+# Extracts the listing cards from ``start`` onwards in one evaluate call,
+# mapping each row's icon to a field like the Selenium scraper does
+CARD_EXTRACTION_FN = """
+([itemSelector, start]) => Array.from(document.querySelectorAll(itemSelector)).slice(start).map(item => {
+    const prop = {
+        Property_address: "NA",
+        Property_short_description: "NA",
+        Advertised_price: "NA",
+        Type: "NA",
+        Lot_area: "NA",
+        Floor_area: "NA",
+        Offer_type: "Negotiated Sale",
+        Additional_information: "NA",
+        Detailed_info: {}
+    };
+    const title = item.querySelector(".title");
+    if (title) {
+        prop.Property_address = title.innerText.trim();
+    }
+    for (const row of item.querySelectorAll(".item-content--row")) {
+        const icon = row.querySelector(".item-content--row-icon svg use");
+        const textEl = row.querySelector(".city");
+        if (!icon || !textEl) {
+            continue;
+        }
+        const href = icon.getAttribute("xlink:href") || icon.getAttribute("href") || "";
+        const text = textEl.innerText.trim();
+        if (href.includes("tag_outline") || href.includes("price")) {
+            prop.Advertised_price = text;
+        } else if (href.includes("business_building-outline")) {
+            // First building icon is floor area, second is lot area
+            if (prop.Floor_area === "NA") {
+                prop.Floor_area = text;
+            } else {
+                prop.Lot_area = text;
+            }
+        } else if (href.includes("home_loan-outline") || href.includes("home-outline")) {
+            prop.Type = text;
+        } else if (href.includes("location") || href.includes("map")) {
+            if (prop.Property_short_description === "NA") {
+                prop.Property_short_description = text;
+            } else {
+                prop.Additional_information = text;
+            }
+        }
+    }
+    const link = item.querySelector("a[href*='details-page']");
+    if (link && link.href) {
+        prop.Additional_information = link.href;
+    }
+    return prop;
+})
+"""
+
+
+def merge_partitions(partitions: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Merge partition results, keeping the first card per details URL.
+
+    Cards without a details URL are keyed by address and price instead.
+
+    Args:
+        partitions: Cards from each partition
+
+    Returns:
+        Deduplicated cards in partition order
+    """
+    merged = []
+    seen = set()
+    duplicates = 0
+    for cards in partitions:
+        for card in cards:
+            url = card.get("Additional_information", "NA")
+            key = url if "details-page" in url else (card.get("Property_address"), card.get("Advertised_price"))
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            merged.append(card)
+    print(f"[BDO] Merged {len(merged)} unique properties from {len(partitions)} partitions "
+          f"({duplicates} duplicates dropped)")
+    return merged
+
+
+def filtered_url(url: str, param: str, value: str) -> str:
+    """Add one filter to a results-page URL, replacing an existing value.
+
+    Args:
+        url: Results page URL
+        param: Query parameter named after the filter dropdown
+        value: Option value to filter on
+
+    Returns:
+        The filtered URL
+    """
+    parts = urlsplit(url)
+    query = [(key, val) for key, val in parse_qsl(parts.query, keep_blank_values=True) if key != param]
+    query.append((param, value))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def parse_result_total(text: str) -> Optional[int]:
+    """Read the total result count from the results page's text.
+
+    Args:
+        text: Visible text of the page
+
+    Returns:
+        The count, or None if the page does not print one
+    """
+    match = RESULT_TOTAL_PATTERN.search(text or "")
+    return int(match.group(1).replace(",", "")) if match else None
+
+
+class PartitionError(Exception):
+    """A partition could not be crawled reliably."""
+
+
+class BDOPlaywrightScraper(BaseBankScraper):
+    """Asyncio Playwright scraper for BDO foreclosed properties.
+
+    One Chromium instance serves several browser contexts. The listing's
+    Show More loop runs in one context and further contexts fetch detail
+    pages concurrently. Images, fonts and media are aborted at the route
+    level, and every request goes through one shared crawl-delay limiter.
+
+    Partitioning the listing on one of the site's filters is opt-in
+    (``--bdo-partition`` in main.py): under
+    the shared crawl delay it cannot finish sooner than the serial crawl,
+    and it is only kept when the partitions add up to the site's total.
+    """
+
+    def __init__(self, *args, detail_concurrency: int = 3, headless: bool = True,
+                 partition: bool = False, partition_concurrency: int = PARTITION_CONCURRENCY, **kwargs):
+        """Initialize the BDO Playwright scraper.
+
+        Args:
+            detail_concurrency: Number of contexts fetching detail pages at once
+            headless: Run Chromium without a window
+            partition: Split the listing on a site filter and crawl the parts
+                concurrently, falling back to the serial crawl if they do not
+                add up to the site's total
+            partition_concurrency: Number of partitions crawled at the same time
+            max_results: Maximum number of results to extract; the whole
+                listing by default, not the MAX_RESULTS_PER_BANK setting
+        """
+        kwargs.setdefault("max_results", None)
+        super().__init__(
+            bank_name="BDO",
+            bank_url=BANKS['bdo_playwright']['url'],
+            *args, **kwargs
+        )
+        self.detail_concurrency = max(1, detail_concurrency)
+        self.headless = headless
+        self.partition = partition
+        self.partition_concurrency = max(1, partition_concurrency)
+        self.limiter = BDO_LIMITER
+        self.timer = StepTimer()
+
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """Create a browser context that blocks images, fonts and media.
+
+        Args:
+            browser: The shared Chromium instance
+
+        Returns:
+            A new browser context
+        """
+        context = await browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={"width": 1366, "height": 768}
+        )
+
+        async def block_assets(route: Route):
+            if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", block_assets)
+        return context
+
+    async def _goto(self, page: Page, url: str) -> None:
+        """Navigate within the crawl-delay budget and wait for the DOM.
+
+        Args:
+            page: The page to navigate
+            url: Target URL
+        """
+        self.timer.record("crawl_delay", await self.limiter.wait())
+        with self.timer.step("page_load"):
+            await page.goto(url, wait_until="domcontentloaded")
+
+    async def _open_listing(self, page: Page, url: Optional[str] = None) -> int:
+        """Load the results page and wait for the first cards.
+
+        Args:
+            page: The page to load the listing in
+            url: Results page to load; the unfiltered listing by default
+
+        Returns:
+            Number of cards on the first page
+        """
+        await self._goto(page, url or self.bank_url)
+        await page.wait_for_selector(LISTING_ITEM_SELECTOR, timeout=30000)
+        return await page.locator(LISTING_ITEM_SELECTOR).count()
+
+    async def _result_total(self, page: Page) -> Optional[int]:
+        """Return the total result count the page prints, if any."""
+        return parse_result_total(await page.inner_text("body"))
+
+    async def _expand_listing(self, page: Page, current_count: int, label: str = "") -> List[Dict[str, Any]]:
+        """Click Show More until everything is loaded, then extract every card.
+
+        Args:
+            page: A page showing the (possibly filtered) results
+            current_count: Number of cards already loaded
+            label: Partition name used in progress messages
+
+        Returns:
+            A list of dictionaries containing basic property information
+        """
+        prefix = f"[BDO{' ' + label if label else ''}]"
+        max_attempts = 100  # High limit to ensure we get all properties
+        for attempt in range(1, max_attempts + 1):
+            if self.max_results and current_count >= self.max_results:
+                break
+
+            show_more = page.locator(SHOW_MORE_SELECTOR)
+            if await show_more.count() == 0 or not await show_more.first.is_visible():
+                print(f"{prefix} No more 'Show More' button found - all properties loaded!")
+                break
+
+            self.timer.record("crawl_delay", await self.limiter.wait())
+            await show_more.first.evaluate("el => { el.scrollIntoView({block: 'center'}); el.click(); }")
+
+            # Loader gone and either more cards or no more Show More button
+            with self.timer.step("show_more_load"):
+                try:
+                    handle = await page.wait_for_function(
+                        COUNT_INCREASED_FN,
+                        arg=[LISTING_ITEM_SELECTOR, current_count, LOADER_SELECTOR, SHOW_MORE_SELECTOR],
+                        timeout=30000,
+                        polling=200
+                    )
+                    new_count = await handle.json_value()
+                except Exception:
+                    new_count = await page.locator(LISTING_ITEM_SELECTOR).count()
+
+            print(f"{prefix} Attempt {attempt}: {new_count} properties")
+            if new_count <= current_count:
+                break
+            current_count = new_count
+
+        with self.timer.step("extract_cards"):
+            properties = await page.evaluate(CARD_EXTRACTION_FN, [LISTING_ITEM_SELECTOR, 0])
+        print(f"{prefix} Extracted {len(properties)} property cards")
+        return properties
+
+    def _choose_facet(self, facets: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Pick the filter to partition on.
+
+        Args:
+            facets: Dropdowns found by FACET_DISCOVERY_FN
+
+        Returns:
+            The preferred facet, the one with the most options, or None
+        """
+        if not facets:
+            return None
+        for preferred in FACET_PREFERENCE:
+            for facet in facets:
+                if preferred in facet["key"]:
+                    return facet
+        return max(facets, key=lambda facet: len(facet["options"]))
+
+    async def _crawl_partition(self, browser: Browser, facet: Dict[str, Any], option: Dict[str, str],
+                               semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Crawl the listing filtered to one facet option in its own context.
+
+        The filtered results page is loaded directly by URL, so a partition
+        costs one page load rather than the unfiltered listing plus a
+        filter submission.
+
+        Args:
+            browser: The shared Chromium instance
+            facet: The facet being partitioned on
+            option: The option selected for this partition
+            semaphore: Bounds how many partitions run at once
+
+        Returns:
+            Cards in this partition
+
+        Raises:
+            PartitionError: If the site ignored the filter or the crawl failed
+        """
+        label = option["label"]
+        async with semaphore:
+            context = await self._new_context(browser)
+            try:
+                page = await context.new_page()
+                url = filtered_url(self.bank_url, facet["param"], option["value"])
+                with self.timer.step("partition_load"):
+                    await self._goto(page, url)
+                    try:
+                        await page.wait_for_selector(LISTING_ITEM_SELECTOR, timeout=30000)
+                    except Exception:
+                        pass  # An option without properties shows no cards
+                if await page.evaluate(SELECTED_VALUE_FN, facet["param"]) != option["value"]:
+                    raise PartitionError(f"the site did not apply {facet['param']}={option['value']} from the URL")
+                count = await page.locator(LISTING_ITEM_SELECTOR).count()
+                if count == 0:
+                    print(f"[BDO {label}] No properties")
+                    return []
+                return await self._expand_listing(page, count, label)
+            except PartitionError:
+                raise
+            except Exception as e:
+                raise PartitionError(f"partition '{label}' failed: {e}") from e
+            finally:
+                await context.close()
+
+    async def _crawl_partitions(self, browser: Browser, facet: Dict[str, Any],
+                                total: int) -> Optional[List[Dict[str, Any]]]:
+        """Crawl every option of a facet and check the parts cover the listing.
+
+        Args:
+            browser: The shared Chromium instance
+            facet: The facet to partition on
+            total: Result count of the unfiltered listing
+
+        Returns:
+            The merged cards, or None if a partition failed or the merged
+            count differs from ``total``
+        """
+        print(f"[BDO] Partitioning on '{facet['param']}' into {len(facet['options'])} parts "
+              f"({self.partition_concurrency} at a time)")
+        semaphore = asyncio.Semaphore(self.partition_concurrency)
+        with self.timer.step("partitions"):
+            results = await asyncio.gather(*(
+                self._crawl_partition(browser, facet, option, semaphore) for option in facet["options"]
+            ), return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            print(f"[BDO] ⚠️ PARTITIONING ABANDONED: {len(errors)} of {len(results)} partitions failed "
+                  f"(first: {errors[0]})")
+            return None
+        merged = merge_partitions(results)
+        if len(merged) != total:
+            print(f"[BDO] ⚠️ PARTITIONING ABANDONED: partitions hold {len(merged)} unique properties "
+                  f"but the unfiltered listing reports {total}")
+            return None
+        return merged
+
+    async def _extract_property_list(self, browser: Browser) -> List[Dict[str, Any]]:
+        """Collect listing cards, split across facet partitions if enabled.
+
+        The first page is loaded once to read the result total and discover
+        the filters. With partitioning enabled and a filter that can be set
+        by URL, every option is crawled concurrently in its own context and
+        the results are merged with dedup on the details URL. If any
+        partition fails, or the merged count differs from the total, the
+        unfiltered listing is expanded serially instead.
+
+        Args:
+            browser: The shared Chromium instance
+
+        Returns:
+            A list of dictionaries containing basic property information
+        """
+        context = await self._new_context(browser)
+        try:
+            page = await context.new_page()
+            current_count = await self._open_listing(page)
+            print(f"[BDO] Initial properties loaded: {current_count}")
+
+            facet = total = None
+            if self.partition:
+                if self.max_results:
+                    print("[BDO] max_results is set - expanding the listing serially")
+                else:
+                    total = await self._result_total(page)
+                    facets = [f for f in await page.evaluate(FACET_DISCOVERY_FN) if f["param"]]
+                    facet = self._choose_facet(facets)
+                    if facet is None or total is None:
+                        print("[BDO] No filter settable by URL or no result total on the page - "
+                              "expanding the full listing serially")
+                        facet = None
+            if facet is None:
+                return await self._expand_listing(page, current_count)
+        finally:
+            await context.close()
+
+        merged = await self._crawl_partitions(browser, facet, total)
+        if merged is not None:
+            return merged
+
+        print("[BDO] ⚠️ Falling back to the serial crawl of the unfiltered listing")
+        context = await self._new_context(browser)
+        try:
+            page = await context.new_page()
+            return await self._expand_listing(page, await self._open_listing(page))
+        finally:
+            await context.close()
+
+    async def _extract_property_details(self, page: Page, detail_url: str) -> Dict[str, Any]:
+        """Extract detailed information for a specific property.
+
+        Args:
+            page: A page in one of the detail contexts
+            detail_url: The URL of the property detail page
+
+        Returns:
+            A dictionary containing detailed property information
+        """
+        detailed_info = {field: "NA" for field in DETAIL_FIELD_SELECTORS}
+        try:
+            await self._goto(page, detail_url)
+            with self.timer.step("detail_settle"):
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=10000)
+                except Exception:
+                    pass
+            with self.timer.step("detail_extract"):
+                extracted = await page.evaluate(
+                    f"([s, m]) => ({DETAIL_EXTRACTION_FN})(s, m)",
+                    [DETAIL_FIELD_SELECTORS, DETAIL_MIN_LENGTHS]
+                )
+            if extracted:
+                detailed_info.update(extracted)
+        except Exception as e:
+            print(f"[BDO] Error getting property details from {detail_url}: {e}")
+        return detailed_info
+
+    async def _enrich_details(self, browser: Browser, properties: List[Dict[str, Any]]) -> None:
+        """Fetch detail pages concurrently, one tab per detail context.
+
+        Args:
+            browser: The shared Chromium instance
+            properties: Cards to enrich in place
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for prop in properties:
+            if prop.get("Additional_information", "NA") != "NA" and not prop.get("Detailed_info"):
+                queue.put_nowait(prop)
+        if queue.empty():
+            return
+
+        workers = min(self.detail_concurrency, queue.qsize())
+        print(f"[BDO] Fetching {queue.qsize()} detail pages with {workers} concurrent tabs")
+
+        async def worker(context: BrowserContext):
+            page = await context.new_page()
+            try:
+                while not queue.empty():
+                    prop = queue.get_nowait()
+                    prop["Detailed_info"] = await self._extract_property_details(
+                        page, prop["Additional_information"]
+                    )
+            finally:
+                await context.close()
+
+        contexts = [await self._new_context(browser) for _ in range(workers)]
+        await asyncio.gather(*(worker(context) for context in contexts))
+
+    def _normalize_data(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return property data as-is without normalization.
+
+        Args:
+            property_data: The property data to normalize
+
+        Returns:
+            Property data with original structure
+        """
+        return property_data
+
+    async def scrape(self) -> List[Dict[str, Any]]:
+        """Scrape foreclosed properties from BDO.
+
+        Returns:
+            A list of dictionaries containing property information
+        """
+        print(f"[BDO] Crawl delay: {CRAWL_DELAY} seconds (robots.txt compliance)")
+        properties: List[Dict[str, Any]] = []
+        try:
+            async with async_playwright() as playwright:
+                browser = await playwright.chromium.launch(headless=self.headless)
+                try:
+                    properties = await self._extract_property_list(browser)
+
+                    if self.max_results:
+                        properties = properties[:self.max_results]
+
+                    with self.timer.step("detail_phase"):
+                        await self._enrich_details(browser, properties)
+                finally:
+                    await browser.close()
+        except Exception as e:
+            print(f"Error during BDO Playwright scraping: {e}")
+
+        if properties:
+            self._save_results(properties)
+        self.timer.print_summary()
+        return properties
+
+
+if __name__ == "__main__":
+    asyncio.run(BDOPlaywrightScraper(max_results=None).scrape())
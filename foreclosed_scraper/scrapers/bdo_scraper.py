@@ -4,28 +4,59 @@ BDO Robots.txt Compliant Scraper with Detailed Property Information
 Respects BDO's robots.txt guidelines and extracts detailed property info by clicking "View Details"
 """
 
-import time
+import sys
+import os
+# Add the parent directory to sys.path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import json
-import random
+import queue
+import argparse
+import threading
 from pathlib import Path
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+try:
+    from ..utils.chrome_driver import create_chrome_driver
+    from ..utils.rate_limit import CrawlDelayLimiter
+    from ..utils.page_readiness import StepTimer, wait_for_count_increase, wait_for_dom_settled
+    from ..utils.checkpoint import CrawlCheckpoint
+    from ..utils.bdo_site import (
+        BDO_URL, CRAWL_DELAY, LISTING_ITEM_SELECTOR, LOADER_SELECTOR, SHOW_MORE_SELECTOR,
+        DETAIL_FIELD_SELECTORS, DETAIL_MIN_LENGTHS, DETAIL_EXTRACTION_FN
+    )
+except ImportError:
+    from utils.chrome_driver import create_chrome_driver
+    from utils.rate_limit import CrawlDelayLimiter
+    from utils.page_readiness import StepTimer, wait_for_count_increase, wait_for_dom_settled
+    from utils.checkpoint import CrawlCheckpoint
+    from utils.bdo_site import (
+        BDO_URL, CRAWL_DELAY, LISTING_ITEM_SELECTOR, LOADER_SELECTOR, SHOW_MORE_SELECTOR,
+        DETAIL_FIELD_SELECTORS, DETAIL_MIN_LENGTHS, DETAIL_EXTRACTION_FN
+    )
+
 OUTPUT_DIR = Path("foreclosed_scraper/data")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUT_FILE = OUTPUT_DIR / "bdo_robots_compliant_detailed.json"
+CHECKPOINT_FILE = OUTPUT_DIR / "bdo_checkpoint.json"
+CHECKPOINT_EVERY_CLICKS = 5  # Harvest new cards into the checkpoint every N Show More clicks
+CHECKPOINT_EVERY_DETAILS = 10  # Save the checkpoint after every N enriched detail pages
+
+DETAIL_WORKERS = 3  # Headless drivers fetching detail pages in parallel
 
-BDO_URL = "https://www.bdo.com.ph/personal/assets-for-sale/real-estate/results-page"
-CRAWL_DELAY = 10  # 10 seconds as specified in robots.txt
+DETAIL_EXTRACTION_SCRIPT = f"return ({DETAIL_EXTRACTION_FN})(arguments[0], arguments[1]);"
 
-def extract_properties_from_dom(driver):
-    """Extract all properties from the DOM using the actual HTML structure."""
+def extract_properties_from_dom(driver, start=0):
+    """Extract properties from the DOM using the actual HTML structure.
+    
+    Cards before ``start`` are skipped, so a growing listing can be
+    harvested incrementally without re-reading cards already extracted.
+    """
     properties = []
-    items = driver.find_elements(By.CSS_SELECTOR, ".pmu-productListing .item")
+    items = driver.find_elements(By.CSS_SELECTOR, LISTING_ITEM_SELECTOR)[start:]
     
     for item in items:
         prop = {
@@ -96,145 +127,172 @@ def extract_properties_from_dom(driver):
     
     return properties
 
-def get_property_details(driver, property_url, wait):
-    """Get detailed information from a property's detail page."""
+def count_listing_items(driver):
+    """Count the property cards currently in the DOM with one script call."""
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", LISTING_ITEM_SELECTOR)
+
+def empty_detailed_info():
+    """Return a detailed-info record with every field set to NA."""
+    return {field: "NA" for field in DETAIL_FIELD_SELECTORS}
+
+def has_detailed_info(prop):
+    """Return True if a card holds at least one real detail field."""
+    details = prop.get("Detailed_info") or {}
+    return any(value != "NA" for value in details.values())
+
+def details_fetched(checkpoint):
+    """Return the detail URLs whose pages were fetched, as recorded in the checkpoint.
+    
+    A fetched page counts as done even if every field on it is NA, so it
+    is not requested again on --resume/--enrich-only; a failed fetch is
+    never recorded. Checkpoints written before fetches were recorded
+    count the cards that hold a real detail field.
+    """
+    if checkpoint is None:
+        return set()
+    if "details_fetched" not in checkpoint.state:
+        checkpoint.state["details_fetched"] = [
+            card["Additional_information"] for card in checkpoint.state.get("cards", [])
+            if has_detailed_info(card)
+        ]
+    return set(checkpoint.state["details_fetched"])
+
+def get_property_details(driver, property_url, wait, timer):
+    """Get detailed information from a property's detail page.
+    
+    Returns:
+        The detail fields ("NA" where the page has none), or None if the
+        page could not be loaded or read, so the card is retried later
+    """
     print(f"Getting details from: {property_url}")
     
     try:
-        # Navigate to the property detail page
-        driver.get(property_url)
-        
-        # Wait for the page to load
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "body")))
-        time.sleep(3)  # Additional wait for content to load
+        # Navigate to the property detail page and wait until client-side
+        # rendering stops mutating the DOM instead of sleeping
+        with timer.step("detail_load"):
+            driver.get(property_url)
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "body")))
+            wait_for_dom_settled(driver)
         
-        detailed_info = {
-            "full_address": "NA",
-            "detailed_description": "NA",
-            "property_features": "NA",
-            "contact_info": "NA",
-            "viewing_info": "NA",
-            "terms_conditions": "NA"
-        }
-        
-        # Try to extract detailed information
+        # Extract every field in one script call instead of one
+        # find_element round trip per candidate selector
+        detailed_info = empty_detailed_info()
         try:
-            # Look for detailed address
-            address_selectors = [
-                ".property-address", ".address", ".location", 
-                "[class*='address']", "[class*='location']"
-            ]
-            for selector in address_selectors:
-                try:
-                    addr_el = driver.find_element(By.CSS_SELECTOR, selector)
-                    if addr_el.text.strip():
-                        detailed_info["full_address"] = addr_el.text.strip()
-                        break
-                except:
-                    continue
-            
-            # Look for detailed description
-            desc_selectors = [
-                ".description", ".details", ".summary", ".content",
-                "[class*='description']", "[class*='details']", "p"
-            ]
-            for selector in desc_selectors:
-                try:
-                    desc_el = driver.find_element(By.CSS_SELECTOR, selector)
-                    if desc_el.text.strip() and len(desc_el.text.strip()) > 50:
-                        detailed_info["detailed_description"] = desc_el.text.strip()
-                        break
-                except:
-                    continue
-            
-            # Look for property features
-            feature_selectors = [
-                ".features", ".amenities", ".specifications",
-                "[class*='feature']", "[class*='amenity']"
-            ]
-            for selector in feature_selectors:
-                try:
-                    feature_el = driver.find_element(By.CSS_SELECTOR, selector)
-                    if feature_el.text.strip():
-                        detailed_info["property_features"] = feature_el.text.strip()
-                        break
-                except:
-                    continue
-            
-            # Look for contact information
-            contact_selectors = [
-                ".contact", ".phone", ".email", ".inquiry",
-                "[class*='contact']", "[class*='phone']"
-            ]
-            for selector in contact_selectors:
-                try:
-                    contact_el = driver.find_element(By.CSS_SELECTOR, selector)
-                    if contact_el.text.strip():
-                        detailed_info["contact_info"] = contact_el.text.strip()
-                        break
-                except:
-                    continue
-            
-            # Look for viewing information
-            viewing_selectors = [
-                ".viewing", ".schedule", ".appointment",
-                "[class*='viewing']", "[class*='schedule']"
-            ]
-            for selector in viewing_selectors:
-                try:
-                    viewing_el = driver.find_element(By.CSS_SELECTOR, selector)
-                    if viewing_el.text.strip():
-                        detailed_info["viewing_info"] = viewing_el.text.strip()
-                        break
-                except:
-                    continue
-            
-            # Look for terms and conditions
-            terms_selectors = [
-                ".terms", ".conditions", ".disclaimer",
-                "[class*='term']", "[class*='condition']"
-            ]
-            for selector in terms_selectors:
-                try:
-                    terms_el = driver.find_element(By.CSS_SELECTOR, selector)
-                    if terms_el.text.strip():
-                        detailed_info["terms_conditions"] = terms_el.text.strip()
-                        break
-                except:
-                    continue
-            
+            with timer.step("detail_extract"):
+                extracted = driver.execute_script(
+                    DETAIL_EXTRACTION_SCRIPT, DETAIL_FIELD_SELECTORS, DETAIL_MIN_LENGTHS
+                )
+            if extracted:
+                detailed_info.update(extracted)
             print(f"Extracted detailed info: {len([v for v in detailed_info.values() if v != 'NA'])} fields")
-            
         except Exception as e:
             print(f"Error extracting detailed info: {e}")
+            return None
         
         return detailed_info
         
     except Exception as e:
         print(f"Error getting property details: {e}")
-        return {
-            "full_address": "NA",
-            "detailed_description": "NA",
-            "property_features": "NA",
-            "contact_info": "NA",
-            "viewing_info": "NA",
-            "terms_conditions": "NA"
-        }
+        return None
+
+def detail_worker(worker_id, url_queue, properties, limiter, timer, checkpoint=None, failures=None):
+    """Pull detail URLs from the shared queue and fill in Detailed_info.
+    
+    A successful fetch is recorded in the checkpoint's "details_fetched".
+    A failed fetch leaves Detailed_info empty and is not recorded, so a
+    later --resume/--enrich-only run retries it; its index is appended
+    to ``failures``.
+    """
+    driver = None
+    try:
+        driver = create_chrome_driver(headless=True, block_assets=True)
+        wait = WebDriverWait(driver, 30)
+        while True:
+            try:
+                index = url_queue.get_nowait()
+            except queue.Empty:
+                break
+            prop = properties[index]
+            timer.record("crawl_delay", limiter.wait())
+            print(f"[worker {worker_id}] Property {index+1}/{len(properties)}: {prop['Property_address']}")
+            details = get_property_details(driver, prop["Additional_information"], wait, timer)
+            if details is None:
+                prop["Detailed_info"] = {}
+                if failures is not None:
+                    failures.append(index)
+                continue
+            prop["Detailed_info"] = details
+            if checkpoint:
+                checkpoint.state["details_fetched"].append(prop["Additional_information"])
+                checkpoint.mark_progress()
+    except Exception as e:
+        print(f"[worker {worker_id}] Error: {e}")
+    finally:
+        if driver:
+            driver.quit()
+
+def enrich_details_parallel(properties, workers, timer, checkpoint=None):
+    """Fetch detail pages with a pool of headless drivers.
+    
+    All workers share one CrawlDelayLimiter, so the pool as a whole never
+    requests detail pages faster than the robots.txt crawl delay. Cards
+    whose detail page the checkpoint records as fetched are skipped;
+    every other card with a detail URL is fetched.
+    
+    Returns:
+        Number of cards whose detail page could not be fetched
+    """
+    url_queue = queue.Queue()
+    already_enriched = 0
+    fetched = details_fetched(checkpoint)
+    for i, prop in enumerate(properties):
+        if prop["Additional_information"] in fetched:
+            already_enriched += 1
+        elif prop["Additional_information"] != "NA":
+            url_queue.put(i)
+        else:
+            print(f"\nProperty {i+1}/{len(properties)}: No detail URL available")
+    
+    if already_enriched:
+        print(f"Skipping {already_enriched} properties that already have detailed info")
+    pending = url_queue.qsize()
+    workers = max(1, min(workers, pending))
+    if not pending:
+        return 0
+    
+    print(f"Starting {workers} detail workers for {pending} properties...")
+    limiter = CrawlDelayLimiter(CRAWL_DELAY)
+    failures = []
+    threads = [
+        threading.Thread(target=detail_worker, args=(n + 1, url_queue, properties, limiter, timer, checkpoint, failures), daemon=True)
+        for n in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # Cards left in the queue by a worker that died are not enriched either
+    failed = len(failures) + url_queue.qsize()
+    if failed:
+        print(f"⚠️ {failed} detail pages could not be fetched; rerun with --resume or --enrich-only to retry them")
+    return failed
 
 def check_show_more_button_exists(driver):
     """Check if the Show More button still exists on the page."""
     try:
-        button = driver.find_element(By.CSS_SELECTOR, ".showMore.pmu-btn.secondaryBtn")
+        button = driver.find_element(By.CSS_SELECTOR, SHOW_MORE_SELECTOR)
         return button.is_displayed()
     except:
         return False
 
-def click_show_more_robots_compliant(driver, wait):
+def click_show_more_robots_compliant(driver, wait, limiter, timer):
     """Click Show More button with robots.txt compliance."""
     try:
-        # Wait for the crawl delay before attempting to click
-        print(f"Waiting {CRAWL_DELAY} seconds (robots.txt compliance)...")
-        time.sleep(CRAWL_DELAY)
+        # Wait out whatever is left of the crawl delay since the last request
+        waited = limiter.wait()
+        timer.record("crawl_delay", waited)
+        print(f"Waited {waited:.1f} seconds (robots.txt compliance)")
         
         # Check if button still exists
         if not check_show_more_button_exists(driver):
@@ -242,11 +300,10 @@ def click_show_more_robots_compliant(driver, wait):
             return False
         
         # Try to click the Show More button
-        button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".showMore.pmu-btn.secondaryBtn")))
+        button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SHOW_MORE_SELECTOR)))
         
-        # Scroll button into view
-        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-        time.sleep(2)
+        # Scroll button into view (instantly, so there is no animation to wait for)
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
         
         # Try JavaScript click first (more reliable)
         try:
@@ -267,108 +324,161 @@ def wait_for_loader_to_disappear(driver, timeout=15):
     """Wait for the loading spinner to disappear."""
     try:
         WebDriverWait(driver, timeout).until_not(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".loader.loader-visible"))
+            EC.presence_of_element_located((By.CSS_SELECTOR, LOADER_SELECTOR))
         )
         print("   Loader disappeared")
     except TimeoutException:
         print("   Loader timeout, continuing anyway")
 
-def main():
-    print("\n=== BDO Robots.txt Compliant Scraper with Detailed Info ===")
-    print(f"Target: {BDO_URL}")
-    print(f"Crawl Delay: {CRAWL_DELAY} seconds (robots.txt compliance)")
-    print("Will continue until no more 'Show More' button exists")
-    print("Will extract detailed info from first 3 properties")
-    print("=" * 70)
-    
-    # Setup Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
+def harvest_new_cards(driver, properties, timer, checkpoint, known_details, complete):
+    """Append cards added since the last harvest and checkpoint them."""
+    with timer.step("extract_cards"):
+        new_cards = extract_properties_from_dom(driver, start=len(properties))
+    for card in new_cards:
+        # Keep detail pages enriched before a crash when re-harvesting
+        card["Detailed_info"] = known_details.get(card["Additional_information"], {})
+    properties.extend(new_cards)
     
-    driver = webdriver.Chrome(options=chrome_options)
+    checkpoint.state["cards"] = properties
+    checkpoint.state["harvest_complete"] = complete
+    checkpoint.save()
+    print(f"   Checkpoint saved: {len(properties)} cards harvested")
+
+def harvest_listing(driver, limiter, timer, checkpoint):
+    """Click Show More until the listing is exhausted, checkpointing as it goes.
     
-    # Remove automation flags
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    Returns:
+        Tuple of (harvested cards, number of Show More attempts)
+    """
+    # Detail info from an interrupted run, keyed by detail URL
+    fetched = details_fetched(checkpoint)
+    known_details = {
+        card["Additional_information"]: card["Detailed_info"]
+        for card in checkpoint.state.get("cards", [])
+        if card["Additional_information"] in fetched
+    }
+    properties = []
     
-    try:
-        # Navigate to the page
+    # Navigate to the page
+    limiter.wait()
+    with timer.step("initial_load"):
         driver.get(BDO_URL)
         wait = WebDriverWait(driver, 30)
         
         # Wait for initial property items to load
         print("Waiting for page to load...")
         wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".pmu-productListing .item"))
+            EC.presence_of_element_located((By.CSS_SELECTOR, LISTING_ITEM_SELECTOR))
         )
+    
+    # Count initial properties
+    initial_count = count_listing_items(driver)
+    print(f"Initial properties loaded: {initial_count}")
+    
+    # Automatically click "Show More" until no more button exists
+    attempt = 0
+    current_count = initial_count
+    max_attempts = 100  # High limit to ensure we get all properties
+    
+    print(f"\nStarting robots.txt compliant 'Show More' clicking...")
+    print(f"Clicks are spaced {CRAWL_DELAY} seconds apart (robots.txt compliance)")
+    print(f"Will stop when no more 'Show More' button is found")
+    
+    while attempt < max_attempts:
+        attempt += 1
+        print(f"\nAttempt {attempt}:")
+        
+        # Wait for any loader to disappear
+        with timer.step("loader_wait"):
+            wait_for_loader_to_disappear(driver)
         
-        # Count initial properties
-        initial_count = len(extract_properties_from_dom(driver))
-        print(f"Initial properties loaded: {initial_count}")
+        # Try to click Show More with compliance
+        success = click_show_more_robots_compliant(driver, wait, limiter, timer)
         
-        # Automatically click "Show More" until no more button exists
-        attempt = 0
-        current_count = initial_count
-        max_attempts = 100  # High limit to ensure we get all properties
+        if not success:
+            print("   No more 'Show More' button found - all properties loaded!")
+            break
         
-        print(f"\nStarting robots.txt compliant 'Show More' clicking...")
-        print(f"Each attempt will wait {CRAWL_DELAY} seconds (robots.txt compliance)")
-        print(f"Will stop when no more 'Show More' button is found")
+        # Wait until the loader is gone and more cards are in the DOM
+        print("   Waiting for new properties to load...")
+        with timer.step("show_more_load"):
+            new_count = wait_for_count_increase(
+                driver, LISTING_ITEM_SELECTOR, current_count,
+                loader_selector=LOADER_SELECTOR, done_selector=SHOW_MORE_SELECTOR
+            )
+        print(f"   Properties after click: {new_count}")
         
-        while attempt < max_attempts:
-            attempt += 1
-            print(f"\nAttempt {attempt}:")
-            
-            # Wait for any loader to disappear
-            wait_for_loader_to_disappear(driver)
-            
-            # Try to click Show More with compliance
-            success = click_show_more_robots_compliant(driver, wait)
-            
-            if not success:
-                print("   No more 'Show More' button found - all properties loaded!")
-                break
-            
-            # Wait for new content to load
-            print("   Waiting for new properties to load...")
-            time.sleep(5)
-            wait_for_loader_to_disappear(driver)
-            
-            # Count new properties
-            new_count = len(extract_properties_from_dom(driver))
-            print(f"   Properties after click: {new_count}")
-            
-            if new_count > current_count:
-                print(f"   Loaded {new_count - current_count} more properties!")
-                current_count = new_count
-            else:
-                print(f"   No new properties loaded")
-            
-            # Small random delay between attempts
-            random_delay = random.uniform(2, 5)
-            print(f"   Additional random delay: {random_delay:.1f} seconds")
-            time.sleep(random_delay)
+        if new_count > current_count:
+            print(f"   Loaded {new_count - current_count} more properties!")
+            current_count = new_count
+        else:
+            print(f"   No new properties loaded")
         
-        # Extract all properties
-        print(f"\nExtracting all {current_count} properties...")
-        properties = extract_properties_from_dom(driver)
+        checkpoint.state["show_more_attempts"] = attempt
+        if attempt % CHECKPOINT_EVERY_CLICKS == 0:
+            harvest_new_cards(driver, properties, timer, checkpoint, known_details, complete=False)
+    
+    # Extract the remaining properties
+    print(f"\nExtracting all {current_count} properties...")
+    harvest_new_cards(driver, properties, timer, checkpoint, known_details, complete=True)
+    return properties, attempt
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="BDO robots.txt compliant scraper with detailed property info")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run unattended: headless Chrome, no images/fonts/media, no ENTER prompt")
+    parser.add_argument("--workers", type=int, default=DETAIL_WORKERS,
+                        help=f"Number of headless drivers for detail pages (default: {DETAIL_WORKERS})")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"Continue from {CHECKPOINT_FILE}: skip a finished harvest and already enriched cards")
+    parser.add_argument("--enrich-only", action="store_true",
+                        help="Only fetch detail pages for checkpointed cards without detail fields")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the scraper and return a process exit code."""
+    args = parse_args(argv)
+    exit_code = 0
+    
+    print("\n=== BDO Robots.txt Compliant Scraper with Detailed Info ===")
+    print(f"Target: {BDO_URL}")
+    print(f"Crawl Delay: {CRAWL_DELAY} seconds (robots.txt compliance)")
+    print("Will continue until no more 'Show More' button exists")
+    print(f"Will extract detailed info with {args.workers} parallel detail workers")
+    if args.headless:
+        print("Running unattended in headless mode (images, fonts and media blocked)")
+    print("=" * 70)
+    
+    timer = StepTimer()
+    limiter = CrawlDelayLimiter(CRAWL_DELAY)
+    checkpoint = CrawlCheckpoint(CHECKPOINT_FILE, save_every=CHECKPOINT_EVERY_DETAILS)
+    
+    resumed = (args.resume or args.enrich_only) and checkpoint.load()
+    if args.enrich_only and not resumed:
+        print(f"❌ No checkpoint found at {CHECKPOINT_FILE}; run a harvest first")
+        return 1
+    if not resumed:
+        checkpoint.state = {"url": BDO_URL, "harvest_complete": False, "show_more_attempts": 0, "cards": [],
+                            "details_fetched": []}
+    
+    driver = None
+    try:
+        if args.enrich_only or checkpoint.state.get("harvest_complete"):
+            properties = checkpoint.state["cards"]
+            attempt = checkpoint.state.get("show_more_attempts", 0)
+            print(f"Resuming from checkpoint: {len(properties)} harvested cards, skipping 'Show More' phase")
+        else:
+            if resumed:
+                print("Checkpoint harvest was incomplete, harvesting the listing again")
+            driver = create_chrome_driver(headless=args.headless, block_assets=args.headless)
+            properties, attempt = harvest_listing(driver, limiter, timer, checkpoint)
         
         # Get detailed information for ALL properties
         print(f"\nGetting detailed information for ALL {len(properties)} properties...")
-        for i, prop in enumerate(properties):
-            if prop["Additional_information"] != "NA":
-                print(f"\nProperty {i+1}/{len(properties)}: {prop['Property_address']}")
-                detailed_info = get_property_details(driver, prop["Additional_information"], wait)
-                prop["Detailed_info"] = detailed_info
-                
-                # Wait between detail page visits to be respectful (shorter delay for efficiency)
-                if i < len(properties) - 1:  # Don't wait after the last one
-                    print(f"Waiting 3 seconds before next detail page...")
-                    time.sleep(3)
-            else:
-                print(f"\nProperty {i+1}/{len(properties)}: No detail URL available")
+        with timer.step("detail_phase"):
+            failed_details = enrich_details_parallel(properties, args.workers, timer, checkpoint)
+        checkpoint.save()
         
         # Save to JSON
         with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
@@ -379,9 +489,12 @@ def main():
         print(f"\nSummary:")
         print(f"   - Total properties: {len(properties)}")
         print(f"   - Show More attempts: {attempt}")
-        print(f"   - Properties loaded: {current_count}")
-        print(f"   - Detailed info extracted: {len([p for p in properties if p.get('Detailed_info')])}")
+        print(f"   - Properties loaded: {len(properties)}")
+        fetched = details_fetched(checkpoint)
+        print(f"   - Detailed info extracted: {len([p for p in properties if p['Additional_information'] in fetched])}")
+        print(f"   - Detail pages failed (retried on --resume): {failed_details}")
         print(f"   - Robots.txt compliance: (10s delays)")
+        timer.print_summary()
         
         # Show sample of extracted data
         if properties:
@@ -390,9 +503,17 @@ def main():
         
     except Exception as e:
         print(f"❌ Error: {e}")
+        if checkpoint.state.get("cards"):
+            checkpoint.save()
+            print(f"Progress saved to {CHECKPOINT_FILE}; rerun with --resume to continue")
+        exit_code = 1
     finally:
-        input("\nPress ENTER to close the browser...")
-        driver.quit()
+        if driver:
+            if not args.headless:
+                input("\nPress ENTER to close the browser...")
+            driver.quit()
+    
+    return exit_code
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -6,28 +6,38 @@ Respects BDO's robots.txt guidelines:
 - No restrictions on our target URL
 """
 
-import time
+import sys
+import os
+# Add the parent directory to sys.path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import json
-import random
+import argparse
 from pathlib import Path
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+try:
+    from ..utils.chrome_driver import create_chrome_driver
+    from ..utils.rate_limit import CrawlDelayLimiter
+    from ..utils.page_readiness import StepTimer, wait_for_count_increase
+    from ..utils.bdo_site import BDO_URL, CRAWL_DELAY, LISTING_ITEM_SELECTOR, LOADER_SELECTOR, SHOW_MORE_SELECTOR
+except ImportError:
+    from utils.chrome_driver import create_chrome_driver
+    from utils.rate_limit import CrawlDelayLimiter
+    from utils.page_readiness import StepTimer, wait_for_count_increase
+    from utils.bdo_site import BDO_URL, CRAWL_DELAY, LISTING_ITEM_SELECTOR, LOADER_SELECTOR, SHOW_MORE_SELECTOR
+
 OUTPUT_DIR = Path("foreclosed_scraper/data")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 OUTPUT_FILE = OUTPUT_DIR / "bdo_robots_compliant.json"
 
-BDO_URL = "https://www.bdo.com.ph/personal/assets-for-sale/real-estate/results-page"
-CRAWL_DELAY = 10  # 10 seconds as specified in robots.txt
-
 def extract_properties_from_dom(driver):
     """Extract all properties from the DOM using the actual HTML structure."""
     properties = []
-    items = driver.find_elements(By.CSS_SELECTOR, ".pmu-productListing .item")
+    items = driver.find_elements(By.CSS_SELECTOR, LISTING_ITEM_SELECTOR)
     
     for item in items:
         prop = {
@@ -110,20 +120,25 @@ def extract_properties_from_dom(driver):
     
     return properties
 
+def count_listing_items(driver):
+    """Count the property cards currently in the DOM with one script call."""
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", LISTING_ITEM_SELECTOR)
+
 def check_show_more_button_exists(driver):
     """Check if the Show More button still exists on the page."""
     try:
-        button = driver.find_element(By.CSS_SELECTOR, ".showMore.pmu-btn.secondaryBtn")
+        button = driver.find_element(By.CSS_SELECTOR, SHOW_MORE_SELECTOR)
         return button.is_displayed()
     except:
         return False
 
-def click_show_more_robots_compliant(driver, wait):
+def click_show_more_robots_compliant(driver, wait, limiter, timer):
     """Click Show More button with robots.txt compliance."""
     try:
-        # Wait for the crawl delay before attempting to click
-        print(f"⏳ Waiting {CRAWL_DELAY} seconds (robots.txt compliance)...")
-        time.sleep(CRAWL_DELAY)
+        # Wait out whatever is left of the crawl delay since the last request
+        waited = limiter.wait()
+        timer.record("crawl_delay", waited)
+        print(f"⏳ Waited {waited:.1f} seconds (robots.txt compliance)")
         
         # Check if button still exists
         if not check_show_more_button_exists(driver):
@@ -131,11 +146,10 @@ def click_show_more_robots_compliant(driver, wait):
             return False
         
         # Try to click the Show More button
-        button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".showMore.pmu-btn.secondaryBtn")))
+        button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, SHOW_MORE_SELECTOR)))
         
-        # Scroll button into view
-        driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", button)
-        time.sleep(2)
+        # Scroll button into view (instantly, so there is no animation to wait for)
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button)
         
         # Try JavaScript click first (more reliable)
         try:
@@ -156,44 +170,51 @@ def wait_for_loader_to_disappear(driver, timeout=15):
     """Wait for the loading spinner to disappear."""
     try:
         WebDriverWait(driver, timeout).until_not(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".loader.loader-visible"))
+            EC.presence_of_element_located((By.CSS_SELECTOR, LOADER_SELECTOR))
         )
         print("   ✅ Loader disappeared")
     except TimeoutException:
         print("   ⚠️ Loader timeout, continuing anyway")
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="BDO robots.txt compliant scraper")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run unattended: headless Chrome, no images/fonts/media, no ENTER prompt")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the scraper and return a process exit code."""
+    args = parse_args(argv)
+    exit_code = 0
+    
     print("\n=== BDO Robots.txt Compliant Scraper ===")
     print(f"🌐 Target: {BDO_URL}")
     print(f"⏱️ Crawl Delay: {CRAWL_DELAY} seconds (robots.txt compliance)")
     print("🔄 Will continue until no more 'Show More' button exists")
+    if args.headless:
+        print("🕶️ Running unattended in headless mode (images, fonts and media blocked)")
     print("=" * 60)
     
-    # Setup Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--start-maximized")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    
-    # Remove automation flags
-    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    driver = create_chrome_driver(headless=args.headless, block_assets=args.headless)
+    timer = StepTimer()
+    limiter = CrawlDelayLimiter(CRAWL_DELAY)
     
     try:
         # Navigate to the page
-        driver.get(BDO_URL)
-        wait = WebDriverWait(driver, 30)
-        
-        # Wait for initial property items to load
-        print("⏳ Waiting for page to load...")
-        wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".pmu-productListing .item"))
-        )
+        limiter.wait()
+        with timer.step("initial_load"):
+            driver.get(BDO_URL)
+            wait = WebDriverWait(driver, 30)
+            
+            # Wait for initial property items to load
+            print("⏳ Waiting for page to load...")
+            wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, LISTING_ITEM_SELECTOR))
+            )
         
         # Count initial properties
-        initial_count = len(extract_properties_from_dom(driver))
+        initial_count = count_listing_items(driver)
         print(f"📊 Initial properties loaded: {initial_count}")
         
         # Automatically click "Show More" until no more button exists
@@ -202,7 +223,7 @@ def main():
         max_attempts = 100  # High limit to ensure we get all properties
         
         print(f"\n🔄 Starting robots.txt compliant 'Show More' clicking...")
-        print(f"⏱️ Each attempt will wait {CRAWL_DELAY} seconds (robots.txt compliance)")
+        print(f"⏱️ Clicks are spaced {CRAWL_DELAY} seconds apart (robots.txt compliance)")
         print(f"🛑 Will stop when no more 'Show More' button is found")
         
         while attempt < max_attempts:
@@ -210,22 +231,23 @@ def main():
             print(f"\n📋 Attempt {attempt}:")
             
             # Wait for any loader to disappear
-            wait_for_loader_to_disappear(driver)
+            with timer.step("loader_wait"):
+                wait_for_loader_to_disappear(driver)
             
             # Try to click Show More with compliance
-            success = click_show_more_robots_compliant(driver, wait)
+            success = click_show_more_robots_compliant(driver, wait, limiter, timer)
             
             if not success:
                 print("   🎉 No more 'Show More' button found - all properties loaded!")
                 break
             
-            # Wait for new content to load
+            # Wait until the loader is gone and more cards are in the DOM
             print("   ⏳ Waiting for new properties to load...")
-            time.sleep(5)
-            wait_for_loader_to_disappear(driver)
-            
-            # Count new properties
-            new_count = len(extract_properties_from_dom(driver))
+            with timer.step("show_more_load"):
+                new_count = wait_for_count_increase(
+                    driver, LISTING_ITEM_SELECTOR, current_count,
+                    loader_selector=LOADER_SELECTOR, done_selector=SHOW_MORE_SELECTOR
+                )
             print(f"   📊 Properties after click: {new_count}")
             
             if new_count > current_count:
@@ -233,15 +255,11 @@ def main():
                 current_count = new_count
             else:
                 print(f"   ⚠️ No new properties loaded")
-            
-            # Small random delay between attempts
-            random_delay = random.uniform(2, 5)
-            print(f"   ⏳ Additional random delay: {random_delay:.1f} seconds")
-            time.sleep(random_delay)
         
         # Extract all properties
         print(f"\n📋 Extracting all {current_count} properties...")
-        properties = extract_properties_from_dom(driver)
+        with timer.step("extract_cards"):
+            properties = extract_properties_from_dom(driver)
         
         # Save to JSON
         with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
@@ -254,6 +272,7 @@ def main():
         print(f"   - Show More attempts: {attempt}")
         print(f"   - Properties loaded: {current_count}")
         print(f"   - Robots.txt compliance: ✅ (10s delays)")
+        timer.print_summary()
         
         # Show sample of extracted data
         if properties:
@@ -262,9 +281,13 @@ def main():
         
     except Exception as e:
         print(f"❌ Error: {e}")
+        exit_code = 1
     finally:
-        input("\nPress ENTER to close the browser...")
+        if not args.headless:
+            input("\nPress ENTER to close the browser...")
         driver.quit()
+    
+    return exit_code
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
@@ -6,19 +6,40 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import re
 import json
 import asyncio
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+from bs4 import SoupStrainer
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
 from crawl4ai.extraction_strategy import LLMExtractionStrategy, JsonCssExtractionStrategy
 
 try:
     from ..utils.base_scraper import BaseBankScraper
-    from ..utils.config import BANKS
+    from ..utils.config import BANKS, HTML_PARSER
+    from ..utils.bpi_fields import DETAIL_REGIONS, extract_detail_fields
+    from ..utils.html_parsing import parsed_html, resolve_parser
+    from ..utils.rate_limit import AsyncCrawlDelayLimiter
+    from ..utils.executors import run_in_thread
 except ImportError:
     from utils.base_scraper import BaseBankScraper
-    from utils.config import BANKS
+    from utils.config import BANKS, HTML_PARSER
+    from utils.bpi_fields import DETAIL_REGIONS, extract_detail_fields
+    from utils.html_parsing import parsed_html, resolve_parser
+    from utils.rate_limit import AsyncCrawlDelayLimiter
+    from utils.executors import run_in_thread
+
+# Minimum seconds between two requests to buenamano.ph, shared by all pages
+REQUEST_DELAY = 3
+
+# Number of result pages fetched at the same time
+PAGE_CONCURRENCY = 3
+
+# Page number in result-page links, as a query parameter or a path segment
+PAGE_NUMBER_PATTERN = re.compile(r'([?&]page=|/page/)(\d+)')
+
+# A results page is read only through its h4 property links and its pagination links
+RESULTS_REGIONS = SoupStrainer(['h4', 'a'])
 
 
 class BPIScraper(BaseBankScraper):
@@ -52,32 +73,43 @@ class BPIScraper(BaseBankScraper):
         # and negotiated sale basis (first come, first served)
         self.has_bidding = True
         self.is_negotiated_sale = True
+        
+        # One limiter for all result and detail requests to the host
+        self.limiter = AsyncCrawlDelayLimiter(REQUEST_DELAY)
+        
+        # BeautifulSoup tree builder for result and detail pages
+        self.html_parser = resolve_parser(HTML_PARSER)
     
-    async def _extract_property_list(self, crawler: AsyncWebCrawler) -> List[Dict[str, Any]]:
-        """Extract the list of properties from the BPI/Buena Mano search results page.
+    async def _fetch_results_page(self, crawler: AsyncWebCrawler, url: str,
+                                  attempts: int = 3) -> Optional[Tuple[List[Dict[str, Any]], Dict[int, str]]]:
+        """Fetch and parse one search results page within the host's rate limit.
+        
+        A page without any property links is treated like a blocked page and
+        retried, since challenge and error pages do not always say so.
         
         Args:
             crawler: The web crawler instance
+            url: URL of the results page
+            attempts: Number of tries before giving up
             
         Returns:
-            A list of dictionaries containing property URLs
+            The page's property links and pagination links, see
+            ``_parse_results_page``, or None if every attempt failed
         """
-        print(f"Extracting property links from: {self.bank_url}")
-        
         # Try multiple times with delays to bypass Cloudflare protection
-        for attempt in range(3):
+        for attempt in range(attempts):
             try:
-                print(f"Attempt {attempt + 1}/3")
+                print(f"Attempt {attempt + 1}/{attempts}: {url}")
                 
                 # Add delay between attempts
                 if attempt > 0:
                     await asyncio.sleep(5)
                 
-                # Get the search results page
-                result = await crawler.arun(url=self.bank_url)
+                await self.limiter.wait()
+                result = await crawler.arun(url=url)
                 
                 if not result.html:
-                    print("No HTML content received from the search results page")
+                    print(f"No HTML content received from {url}")
                     continue
                 
                 # Check if we got a Cloudflare protection page
@@ -85,39 +117,117 @@ class BPIScraper(BaseBankScraper):
                     print("Detected Cloudflare protection page, retrying...")
                     continue
                 
-                # Parse the HTML to find all h4 elements with property links
-                soup = BeautifulSoup(result.html, 'html.parser')
-                property_links = []
-                
-                # Find all h4 elements that contain property links
-                h4_elements = soup.find_all('h4')
+                # Pages are parsed in worker threads, off the event loop
+                links, page_urls = await run_in_thread(self._parse_results_page, result.html, url)
+                if links:
+                    return links, page_urls
+                print("No property links found, retrying...")
                 
-                for h4 in h4_elements:
-                    link = h4.find('a')
-                    if link and 'href' in link.attrs:
-                        href = link['href']
-                        title = link.get_text(strip=True)
-                        
-                        # Only include property detail links
-                        if '/property/' in href:
-                            property_links.append({
-                                'title': title,
-                                'detail_url': href
-                            })
-                
-                print(f"Found {len(property_links)} property links")
-                
-                if property_links:
-                    return property_links
-                else:
-                    print("No property links found, retrying...")
-                    
             except Exception as e:
-                print(f"Error extracting property links (attempt {attempt + 1}): {e}")
+                print(f"Error fetching {url} (attempt {attempt + 1}): {e}")
                 continue
         
-        print("Failed to extract property links after 3 attempts")
-        return []
+        return None
+    
+    def _parse_results_page(self, html: str, page_url: str) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+        """Collect property links and pagination links from a results page.
+        
+        Args:
+            html: HTML of the results page
+            page_url: URL the page was fetched from, for resolving relative links
+            
+        Returns:
+            Property links in page order, and result-page URLs keyed by page number
+        """
+        property_links = []
+        page_urls = {}
+        with parsed_html(html, RESULTS_REGIONS, self.html_parser) as soup:
+            # Find all h4 elements that contain property links
+            for h4 in soup.find_all('h4'):
+                link = h4.find('a')
+                if link and 'href' in link.attrs:
+                    href = link['href']
+                    title = link.get_text(strip=True)
+                
+                    # Only include property detail links
+                    if '/property/' in href:
+                        property_links.append({
+                            'title': title,
+                            'detail_url': href
+                        })
+        
+            # Pagination links; truncated paginators are followed as more pages arrive
+            for link in soup.find_all('a', href=PAGE_NUMBER_PATTERN):
+                match = PAGE_NUMBER_PATTERN.search(link['href'])
+                page_urls.setdefault(int(match.group(2)), urljoin(page_url, link['href']))
+        
+        return property_links, page_urls
+    
+    async def _extract_property_list(self, crawler: AsyncWebCrawler) -> List[Dict[str, Any]]:
+        """Extract the list of properties from every BPI/Buena Mano search results page.
+        
+        The first page is fetched to discover the pagination; the remaining
+        pages are fetched concurrently, a few at a time, under the shared
+        rate limit. Detail links are deduplicated across pages.
+        
+        Args:
+            crawler: The web crawler instance
+            
+        Returns:
+            A list of dictionaries containing property URLs
+        """
+        print(f"Extracting property links from: {self.bank_url}")
+        
+        first_page = await self._fetch_results_page(crawler, self.bank_url)
+        if first_page is None:
+            print("Failed to extract property links after 3 attempts")
+            return []
+        
+        first_links, page_urls = first_page
+        print(f"Found {len(first_links)} property links on page 1")
+        results = {1: first_links}
+        semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+        
+        async def fetch_page(page_number: int, url: str):
+            async with semaphore:
+                page = await self._fetch_results_page(crawler, url)
+            if page is None:
+                print(f"Giving up on results page {page_number}")
+                return page_number, [], {}
+            links, more_pages = page
+            print(f"Found {len(links)} property links on page {page_number}")
+            return page_number, links, more_pages
+        
+        # Fetch every known page; page numbers revealed by a fetched page
+        # (truncated paginators) are scheduled as soon as they are seen
+        tasks = set()
+        scheduled = set(results)
+        
+        def schedule(pages: Dict[int, str]) -> None:
+            for number, url in sorted(pages.items()):
+                if number not in scheduled:
+                    scheduled.add(number)
+                    tasks.add(asyncio.ensure_future(fetch_page(number, url)))
+        
+        schedule(page_urls)
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page_number, links, more_pages = task.result()
+                results[page_number] = links
+                schedule(more_pages)
+        
+        # Merge in page order, keeping the first occurrence of each detail URL
+        property_links = []
+        seen_urls = set()
+        for page_number in sorted(results):
+            for link in results[page_number]:
+                if link['detail_url'] not in seen_urls:
+                    seen_urls.add(link['detail_url'])
+                    property_links.append(link)
+        
+        print(f"Found {len(property_links)} property links on {len(results)} results pages")
+        return property_links
     
     async def _extract_property_details(self, crawler: AsyncWebCrawler, detail_url: str) -> Dict[str, Any]:
         """Extract detailed information for a specific property.
@@ -133,130 +243,15 @@ class BPIScraper(BaseBankScraper):
         
         try:
             # Get the property detail page
+            await self.limiter.wait()
             result = await crawler.arun(url=detail_url)
             
             if not result.html:
                 print(f"No HTML content received from: {detail_url}")
                 return {}
             
-            # Parse the HTML to extract property details
-            soup = BeautifulSoup(result.html, 'html.parser')
-            
-            # Extract data from property-summary div
-            property_summary = soup.find('div', class_='property-summary')
-            property_data = {
-                'url': detail_url,
-                'location': 'NA',
-                'address': 'NA',
-                'lot_area_sqm': 'NA',
-                'floor_area_sqm': 'NA',
-                'price_php': 'NA',
-                'storeys': 'NA',
-                'bedrooms': 'NA',
-                'bathrooms': 'NA',
-                'usage_classification': 'NA',
-                'property_classification': 'NA',
-                'special_concerns': 'NA',
-                'sales_advisor': 'NA',
-                'contact_no': 'NA',
-                'alternate': 'NA',
-                'alternate_no': 'NA'
-            }
-            
-            if property_summary:
-                # Extract title
-                h3 = property_summary.find('h3')
-                if h3:
-                    property_data['title'] = h3.get_text(strip=True)
-                
-                # Extract location and address
-                p_elements = property_summary.find_all('p')
-                for p in p_elements:
-                    text = p.get_text(strip=True)
-                    
-                    if 'Location :' in text:
-                        location = text.replace('Location :', '').strip()
-                        property_data['location'] = location
-                    
-                    elif 'Address:' in text:
-                        # Address might be in the next p element
-                        continue
-                    
-                    elif 'Lot Area (sqm) :' in text:
-                        lot_area = text.replace('Lot Area (sqm) :', '').strip()
-                        property_data['lot_area_sqm'] = lot_area
-                    
-                    elif 'Floor Area (sqm) :' in text:
-                        floor_area = text.replace('Floor Area (sqm) :', '').strip()
-                        property_data['floor_area_sqm'] = floor_area
-                    
-                    elif 'Price (Php) :' in text:
-                        price = text.replace('Price (Php) :', '').strip()
-                        property_data['price_php'] = price
-                    
-                    elif 'Storeys :' in text:
-                        storeys = text.replace('Storeys :', '').strip()
-                        property_data['storeys'] = storeys
-                    
-                    elif 'Bedrooms :' in text:
-                        bedrooms = text.replace('Bedrooms :', '').strip()
-                        property_data['bedrooms'] = bedrooms
-                    
-                    elif 'Bathrooms :' in text:
-                        bathrooms = text.replace('Bathrooms :', '').strip()
-                        property_data['bathrooms'] = bathrooms
-                    
-                    elif 'Usage Classification :' in text:
-                        usage = text.replace('Usage Classification :', '').strip()
-                        property_data['usage_classification'] = usage
-                
-                # Extract address (it's usually in a separate p element)
-                address_p = property_summary.find('p', string=lambda text: text and 'Lot' in text and 'Block' in text)
-                if address_p:
-                    property_data['address'] = address_p.get_text(strip=True)
-            
-            # Extract data from property-location-content div
-            property_location = soup.find('div', class_='property-location-content')
-            if property_location:
-                p_elements = property_location.find_all('p')
-                for p in p_elements:
-                    text = p.get_text(strip=True)
-                    
-                    if 'Property Classification:' in text:
-                        classification = text.replace('Property Classification:', '').strip()
-                        property_data['property_classification'] = classification
-                    
-                    elif 'Special Concerns:' in text:
-                        # Special concerns might be in the next elements
-                        continue
-                    
-                    elif 'Sales Advisor :' in text:
-                        advisor = text.replace('Sales Advisor :', '').strip()
-                        property_data['sales_advisor'] = advisor
-                    
-                    elif 'Contact No. :' in text:
-                        contact = text.replace('Contact No. :', '').strip()
-                        property_data['contact_no'] = contact
-                    
-                    elif 'Alternate :' in text:
-                        alternate = text.replace('Alternate :', '').strip()
-                        property_data['alternate'] = alternate
-                    
-                    elif "Alternate's No. :" in text:
-                        alternate_no = text.replace("Alternate's No. :", '').strip()
-                        property_data['alternate_no'] = alternate_no
-                
-                # Extract special concerns (it might be in a list or separate text)
-                special_concerns = property_location.find('p', string=lambda text: text and 'Special Concerns:' in text)
-                if special_concerns:
-                    # Get the next sibling elements for special concerns
-                    next_elem = special_concerns.find_next_sibling()
-                    if next_elem:
-                        concerns_text = next_elem.get_text(strip=True)
-                        if concerns_text and concerns_text != '-':
-                            property_data['special_concerns'] = concerns_text
-            
-            return property_data
+            # Parse the HTML to extract property details, off the event loop
+            return await run_in_thread(self._parse_detail_page, result.html, detail_url)
             
         except Exception as e:
             print(f"Error extracting property details from {detail_url}: {e}")
@@ -265,6 +260,40 @@ class BPIScraper(BaseBankScraper):
                 'error': f"Failed to extract details: {str(e)}"
             }
     
+    def _parse_detail_page(self, html: str, detail_url: str) -> Dict[str, Any]:
+        """Read the fields of a property detail page.
+        
+        Args:
+            html: HTML of the detail page
+            detail_url: URL of the detail page
+            
+        Returns:
+            The property fields, "NA" where the page has none
+        """
+        property_data = {
+            'url': detail_url,
+            'location': 'NA',
+            'address': 'NA',
+            'lot_area_sqm': 'NA',
+            'floor_area_sqm': 'NA',
+            'price_php': 'NA',
+            'storeys': 'NA',
+            'bedrooms': 'NA',
+            'bathrooms': 'NA',
+            'usage_classification': 'NA',
+            'property_classification': 'NA',
+            'special_concerns': 'NA',
+            'sales_advisor': 'NA',
+            'contact_no': 'NA',
+            'alternate': 'NA',
+            'alternate_no': 'NA'
+        }
+        
+        with parsed_html(html, DETAIL_REGIONS, self.html_parser) as soup:
+            property_data.update(extract_detail_fields(soup, address_field='address'))
+        
+        return property_data
+    
     def _normalize_data(self, property_data: Dict[str, Any]) -> Dict[str, Any]:
         """Return property data as-is without normalization.
         
@@ -7,7 +7,7 @@ import re
 import json
 import asyncio
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 from urllib.parse import urljoin
 
@@ -16,10 +16,20 @@ from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 
 try:
     from ..utils.base_scraper import BaseBankScraper
-    from ..utils.config import BANKS, OUTPUT_PATH
+    from ..utils.config import BANKS, OUTPUT_PATH, HTML_PARSER
+    from ..utils.executors import run_in_thread
+    from ..utils.html_parsing import only_classes, parsed_html, resolve_parser
 except ImportError:
     from utils.base_scraper import BaseBankScraper
-    from utils.config import BANKS, OUTPUT_PATH
+    from utils.config import BANKS, OUTPUT_PATH, HTML_PARSER
+    from utils.executors import run_in_thread
+    from utils.html_parsing import only_classes, parsed_html, resolve_parser
+
+# Listing pages are parsed card by card; a page laid out differently is parsed whole
+LISTING_REGIONS = only_classes('content_card')
+
+# Detail pages are parsed only where their labelled content_card-* fields are
+DETAIL_REGIONS = only_classes('content_card', prefix=True)
 
 class EastwestBankScraper(BaseBankScraper):
     """Scraper for Eastwest Bank foreclosed properties."""
@@ -40,6 +50,8 @@ class EastwestBankScraper(BaseBankScraper):
         self.bank_name = "Eastwest Bank"
         self.url = BANKS['eastwest_bank']['url']
         self.max_results = None  # Explicitly override any inherited value
+        # BeautifulSoup tree builder for listing and detail pages
+        self.html_parser = resolve_parser(HTML_PARSER)
     
     async def _extract_property_list(self, crawler: AsyncWebCrawler) -> List[Dict[str, Any]]:
         """
@@ -70,18 +82,47 @@ class EastwestBankScraper(BaseBankScraper):
                     logging.warning(f"No HTML content received for page {page}")
                     break
                 
-                soup = BeautifulSoup(result.html, 'html.parser')
+                # Parsed off the event loop, so concurrent banks keep fetching
+                page_properties = await run_in_thread(self._parse_listing_page, result.html)
+                if page_properties is None:
+                    logging.warning(f"No property blocks found on page {page}")
+                    break
                 
+                logging.info(f"Found {len(page_properties)} properties on page {page}")
+                properties.extend(page_properties)
+                    
+            except Exception as e:
+                logging.error(f"Error scraping page {page}: {e}")
+                break
+            
+            page += 1
+            
+            # Add a small delay between requests
+            await asyncio.sleep(1)
+        
+        logging.info(f"Total properties extracted: {len(properties)}")
+        return properties
+    
+    def _parse_listing_page(self, html: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse the properties of one listing page; runs in a worker thread.
+        
+        Only the content_card regions are built; if none of them holds a
+        property block, the page is parsed again in full.
+        
+        Returns:
+            The properties, each with address "NA" until its detail page is read,
+            or None if the page has no property blocks
+        """
+        for regions in (LISTING_REGIONS, None):
+            with parsed_html(html, regions, self.html_parser) as soup:
                 # Based on the actual page structure, properties are listed in a specific format
                 # Look for property blocks that contain "Property No." text
                 property_blocks = self._find_property_blocks(soup)
-                
                 if not property_blocks:
-                    logging.warning(f"No property blocks found on page {page}")
-                    break
-                
-                logging.info(f"Found {len(property_blocks)} properties on page {page}")
+                    continue
                 
+                properties = []
                 for block in property_blocks:
                     try:
                         prop = self._extract_property_from_block(block)
@@ -92,18 +133,21 @@ class EastwestBankScraper(BaseBankScraper):
                     except Exception as e:
                         logging.error(f"Error extracting property from block: {e}")
                         continue
-                    
-            except Exception as e:
-                logging.error(f"Error scraping page {page}: {e}")
-                break
-            
-            page += 1
-            
-            # Add a small delay between requests
-            await asyncio.sleep(1)
-        
-        logging.info(f"Total properties extracted: {len(properties)}")
-        return properties
+                return properties
+        return None
+    
+    def _parse_address(self, html: str) -> Optional[str]:
+        """
+        Read the address from a property detail page; runs in a worker thread.
+        """
+        with parsed_html(html, DETAIL_REGIONS, self.html_parser) as soup:
+            # Look for address in the detailed property page
+            address_elem = soup.find('div', class_='content_card-info-label', string='Address')
+            if address_elem:
+                address_text_elem = address_elem.find_next_sibling('div', class_='content_card-info-text')
+                if address_text_elem:
+                    return address_text_elem.get_text(strip=True)
+        return None
     
     def _find_property_blocks(self, soup: BeautifulSoup) -> List:
         """
@@ -321,15 +365,10 @@ class EastwestBankScraper(BaseBankScraper):
                     
                     result = await crawler.arun(url=prop['url'], config=run_config)
                     if result.html:
-                        soup = BeautifulSoup(result.html, 'html.parser')
-                        
-                        # Look for address in the detailed property page
-                        address_elem = soup.find('div', class_='content_card-info-label', string='Address')
-                        if address_elem:
-                            address_text_elem = address_elem.find_next_sibling('div', class_='content_card-info-text')
-                            if address_text_elem:
-                                prop['address'] = address_text_elem.get_text(strip=True)
-                                logging.info(f"Found address: {prop['address']}")
+                        address = await run_in_thread(self._parse_address, result.html)
+                        if address is not None:
+                            prop['address'] = address
+                            logging.info(f"Found address: {prop['address']}")
                     
                     # Add a small delay between requests
                     await asyncio.sleep(0.5)
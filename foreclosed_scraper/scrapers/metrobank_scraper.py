@@ -6,41 +6,77 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import re
 import json
 import asyncio
-from typing import Dict, List, Any
+import argparse
+from functools import partial
+from typing import Dict, Iterator, List, Any, Optional
 from pathlib import Path
 
-import pdfplumber
 from crawl4ai import AsyncWebCrawler
 
 try:
     from ..utils.base_scraper import BaseBankScraper
-    from ..utils.config import BANKS
+    from ..utils.config import BANKS, PDF_BACKEND, PDF_MEMORY_LIMIT_MB
+    from ..utils.executors import run_in_process
+    from ..utils.json_stream import StreamingJSONWriter
+    from ..utils.memory import MemoryCeiling
+    from ..utils.pdf_backends import BACKENDS, open_pdf, resolve_backend
+    from ..utils.pdf_batch import PDF_INPUT_DIR, find_bank_pdfs, run_batch
+    from ..utils.pdf_cache import PDFCache, parser_version
+    from ..utils.pdf_pages import PAGE_TABLE, PDFPLUMBER_VERSION, extract_page_tables, reuse_page_results, scan_pages
 except ImportError:
     from utils.base_scraper import BaseBankScraper
-    from utils.config import BANKS
+    from utils.config import BANKS, PDF_BACKEND, PDF_MEMORY_LIMIT_MB
+    from utils.executors import run_in_process
+    from utils.json_stream import StreamingJSONWriter
+    from utils.memory import MemoryCeiling
+    from utils.pdf_backends import BACKENDS, open_pdf, resolve_backend
+    from utils.pdf_batch import PDF_INPUT_DIR, find_bank_pdfs, run_batch
+    from utils.pdf_cache import PDFCache, parser_version
+    from utils.pdf_pages import PAGE_TABLE, PDFPLUMBER_VERSION, extract_page_tables, reuse_page_results, scan_pages
+
+# Name of the parser's records in the PDF cache
+PARSER_NAME = "metrobank"
+# Start of the Metrobank PDF file names in pdf_input
+PDF_PREFIX = "metrobank"
+# A property listed in several PDFs is kept once, from the newest
+BATCH_KEY_FIELDS = ("Property No",)
 
 
 class MetrobankScraper(BaseBankScraper):
     """Scraper for Metrobank foreclosed properties from PDF."""
     
-    def __init__(self, *args, **kwargs):
-        """Initialize the Metrobank scraper."""
+    def __init__(self, *args, pdf_path: Optional[str] = None, workers: Optional[int] = None, memory_limit_mb: Optional[float] = None, backend: Optional[str] = None, **kwargs):
+        """Initialize the Metrobank scraper.
+        
+        Args:
+            pdf_path: PDF to extract; defaults to the newest Metrobank PDF in pdf_input
+            workers: Processes used to extract the PDF's tables when run directly; defaults
+                to the CPU count. Scrapes in the shared process pool use one
+            memory_limit_mb: Memory ceiling of ``stream_to_file`` in MiB;
+                defaults to PDF_MEMORY_LIMIT_MB, 0 disables it
+            backend: PDF backend that reads the page layout; defaults to PDF_BACKEND
+        """
         bank_name = "Metrobank"
         bank_url = BANKS[bank_name.lower()]['url']
         super().__init__(bank_name=bank_name, bank_url=bank_url, *args, **kwargs)
-        self.pdf_path = self._find_metrobank_pdf()
+        self.pdf_path = pdf_path or self._find_metrobank_pdf()
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = resolve_backend(backend or PDF_BACKEND)
+        self.pdf_cache = PDFCache()
+        # Cached records are reused only while this code, the backend and pdfplumber are unchanged
+        self.parser_version = parser_version(MetrobankScraper, extract_page_tables, open_pdf, PDFPLUMBER_VERSION, self.backend)
+        self.memory_limit_mb = PDF_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
         
     def _find_metrobank_pdf(self) -> str:
-        """Find the Metrobank PDF file in the pdf_input folder.
+        """Find the newest Metrobank PDF file in the pdf_input folder.
         
         Returns:
             Path to the PDF file or None if not found
         """
-        pdf_dir = os.path.join("foreclosed_scraper", "pdf_input")
-        for fname in os.listdir(pdf_dir):
-            if fname.lower().startswith("metrobank") and fname.lower().endswith(".pdf"):
-                return os.path.join(pdf_dir, fname)
-        print(f"No PDF file starting with 'METROBANK' found in {pdf_dir}")
+        pdf_files = find_bank_pdfs(PDF_PREFIX)
+        if pdf_files:
+            return str(pdf_files[0][0])
+        print(f"No PDF file starting with 'METROBANK' found in {PDF_INPUT_DIR}")
         return None
     
     async def _extract_property_list(self, crawler=None) -> List[Dict[str, Any]]:
@@ -52,43 +88,161 @@ class MetrobankScraper(BaseBankScraper):
         Returns:
             A list of dictionaries containing property information
         """
+        if not self._check_pdf():
+            return []
+        
+        try:
+            # Parsed in the shared process pool, so other banks' requests
+            # in this event loop keep running meanwhile; the pool has a
+            # process per CPU already, so the pages are not spread further
+            properties = await run_in_process(extract_metrobank_pdf, self.pdf_path, 1, self.backend)
+            print(f"Successfully extracted {len(properties)} properties from PDF")
+            return properties
+                
+        except Exception as e:
+            print(f"Error processing PDF: {e}")
+            return []
+    
+    def stream_to_file(self, output_path: Optional[Path] = None) -> int:
+        """Extract the PDF's properties straight into the output file.
+        
+        Rows are written as each page is processed instead of being
+        collected first, so memory use stays flat however long the PDF is.
+        
+        Args:
+            output_path: JSON file to write; defaults to the scraper's output path
+            
+        Returns:
+            Number of properties written
+            
+        Raises:
+            MemoryLimitError: If memory use exceeds the configured ceiling
+        """
+        if not self._check_pdf():
+            return 0
+        
+        memory_ceiling = MemoryCeiling(self.memory_limit_mb)
+        with StreamingJSONWriter(output_path or self.output_path, key_fields=()) as writer:
+            for property_data in self._cached_properties(memory_ceiling):
+                writer.write(self._normalize_data(property_data))
+        
+        print(f"Saved {writer.written} properties to {writer.path}")
+        if memory_ceiling.peak_mb:
+            print(f"Peak resident memory: {memory_ceiling.peak_mb:.0f} MiB")
+        return writer.written
+    
+    def scrape_batch(self, output_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """Extract every Metrobank PDF in pdf_input, several at once.
+        
+        Each property is tagged with the PDF it came from and that PDF's
+        listing date, and a property found in several PDFs is kept once,
+        as listed in the newest one.
+        
+        Args:
+            output_path: JSON file to write; defaults to the scraper's output path
+            
+        Returns:
+            The merged properties
+        """
+        properties = run_batch(
+            PDF_PREFIX, partial(extract_metrobank_pdf, backend=self.backend), BATCH_KEY_FIELDS, self.workers
+        )
+        with StreamingJSONWriter(output_path or self.output_path, key_fields=()) as writer:
+            for property_data in properties:
+                writer.write(self._normalize_data(property_data))
+        print(f"Saved {writer.written} properties to {writer.path}")
+        return properties
+    
+    def _check_pdf(self) -> bool:
+        """Report whether the Metrobank PDF is available."""
         if not self.pdf_path:
             print("No Metrobank PDF file found to scrape.")
-            return []
+            return False
         
         if not os.path.exists(self.pdf_path):
             print(f"PDF file not found at {self.pdf_path}")
-            return []
+            return False
         
         print(f"Starting scraping for {self.bank_name} from PDF: {self.pdf_path}")
-        properties = []
+        return True
+    
+    def _cached_properties(self, memory_ceiling: Optional[MemoryCeiling] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the stored properties of an unchanged PDF, or extract and store them.
         
-        try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                print(f"Processing {len(pdf.pages)} pages from PDF")
+        Args:
+            memory_ceiling: Checked after every extracted page, if given
+            
+        Returns:
+            An iterator over property dictionaries keyed by the PDF's column names
+        """
+        return self.pdf_cache.records(
+            self.pdf_path, PARSER_NAME, self.parser_version,
+            lambda: self._iter_properties(memory_ceiling)
+        )
+    
+    def _iter_properties(self, memory_ceiling: Optional[MemoryCeiling] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the properties of the Metrobank PDF in page order.
+        
+        Each page's layout objects are released once its table is read, so
+        only the page being processed is held in memory.
+        
+        Args:
+            memory_ceiling: Checked after every page, if given
+            
+        Yields:
+            Property dictionaries keyed by the PDF's column names
+        """
+        # Tables are extracted page-parallel in worker processes and
+        # arrive here in page order, so the output matches a serial run.
+        # Each page's table is read straight from its ruling lines.
+        # Pages that draw nothing (disclaimers, covers) are skipped
+        # by a cheap triage pass whose result is cached per PDF, and
+        # pages unchanged since an earlier PDF reuse their tables.
+        page_kinds, fingerprints = scan_pages(self.pdf_path, self.pdf_cache)
+        table_pages = [i for i, kind in enumerate(page_kinds) if kind == PAGE_TABLE]
+        print(f"{len(table_pages)} of {len(page_kinds)} pages may contain tables")
+        print(f"Extracting tables with {self.workers} worker process(es) and {self.backend}")
+        page_tables = reuse_page_results(
+            table_pages, fingerprints, self.pdf_cache.page_store(PARSER_NAME, self.parser_version),
+            lambda pages: extract_page_tables(self.pdf_path, self.workers, ruled_grid=True, page_numbers=pages, backend=self.backend)
+        )
+        page_count = 0
+        header_row = None
+        for page_num, tables in page_tables:
+            page_count += 1
+            print(f"Processing page {page_num}")
+            
+            for table_num, table in enumerate(tables):
+                if not table:
+                    continue
                 
-                for page_num, page in enumerate(pdf.pages):
-                    print(f"Processing page {page_num + 1}")
-                    
-                    # Extract tables from the page
-                    tables = page.extract_tables()
-                    
-                    for table_num, table in enumerate(tables):
-                        if not table or len(table) < 2:  # Skip empty tables or tables with only header
-                            continue
-                        
-                        print(f"Processing table {table_num + 1} on page {page_num + 1} with {len(table)} rows")
-                        
-                        # Process the table
-                        table_properties = self._process_table(table, page_num + 1, table_num + 1)
-                        properties.extend(table_properties)
+                print(f"Processing table {table_num + 1} on page {page_num} with {len(table)} rows")
                 
-                print(f"Successfully extracted {len(properties)} properties from PDF")
-                return properties
+                # The column layout is learned once, from the first table
+                # with a header row; later tables are mapped by position
+                rows = table
+                if header_row is None:
+                    header_row_index = self._find_header_row(table)
+                    if header_row_index < 0:
+                        print(f"No valid property header row found in table {table_num + 1} on page {page_num}")
+                        continue
+                    header_row = [str(cell).strip() if cell else "" for cell in table[header_row_index]]
+                    rows = table[header_row_index + 1:]
                 
-        except Exception as e:
-            print(f"Error processing PDF: {e}")
-            return []
+                if len(table[0]) == len(header_row):
+                    table_properties = self._map_rows(rows, header_row)
+                    print(f"Extracted {len(table_properties)} properties from table {table_num + 1} on page {page_num}")
+                elif len(table) >= 2:
+                    # A table with different columns gets its own header
+                    table_properties = self._process_table(table, page_num, table_num + 1)
+                else:
+                    continue
+                yield from table_properties
+            
+            if memory_ceiling is not None:
+                memory_ceiling.check(f"page {page_num}")
+        
+        print(f"Processed {page_count} pages from PDF")
     
     def _process_table(self, table: List[List], page_num: int, table_num: int) -> List[Dict[str, Any]]:
         """Process a single table and extract property data.
@@ -104,39 +258,11 @@ class MetrobankScraper(BaseBankScraper):
         properties = []
         
         # Find the header row
-        header_row = None
-        header_row_index = -1
-        
-        for i, row in enumerate(table):
-            if not row:
-                continue
-            
-            # Convert all cells to strings and clean them
-            row_str = [str(cell).strip() if cell else "" for cell in row]
-            
-            # Skip disclaimer rows
-            if any("disclaimer" in cell.lower() for cell in row_str if cell):
-                continue
-            
-            # Look for actual property table headers (not disclaimer)
-            # Check if this row contains property-related headers
-            row_text = " ".join(row_str).upper()
-            
-            # Look for common property table header patterns
-            if (any(keyword in row_text for keyword in 
-                   ["PROPERTY", "LOCATION", "PRICE", "AREA", "DESCRIPTION", "TYPE", "CLASSIFICATION"]) and
-                not any(keyword in row_text for keyword in ["DISCLAIMER", "AS-IS", "WHERE-IS", "NO RECOURSE"])):
-                
-                # Additional check: make sure it's not just a single property ID
-                if len([cell for cell in row_str if cell and len(cell) > 5]) >= 3:
-                    header_row = row_str
-                    header_row_index = i
-                    print(f"Found property header row at index {i}: {[cell[:50] + '...' if len(cell) > 50 else cell for cell in header_row]}")
-                    break
-        
-        if not header_row:
+        header_row_index = self._find_header_row(table)
+        if header_row_index < 0:
             print(f"No valid property header row found in table {table_num} on page {page_num}")
             return []
+        header_row = [str(cell).strip() if cell else "" for cell in table[header_row_index]]
         
         # Process data rows (rows after the header)
         for i in range(header_row_index + 1, len(table)):
@@ -173,6 +299,65 @@ class MetrobankScraper(BaseBankScraper):
         print(f"Extracted {len(properties)} properties from table {table_num} on page {page_num}")
         return properties
     
+    def _find_header_row(self, table: List[List]) -> int:
+        """Find the property header row of a table.
+        
+        Args:
+            table: The table data as a list of rows
+            
+        Returns:
+            Index of the header row, or -1 if the table has none
+        """
+        for i, row in enumerate(table):
+            if not row:
+                continue
+            
+            # Convert all cells to strings and clean them
+            row_str = [str(cell).strip() if cell else "" for cell in row]
+            
+            # Skip disclaimer rows
+            if any("disclaimer" in cell.lower() for cell in row_str if cell):
+                continue
+            
+            # Look for actual property table headers (not disclaimer)
+            # Check if this row contains property-related headers
+            row_text = " ".join(row_str).upper()
+            
+            # Look for common property table header patterns
+            if (any(keyword in row_text for keyword in 
+                   ["PROPERTY", "LOCATION", "PRICE", "AREA", "DESCRIPTION", "TYPE", "CLASSIFICATION"]) and
+                not any(keyword in row_text for keyword in ["DISCLAIMER", "AS-IS", "WHERE-IS", "NO RECOURSE"])):
+                
+                # Additional check: make sure it's not just a single property ID
+                if len([cell for cell in row_str if cell and len(cell) > 5]) >= 3:
+                    print(f"Found property header row at index {i}: {[cell[:50] + '...' if len(cell) > 50 else cell for cell in row_str]}")
+                    return i
+        
+        return -1
+    
+    def _map_rows(self, rows: List[List], header_row: List[str]) -> List[Dict[str, Any]]:
+        """Map table rows to the learned header columns by position.
+        
+        Repeated header rows, the disclaimer row that opens each section and
+        rows with fewer than two filled cells are skipped.
+        
+        Args:
+            rows: Table rows with the same columns as the header
+            header_row: Column names learned from the first table
+            
+        Returns:
+            List of property dictionaries
+        """
+        properties = []
+        for row in rows:
+            row_str = [str(cell).strip() if cell else "" for cell in row]
+            if row_str == header_row or row_str[0].startswith("Disclaimer"):
+                continue
+            if sum(1 for cell in row_str if cell) < 2:
+                continue
+            properties.append(dict(zip(header_row, row_str)))
+        return properties
+    
     def _is_header_row(self, row: List[str]) -> bool:
         """Check if a row looks like a header row.
         
@@ -399,4 +584,54 @@ class MetrobankScraper(BaseBankScraper):
                 
         except Exception as e:
             print(f"Error during Metrobank PDF processing: {e}")
-            return [] 
\ No newline at end of file
+            return []
+
+
+def extract_metrobank_pdf(pdf_path: str, workers: int = 1, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Extract the properties of one Metrobank PDF, e.g. in a batch worker process.
+    
+    Args:
+        pdf_path: Path of the PDF
+        workers: Processes used to extract the PDF's tables
+        backend: PDF backend; defaults to PDF_BACKEND
+        
+    Returns:
+        Property dictionaries keyed by the PDF's column names
+    """
+    scraper = MetrobankScraper(pdf_path=pdf_path, workers=workers, backend=backend)
+    if not scraper._check_pdf():
+        return []
+    return list(scraper._cached_properties())
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Extract Metrobank foreclosed properties from the PDF")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write properties page by page instead of collecting them in memory first")
+    parser.add_argument("--batch", action="store_true",
+                        help="Extract every Metrobank PDF in pdf_input, tagging and deduplicating the properties")
+    parser.add_argument("--memory-limit-mb", type=float, default=None,
+                        help=f"Abort a streaming run above this resident memory in MiB (default: {PDF_MEMORY_LIMIT_MB:g}, 0 = no limit)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to extract the PDF's tables, or PDFs at once in batch mode (default: CPU count)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help=f"PDF backend that reads the page layout (default: {PDF_BACKEND})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the scraper and return a process exit code."""
+    args = parse_args(argv)
+    scraper = MetrobankScraper(workers=args.workers, memory_limit_mb=args.memory_limit_mb, backend=args.backend)
+    if args.batch:
+        scraper.scrape_batch()
+    elif args.stream:
+        scraper.stream_to_file()
+    else:
+        asyncio.run(scraper.scrape())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,86 +1,68 @@
 import sys
 import os
+import asyncio
+import argparse
 # Add the parent directory to sys.path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     from ..utils.base_scraper import BaseBankScraper
+    from ..utils.config import PDF_MEMORY_LIMIT_MB
+    from ..utils.executors import run_in_process
+    from ..utils.json_stream import StreamingJSONWriter
     from ..utils.logger import setup_logger
+    from ..utils.memory import MemoryCeiling
+    from ..utils.pdf_batch import PDF_INPUT_DIR, find_bank_pdfs, run_batch
+    from ..utils.pdf_cache import PDFCache, parser_version
+    from ..utils.pdf_pages import PAGE_TABLE, PDFPLUMBER_VERSION, extract_page_tables, reuse_page_results, scan_pages
 except ImportError:
     from utils.base_scraper import BaseBankScraper
+    from utils.config import PDF_MEMORY_LIMIT_MB
+    from utils.executors import run_in_process
+    from utils.json_stream import StreamingJSONWriter
     from utils.logger import setup_logger
-import pdfplumber
+    from utils.memory import MemoryCeiling
+    from utils.pdf_batch import PDF_INPUT_DIR, find_bank_pdfs, run_batch
+    from utils.pdf_cache import PDFCache, parser_version
+    from utils.pdf_pages import PAGE_TABLE, PDFPLUMBER_VERSION, extract_page_tables, reuse_page_results, scan_pages
+
+# Name of the parser's records in the PDF cache
+PARSER_NAME = "pnb"
+# Start of the PNB PDF file names in pdf_input
+PDF_PREFIX = "pnb"
+# A property listed in several PDFs is kept once, from the newest
+BATCH_KEY_FIELDS = ("Title_ID", "Title/CR No.")
 
 class PNBScraper(BaseBankScraper):
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, pdf_path=None, workers=None, memory_limit_mb=None, **kwargs):
         super().__init__(bank_name="pnb", bank_url="https://www.pnb.com.ph/index.php/search-properties?tpl=2", *args, **kwargs)
         self.bank_name = "pnb"
-        self.pdf_path = self._find_pnb_pdf()
         self.logger = setup_logger("pnb_scraper")
+        # PDF to extract; defaults to the newest PNB PDF in pdf_input
+        self.pdf_path = pdf_path or self._find_pnb_pdf()
+        # Processes that extract the PDF's tables; defaults to the CPU count
+        self.workers = workers or os.cpu_count() or 1
+        self.pdf_cache = PDFCache()
+        # Cached records are reused only while this code and pdfplumber are unchanged
+        self.parser_version = parser_version(PNBScraper, extract_page_tables, PDFPLUMBER_VERSION)
+        # Ceiling of stream_to_file in MiB; 0 disables it
+        self.memory_limit_mb = PDF_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
 
     def _find_pnb_pdf(self):
-        pdf_dir = os.path.join("foreclosed_scraper", "pdf_input")
-        for fname in os.listdir(pdf_dir):
-            if fname.lower().startswith("pnb") and fname.lower().endswith(".pdf"):
-                return os.path.join(pdf_dir, fname)
-        self.logger.error(f"No PDF file starting with 'PNB' found in {pdf_dir}")
+        pdf_files = find_bank_pdfs(PDF_PREFIX)
+        if pdf_files:
+            return str(pdf_files[0][0])
+        self.logger.error(f"No PDF file starting with 'PNB' found in {PDF_INPUT_DIR}")
         return None
 
     async def _extract_property_list(self, crawler=None):
-        if not self.pdf_path:
-            self.logger.error("No PNB PDF file found to scrape.")
-            return []
-        self.logger.info(f"Starting scraping for {self.bank_name} from PDF: {self.pdf_path}")
-        properties = []
-
-        if not os.path.exists(self.pdf_path):
-            self.logger.error(f"PDF file not found at {self.pdf_path}")
+        if not self._check_pdf():
             return []
 
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                current_province = None
-                current_city = None
-                current_contact_person = None
-                current_contact_details = None
-                for page in pdf.pages:
-                    tables = page.extract_tables()
-                    for table in tables:
-                        header = None
-                        for i, row in enumerate(table):
-                            # Detect header row
-                            if row and any("Title_ID" in str(cell) for cell in row):
-                                header = [str(cell).strip() if cell else "" for cell in row]
-                                continue
-                            # Detect metadata row (region/municipality/contact)
-                            if header and row and len([cell for cell in row if cell and str(cell).strip() != ""]) == 1:
-                                meta = row[0].split("|")
-                                meta = [m.strip() for m in meta]
-                                current_province = meta[0] if len(meta) > 0 else None
-                                current_city = meta[1] if len(meta) > 1 else None
-                                current_contact_person = meta[2] if len(meta) > 2 else None
-                                current_contact_details = meta[3] if len(meta) > 3 else None
-                                continue
-                            # Skip empty or malformed rows
-                            if not header or not row or all(cell is None or str(cell).strip() == '' for cell in row):
-                                continue
-                            # Skip rows that are not property data (e.g., repeated header rows)
-                            if row == header:
-                                continue
-                            # Pad row if it's shorter than header
-                            padded_row = list(row) + [None] * (len(header) - len(row))
-                            prop = dict(zip(header, padded_row))
-                            # Attach metadata
-                            prop["Province"] = current_province
-                            prop["City/Municipality"] = current_city
-                            prop["Contact Person"] = current_contact_person
-                            prop["Contact Details"] = current_contact_details
-                            # Only add if at least one main property field is present
-                            main_fields = [
-                                "Title_ID", "Title/CR No.", "Location/Description", "Property use", "Area", "Floor Area", "Minimum Price", "# of Titles", "Status"
-                            ]
-                            if any(prop.get(f) not in [None, "", "-"] for f in main_fields):
-                                properties.append(prop)
+            # Parsed in the shared process pool, so the event loop stays free;
+            # the pool has a process per CPU already, so the pages are not spread further
+            properties = await run_in_process(extract_pnb_pdf, self.pdf_path, 1)
         except Exception as e:
             self.logger.error(f"An error occurred while reading or parsing the PDF: {e}")
             return []
@@ -88,6 +70,126 @@ class PNBScraper(BaseBankScraper):
         self.logger.info(f"Successfully scraped {len(properties)} properties for {self.bank_name}.")
         return properties
 
+    def stream_to_file(self, output_path=None):
+        """
+        Write the properties to the output file page by page instead of collecting them first,
+        so memory use stays flat however long the PDF is. Returns the number of properties written
+        and raises MemoryLimitError if memory use exceeds the configured ceiling.
+        """
+        if not self._check_pdf():
+            return 0
+
+        memory_ceiling = MemoryCeiling(self.memory_limit_mb)
+        with StreamingJSONWriter(output_path or self.output_path, key_fields=()) as writer:
+            for prop in self._cached_properties(memory_ceiling):
+                writer.write(prop)
+        print(f"Saved {writer.written} properties to {writer.path}")
+        if memory_ceiling.peak_mb:
+            self.logger.info(f"Peak resident memory: {memory_ceiling.peak_mb:.0f} MiB")
+        return writer.written
+
+    def scrape_batch(self, output_path=None):
+        """
+        Extract every PNB PDF in pdf_input, several at once. Each property is tagged with its
+        source file and listing date, and a property found in several PDFs is kept once, as listed
+        in the newest one. Returns the merged properties.
+        """
+        properties = run_batch(PDF_PREFIX, extract_pnb_pdf, BATCH_KEY_FIELDS, self.workers)
+        with StreamingJSONWriter(output_path or self.output_path, key_fields=()) as writer:
+            for prop in properties:
+                writer.write(prop)
+        print(f"Saved {writer.written} properties to {writer.path}")
+        return properties
+
+    def _check_pdf(self):
+        if not self.pdf_path:
+            self.logger.error("No PNB PDF file found to scrape.")
+            return False
+        self.logger.info(f"Starting scraping for {self.bank_name} from PDF: {self.pdf_path}")
+
+        if not os.path.exists(self.pdf_path):
+            self.logger.error(f"PDF file not found at {self.pdf_path}")
+            return False
+        return True
+
+    def _cached_properties(self, memory_ceiling=None):
+        """
+        Return an iterator over the stored properties of an unchanged PDF, or over freshly
+        extracted ones that are stored as they are produced.
+        """
+        return self.pdf_cache.records(
+            self.pdf_path, PARSER_NAME, self.parser_version,
+            lambda: self._iter_properties(memory_ceiling)
+        )
+
+    def _iter_properties(self, memory_ceiling=None):
+        """
+        Yield the properties in page order. Raw table rows are extracted page-parallel in worker
+        processes (phase one) and stitched together serially by _stitch_properties (phase two).
+        """
+        # Pages without any painted path cannot hold a table, so only
+        # the table pages found by the cached triage pass are parsed, and
+        # pages unchanged since an earlier PDF reuse their raw rows
+        page_kinds, fingerprints = scan_pages(self.pdf_path, self.pdf_cache)
+        table_pages = [i for i, kind in enumerate(page_kinds) if kind == PAGE_TABLE]
+        self.logger.info(f"{len(table_pages)} of {len(page_kinds)} pages may contain tables")
+        self.logger.info(f"Extracting tables with {self.workers} worker process(es)")
+        page_tables = reuse_page_results(
+            table_pages, fingerprints, self.pdf_cache.page_store(PARSER_NAME, self.parser_version),
+            lambda pages: extract_page_tables(self.pdf_path, self.workers, page_numbers=pages)
+        )
+        yield from self._stitch_properties(page_tables, memory_ceiling)
+
+    def _stitch_properties(self, page_tables, memory_ceiling=None):
+        """
+        Turn raw page tables, in page order, into properties. Single-cell metadata rows set the
+        province, city and contact context for the rows after them, across page breaks, so this
+        pass must see the pages in order; it is cheap next to the table extraction.
+        """
+        current_province = None
+        current_city = None
+        current_contact_person = None
+        current_contact_details = None
+        for page_num, tables in page_tables:
+            for table in tables:
+                header = None
+                for i, row in enumerate(table):
+                    # Detect header row
+                    if row and any("Title_ID" in str(cell) for cell in row):
+                        header = [str(cell).strip() if cell else "" for cell in row]
+                        continue
+                    # Detect metadata row (region/municipality/contact)
+                    if header and row and len([cell for cell in row if cell and str(cell).strip() != ""]) == 1:
+                        meta = row[0].split("|")
+                        meta = [m.strip() for m in meta]
+                        current_province = meta[0] if len(meta) > 0 else None
+                        current_city = meta[1] if len(meta) > 1 else None
+                        current_contact_person = meta[2] if len(meta) > 2 else None
+                        current_contact_details = meta[3] if len(meta) > 3 else None
+                        continue
+                    # Skip empty or malformed rows
+                    if not header or not row or all(cell is None or str(cell).strip() == '' for cell in row):
+                        continue
+                    # Skip rows that are not property data (e.g., repeated header rows)
+                    if row == header:
+                        continue
+                    # Pad row if it's shorter than header
+                    padded_row = list(row) + [None] * (len(header) - len(row))
+                    prop = dict(zip(header, padded_row))
+                    # Attach metadata
+                    prop["Province"] = current_province
+                    prop["City/Municipality"] = current_city
+                    prop["Contact Person"] = current_contact_person
+                    prop["Contact Details"] = current_contact_details
+                    # Only add if at least one main property field is present
+                    main_fields = [
+                        "Title_ID", "Title/CR No.", "Location/Description", "Property use", "Area", "Floor Area", "Minimum Price", "# of Titles", "Status"
+                    ]
+                    if any(prop.get(f) not in [None, "", "-"] for f in main_fields):
+                        yield prop
+            if memory_ceiling is not None:
+                memory_ceiling.check(f"page {page_num}")
+
     def _save_results(self, properties):
         """
         Override to save the extracted properties directly with the correct PNB columns.
@@ -100,4 +202,46 @@ class PNBScraper(BaseBankScraper):
     async def scrape(self):
         properties = await self._extract_property_list()
         self._save_results(properties)
-        return properties 
\ No newline at end of file
+        return properties
+
+
+def extract_pnb_pdf(pdf_path, workers=1):
+    """
+    Extract the properties of one PNB PDF, e.g. in a batch worker process, using up to
+    `workers` processes for its pages.
+    """
+    scraper = PNBScraper(pdf_path=pdf_path, workers=workers)
+    if not scraper._check_pdf():
+        return []
+    return list(scraper._cached_properties())
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Extract PNB foreclosed properties from the PDF")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write properties page by page instead of collecting them in memory first")
+    parser.add_argument("--batch", action="store_true",
+                        help="Extract every PNB PDF in pdf_input, tagging and deduplicating the properties")
+    parser.add_argument("--memory-limit-mb", type=float, default=None,
+                        help=f"Abort a streaming run above this resident memory in MiB (default: {PDF_MEMORY_LIMIT_MB:g}, 0 = no limit)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to extract the PDF's tables, or PDFs at once in batch mode (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the scraper and return a process exit code."""
+    args = parse_args(argv)
+    scraper = PNBScraper(workers=args.workers, memory_limit_mb=args.memory_limit_mb)
+    if args.batch:
+        scraper.scrape_batch()
+    elif args.stream:
+        scraper.stream_to_file()
+    else:
+        asyncio.run(scraper.scrape())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
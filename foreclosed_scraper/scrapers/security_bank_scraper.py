@@ -1,8 +1,15 @@
+import sys
 import os
+# Add the parent directory to sys.path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import re
 import json
 import asyncio
-from typing import Dict, List, Any
+import argparse
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 import io
 
@@ -15,159 +22,504 @@ except ImportError:
     print("PyPDF2 not installed. PDF extraction will not be available.")
     print("Install with: pip install PyPDF2")
 
-class SecurityBankPDFScraper:
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+try:
+    from ..utils.config import PDF_BACKEND
+    from ..utils.executors import run_in_process
+    from ..utils.json_stream import StreamingJSONWriter
+    from ..utils.pdf_batch import find_bank_pdfs, run_batch
+    from ..utils.pdf_cache import PDFCache, parser_version
+    from ..utils.pdf_layout import group_rows, find_header_spans, column_boundaries, split_row
+except ImportError:
+    from utils.config import PDF_BACKEND
+    from utils.executors import run_in_process
+    from utils.json_stream import StreamingJSONWriter
+    from utils.pdf_batch import find_bank_pdfs, run_batch
+    from utils.pdf_cache import PDFCache, parser_version
+    from utils.pdf_layout import group_rows, find_header_spans, column_boundaries, split_row
+
+if HAS_PDFPLUMBER:
+    try:
+        from ..utils.pdf_backends import BACKEND_PDFPLUMBER, open_pdf, resolve_backend
+        from ..utils.pdf_pages import PDFPLUMBER_VERSION, reuse_page_results, scan_pages, split_page_runs
+    except ImportError:
+        from utils.pdf_backends import BACKEND_PDFPLUMBER, open_pdf, resolve_backend
+        from utils.pdf_pages import PDFPLUMBER_VERSION, reuse_page_results, scan_pages, split_page_runs
+
+PROPERTY_TYPES = r'(Residential|Commercial|Agricultural|Industrial|Condominium)'
+PROPERTY_TYPE_SUFFIX = r'(?:\s+(?:Lot|Unit|Building|House|Condo|Property))?'
+
+# The table header is space-separated, not pipe-separated
+TABLE_HEADER_PATTERN = re.compile(r'PROPERTY\s+TYPE\s+PROPERTY\s+DESCRIPTION\s+LOT\s+AREA\s+FLOOR\s+AREA\s+SUGGESTED\s+PRICE\s+SALE\s+PRICE\s+STATUS\s+OF\s+TITLE\s+REMARKS', re.IGNORECASE)
+# A line starting with a property type starts a new record
+PROPERTY_START_PATTERN = re.compile('^' + PROPERTY_TYPES + PROPERTY_TYPE_SUFFIX, re.IGNORECASE)
+AREA_PATTERN = re.compile(r'(\d+(?:,\d+)?(?:\.\d+)?)\s*sqms?\.')
+PRICE_PATTERN = re.compile(r'PHP\s+([\d,]+(?:\.\d+)?)')
+STATUS_PATTERN = re.compile(r'(CONSOLIDATED\s+UNDER\s+SBC|CONSOLIDATED)', re.IGNORECASE)
+# Property type text repeated inside descriptions
+DESCRIPTION_TYPE_PATTERN = re.compile(PROPERTY_TYPES + PROPERTY_TYPE_SUFFIX + r'\s*')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# Lines containing any of these are never description continuations
+NON_DESCRIPTION_KEYWORDS = ('sqms.', 'PHP', 'CONSOLIDATED', 'PROPERTY TYPE', 'PROPERTY DESCRIPTION')
+NON_DESCRIPTION_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in NON_DESCRIPTION_KEYWORDS))
+# Used when the PDF text has no recognizable table header
+FALLBACK_PROPERTY_PATTERN = re.compile(PROPERTY_TYPES + r'(?:\s+(?:Lot|Unit|Building|House|Condo|Property))?\s+([^0-9]+?)\s+(\d+(?:,\d+)?(?:\.\d+)?)\s*sqms\.\s+(?:\d+(?:,\d+)?(?:\.\d+)?\s*sqms\.\s+)?PHP\s+([\d,]+(?:\.\d+)?)', re.IGNORECASE)
+
+# Header labels of the listing table, left to right, and the field of each column
+LAYOUT_COLUMNS = [
+    ("PROPERTY TYPE", "Property_type"),
+    ("PROPERTY DESCRIPTION", "Property_description"),
+    ("LOT AREA", "Lot_area"),
+    ("FLOOR AREA", "Floor_area"),
+    ("SUGGESTED PRICE", "suggested_price"),
+    ("SALE PRICE", "sale_price"),
+    ("STATUS OF TITLE", "status_of_title"),
+    ("REMARKS", "remarks"),
+]
+LAYOUT_LABELS = [label for label, _ in LAYOUT_COLUMNS]
+# A property type cell starting with a category starts a record. "Condominium
+# Unit" is only ever the second line of "Residential Condominium Unit", and
+# "Residential/Agricultural" the second line of "Mixed Classification"
+RECORD_START_PATTERN = re.compile(r'^(Residential|Commercial|Agricultural|Industrial|Mixed)\b(?!/)')
+# Prices sit on the first line of a record, so a priced line also starts one
+SUGGESTED_PRICE_COLUMN = LAYOUT_LABELS.index("SUGGESTED PRICE")
+# Region and city headings above each table, e.g. "LAS PIÑAS" or "MAKATI (cont.)";
+# long ones wrap past the property type column
+SECTION_HEADING_PATTERN = re.compile(r'^[^a-z]+(?:\(cont\.\))?$')
+# The sale mechanics and disclaimer follow the last table
+TABLE_END_PATTERN = re.compile(r'^SALE MECHANICS')
+# Glyphs without a text mapping, such as tabs, come out as "(cid:9)"
+CID_PATTERN = re.compile(r'\(cid:\d+\)')
+DEFAULT_REMARKS = "From Security Bank PDF listing"
+# Name of the layout parser's records in the PDF cache
+PARSER_NAME = "security_bank"
+# Start of the Security Bank PDF file names in pdf_input, matched exactly
+# (as the original "SEC*.pdf" glob did), so e.g. "second-hand.pdf" is not taken
+PDF_PREFIX = "SEC"
+# A property listed in several PDFs is kept once, from the newest
+BATCH_KEY_FIELDS = ("Property_description", "Lot_area", "Floor_area")
+
+
+class SecurityBankTableParser:
+    """Line-by-line state machine over the text of the Security Bank listing table.
+
+    Lines are fed one at a time; a record is emitted as soon as the next
+    record starts (or the input ends), already cleaned and filtered.
+    """
+
     def __init__(self):
+        self.current_property: Dict[str, Any] = {}
+        self.current_description_lines: List[str] = []
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        """Process one line of table text.
+
+        Args:
+            line: A raw line of page text
+
+        Returns:
+            The previous record if this line completed it and it is valid
+        """
+        line = line.strip()
+        if not line:
+            return None
+
+        completed = None
+        current_property = self.current_property
+
+        # Check if this line starts a new property (contains property type keywords)
+        start_match = PROPERTY_START_PATTERN.match(line)
+        if start_match:
+            # Emit previous property if it exists
+            if current_property and current_property.get('Property_type'):
+                completed = self._finish()
+
+            # Start new property
+            current_property = self.current_property = {
+                "Property_type": start_match.group(0).strip(),
+                "Property_description": "",
+                "Lot_area": "",
+                "Floor_area": "",
+                "suggested_price": "",
+                "sale_price": "",
+                "status_of_title": "",
+                "remarks": DEFAULT_REMARKS
+            }
+            self.current_description_lines = []
+
+            # Extract description (rest of the line after property type)
+            description_start = line.find(current_property["Property_type"]) + len(current_property["Property_type"])
+            if description_start < len(line):
+                description_part = line[description_start:].strip()
+                if description_part:
+                    self.current_description_lines.append(description_part)
+
+        # Look for area information (sqms.); the substring test skips the
+        # regex on the many lines that cannot match
+        area_match = 'sqm' in line and AREA_PATTERN.search(line)
+        if area_match:
+            if not current_property.get("Lot_area"):
+                current_property["Lot_area"] = area_match.group(1) + " sqms."
+            elif not current_property.get("Floor_area"):
+                current_property["Floor_area"] = area_match.group(1) + " sqms."
+
+        # Look for price information (PHP format)
+        price_match = 'PHP' in line and PRICE_PATTERN.search(line)
+        if price_match:
+            if not current_property.get("suggested_price"):
+                current_property["suggested_price"] = "PHP " + price_match.group(1)
+            elif not current_property.get("sale_price"):
+                current_property["sale_price"] = "PHP " + price_match.group(1)
+
+        # Look for status information
+        status_match = STATUS_PATTERN.search(line)
+        if status_match and not current_property.get("status_of_title"):
+            current_property["status_of_title"] = status_match.group(0).strip()
+
+        # If this line doesn't start a new property and doesn't contain specific data, it might be continuation of description
+        elif current_property and not NON_DESCRIPTION_PATTERN.search(line):
+            # Only add to description if it's not empty and doesn't look like a header
+            if len(line) > 3 and not line.isupper():
+                self.current_description_lines.append(line)
+
+        return completed
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """Finish the input.
+
+        Returns:
+            The last record if it is valid
+        """
+        if self.current_property and self.current_property.get('Property_type'):
+            return self._finish()
+        return None
+
+    def _finish(self) -> Optional[Dict[str, Any]]:
+        """Clean up the current record's description and apply the validity filter."""
+        record = self.current_property
+        if self.current_description_lines:
+            description = " ".join(self.current_description_lines).strip()
+            # Remove duplicate text patterns
+            description = DESCRIPTION_TYPE_PATTERN.sub('', description)
+            record["Property_description"] = WHITESPACE_PATTERN.sub(' ', description).strip()
+
+        # Drop records with empty descriptions or invalid data
+        description = record.get("Property_description", "")
+        if (record.get("Property_type") and description and len(description) > 10
+                and not description.startswith("Residential")):
+            return record
+        return None
+
+
+def iter_security_bank_records(page_texts: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield listing records from the text of successive PDF pages.
+
+    Pages are buffered only until the table header is found; after that each
+    page is split into lines and fed to the state machine as it arrives.
+
+    Args:
+        page_texts: Extracted text of each page, in order
+
+    Yields:
+        Property records in document order
+    """
+    table_parser = None
+    buffered: List[str] = []
+
+    for text in page_texts:
+        if not text:
+            continue
+        if table_parser is None:
+            buffered.append(text + "\n")
+            table_header_match = TABLE_HEADER_PATTERN.search("".join(buffered))
+            if not table_header_match:
+                continue
+            print("Found table header, extracting properties...")
+            table_parser = SecurityBankTableParser()
+            lines = "".join(buffered)[table_header_match.end():].split('\n')
+            buffered = []
+        else:
+            lines = (text + "\n").split('\n')
+
+        for line in lines:
+            record = table_parser.feed(line)
+            if record is not None:
+                yield record
+
+    if table_parser is not None:
+        record = table_parser.close()
+        if record is not None:
+            yield record
+        return
+
+    print("No table header found in PDF text.")
+    print("Looking for alternative patterns...")
+
+    # Try to find properties using alternative patterns
+    for match in FALLBACK_PROPERTY_PATTERN.finditer("".join(buffered)):
+        yield {
+            "Property_type": match.group(1).strip(),
+            "Property_description": match.group(2).strip(),
+            "Lot_area": match.group(3) + " sqms.",
+            "Floor_area": "N/A",
+            "suggested_price": "PHP " + match.group(4),
+            "sale_price": "N/A",
+            "status_of_title": "N/A",
+            "remarks": DEFAULT_REMARKS
+        }
+
+
+def _is_table_end(row_text: str) -> bool:
+    """Return True for the first line after the last listing table."""
+    return bool(TABLE_END_PATTERN.match(row_text))
+
+
+def learn_column_boundaries(pdf) -> Optional[List[float]]:
+    """Find the column boundaries once, from the first page with a table header.
+
+    Args:
+        pdf: An open document, see ``pdf_backends.open_pdf``
+
+    Returns:
+        The x boundaries between adjacent columns, or None if no page has
+        the table header
+    """
+    for page in pdf.pages:
+        rows = group_rows(page.extract_words())
+        for index, row in enumerate(rows):
+            spans = find_header_spans(row, LAYOUT_LABELS)
+            if spans is None:
+                continue
+            body_words = []
+            for body_row in rows[index + 1:]:
+                if _is_table_end(" ".join(word['text'] for word in body_row)):
+                    break
+                body_words.extend(body_row)
+            return column_boundaries(spans, body_words)
+    return None
+
+
+def layout_page_rows(page, boundaries: List[float]) -> Tuple[List[List[str]], bool]:
+    """Split the table lines of one page into column cells.
+
+    Lines above the page's first table header (page title, region heading)
+    are skipped, as are repeated headers and section headings.
+
+    Args:
+        page: A page of an open document, see ``pdf_backends.open_pdf``
+        boundaries: Column boundaries from ``learn_column_boundaries``
+
+    Returns:
+        The cells of each table line in page order, and whether the listing
+        ended on this page
+    """
+    rows = group_rows(page.extract_words())
+    headers = [find_header_spans(row, LAYOUT_LABELS) is not None for row in rows]
+    # Pages without a repeated header are table body from the top
+    start = headers.index(True) + 1 if any(headers) else 0
+
+    table_rows = []
+    for row, is_header in zip(rows[start:], headers[start:]):
+        if is_header:
+            continue
+        if _is_table_end(" ".join(word['text'] for word in row)):
+            return table_rows, True
+        cells = [CID_PATTERN.sub(' ', cell).strip() for cell in split_row(row, boundaries)]
+        if cells[0] and not any(cells[2:]) and SECTION_HEADING_PATTERN.match(cells[0]):
+            continue
+        table_rows.append(cells)
+    return table_rows, False
+
+
+def _layout_pages_worker(pdf_path: str, page_numbers: List[int], boundaries: List[float], backend: str = BACKEND_PDFPLUMBER) -> List[Tuple[List[List[str]], bool]]:
+    """Split a run of pages into cells in a worker process.
+
+    Args:
+        pdf_path: Path of the listing PDF
+        page_numbers: Zero-based page numbers, in order
+        boundaries: Column boundaries shared by all pages
+        backend: PDF backend, see ``pdf_backends.open_pdf``
+
+    Returns:
+        ``layout_page_rows`` for each page
+    """
+    results = []
+    with open_pdf(pdf_path, backend) as pdf:
+        for page_number in page_numbers:
+            page = pdf.pages[page_number]
+            results.append(layout_page_rows(page, boundaries))
+            page.close()
+    return results
+
+
+def assemble_layout_records(pages: Iterable[Tuple[List[List[str]], bool]]) -> List[Dict[str, Any]]:
+    """Stitch the table lines of successive pages into records.
+
+    A line whose property type starts with a category, or that carries a
+    suggested price, starts a record; every other line continues the current record column by column, including
+    lines at the top of a page that continue a record from the page before.
+
+    Args:
+        pages: ``layout_page_rows`` results in page order
+
+    Returns:
+        Property records in document order
+    """
+    records: List[List[List[str]]] = []
+    current = None
+    for rows, table_ended in pages:
+        for cells in rows:
+            if RECORD_START_PATTERN.match(cells[0]) or cells[SUGGESTED_PRICE_COLUMN]:
+                current = [[cell] if cell else [] for cell in cells]
+                records.append(current)
+            elif current is not None:
+                for column, cell in zip(current, cells):
+                    if cell:
+                        column.append(cell)
+        if table_ended:
+            break
+
+    properties = []
+    for columns in records:
+        record = {
+            field: WHITESPACE_PATTERN.sub(' ', " ".join(column)).strip()
+            for (_, field), column in zip(LAYOUT_COLUMNS, columns)
+        }
+        if not record["remarks"]:
+            record["remarks"] = DEFAULT_REMARKS
+        properties.append(record)
+    return properties
+
+
+class SecurityBankPDFScraper:
+    def __init__(self, workers: Optional[int] = None, backend: Optional[str] = None):
+        """Initialize the Security Bank PDF scraper.
+
+        Args:
+            workers: Processes used to lay out pages when run directly; defaults to
+                the CPU count. Scrapes in the shared process pool use one
+            backend: PDF backend that reads the word positions; defaults to PDF_BACKEND
+        """
+        self.workers = workers or os.cpu_count() or 1
         self.output_path = Path(__file__).parent.parent / "data" / "security_bank.json"
         self.pdf_folder = Path(__file__).parent.parent / "pdf_input"
         self.required_fields = [
             "Property_type", "Property_description", "Lot_area", "Floor_area",
             "suggested_price", "sale_price", "status_of_title", "remarks"
         ]
+        self.pdf_cache = PDFCache()
+        # Cached records are reused only while this code, the backend and pdfplumber are unchanged
+        if HAS_PDFPLUMBER:
+            self.backend = resolve_backend(backend or PDF_BACKEND)
+            self.parser_version = parser_version(
+                SecurityBankPDFScraper, group_rows, split_page_runs, open_pdf, PDFPLUMBER_VERSION, self.backend
+            )
+
+    def _extract_with_layout(self, pdf_path: Path) -> Optional[List[Dict[str, Any]]]:
+        """Extract records by word position instead of text heuristics.
+
+        The column boundaries are learned once from the first table header;
+        pages not seen in an earlier version of the PDF are then split into
+        cells by worker processes, and the cells are stitched into records
+        serially in page order.
+
+        Args:
+            pdf_path: Path of the listing PDF
+
+        Returns:
+            Property records, or None if the PDF has no recognizable table header
+        """
+        _, fingerprints = scan_pages(pdf_path, self.pdf_cache)
+        with open_pdf(pdf_path, self.backend) as pdf:
+            boundaries = learn_column_boundaries(pdf)
+            if boundaries is None:
+                print("No table header found in PDF layout.")
+                return None
+            page_count = len(pdf.pages)
+            print(f"Found table header, splitting {page_count} pages into {len(boundaries) + 1} columns...")
+
+            def layout_pages(page_numbers: List[int]) -> Iterator[Tuple[int, Tuple[List[List[str]], bool]]]:
+                workers = min(self.workers, len(page_numbers))
+                if workers <= 1:
+                    # Reuse the open document; the header page is already parsed
+                    for page_number in page_numbers:
+                        page = pdf.pages[page_number]
+                        page_rows = layout_page_rows(page, boundaries)
+                        page.close()
+                        yield page_number + 1, page_rows
+                    return
+
+                # One contiguous run of pages per process; map() keeps page order
+                runs = [[page_numbers[i] for i in run] for run in split_page_runs(len(page_numbers), workers)]
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(
+                        _layout_pages_worker, [str(pdf_path)] * len(runs), runs,
+                        [boundaries] * len(runs), [self.backend] * len(runs)
+                    )
+                    for run, run_pages in zip(runs, results):
+                        for page_number, page_rows in zip(run, run_pages):
+                            yield page_number + 1, page_rows
+
+            # Pages unchanged since an earlier PDF with the same columns reuse their cells
+            page_store = self.pdf_cache.page_store(PARSER_NAME, f"{self.parser_version} {boundaries}")
+            pages = [
+                page_rows
+                for _, page_rows in reuse_page_results(range(page_count), fingerprints, page_store, layout_pages)
+            ]
+
+        return assemble_layout_records(pages)
 
     async def _extract_property_list(self) -> List[Dict[str, Any]]:
-        if not HAS_PDF_READER:
-            print("PyPDF2 not installed. Cannot extract properties from PDF.")
+        if not HAS_PDFPLUMBER and not HAS_PDF_READER:
+            print("Neither pdfplumber nor PyPDF2 is installed. Cannot extract properties from PDF.")
             return []
         print("Searching for Security Bank PDF in pdf_input folder...")
-        pdf_files = list(self.pdf_folder.glob("SEC*.pdf"))
+        pdf_files = find_bank_pdfs(PDF_PREFIX, self.pdf_folder, case_sensitive=True)
         if not pdf_files:
             print("No Security Bank PDF file found in pdf_input folder.")
             return []
-        pdf_path = pdf_files[0]
+        # The newest listing, when several PDFs are present, parsed in the
+        # shared process pool so the event loop stays free; the pool has a
+        # process per CPU already, so the pages are not spread further
+        backend = self.backend if HAS_PDFPLUMBER else None
+        return await run_in_process(extract_security_bank_pdf, str(pdf_files[0][0]), 1, backend)
+
+    def extract_pdf(self, pdf_path: Path) -> List[Dict[str, Any]]:
+        """Extract the properties of one Security Bank PDF.
+
+        Args:
+            pdf_path: Path of the PDF
+
+        Returns:
+            Property records
+        """
         print(f"Extracting properties from PDF: {pdf_path}")
-        properties = []
+        if HAS_PDFPLUMBER:
+            try:
+                # An unchanged PDF is not parsed again; a PDF without a
+                # table header yields no records and falls back to text
+                properties = list(self.pdf_cache.records(
+                    pdf_path, PARSER_NAME, self.parser_version,
+                    lambda: self._extract_with_layout(pdf_path) or []
+                ))
+                if properties:
+                    print(f"Extracted {len(properties)} properties from PDF.")
+                    return properties
+            except Exception as e:
+                print(f"Error extracting PDF layout, falling back to text extraction: {e}")
+        if not HAS_PDF_READER:
+            return []
         try:
             with open(pdf_path, "rb") as f:
                 pdf_reader = PdfReader(f)
-                full_text = ""
-                for page in pdf_reader.pages:
-                    text = page.extract_text()
-                    if text:
-                        full_text += text + "\n"
-            print(f"Extracted text from {len(pdf_reader.pages)} pages.")
-            
-            # Find the table header - it's space-separated, not pipe-separated
-            table_header_match = re.search(r'PROPERTY\s+TYPE\s+PROPERTY\s+DESCRIPTION\s+LOT\s+AREA\s+FLOOR\s+AREA\s+SUGGESTED\s+PRICE\s+SALE\s+PRICE\s+STATUS\s+OF\s+TITLE\s+REMARKS', full_text, re.IGNORECASE)
-            if table_header_match:
-                print("Found table header, extracting properties...")
-                # Get content after the header
-                table_content = full_text[table_header_match.end():]
-                
-                # Split into lines and process each property entry
-                lines = table_content.split('\n')
-                current_property = {}
-                current_description_lines = []
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Check if this line starts a new property (contains property type keywords)
-                    if re.search(r'^(Residential|Commercial|Agricultural|Industrial|Condominium)', line, re.IGNORECASE):
-                        # Save previous property if it exists
-                        if current_property and current_property.get('Property_type'):
-                            # Clean up the description
-                            if current_description_lines:
-                                current_property["Property_description"] = " ".join(current_description_lines).strip()
-                                # Remove duplicate text patterns
-                                current_property["Property_description"] = re.sub(r'(Residential|Commercial|Agricultural|Industrial|Condominium)(?:\s+(?:Lot|Unit|Building|House|Condo|Property))?\s*', '', current_property["Property_description"])
-                                current_property["Property_description"] = re.sub(r'\s+', ' ', current_property["Property_description"]).strip()
-                            properties.append(current_property)
-                        
-                        # Start new property
-                        current_property = {
-                            "Property_type": "",
-                            "Property_description": "",
-                            "Lot_area": "",
-                            "Floor_area": "",
-                            "suggested_price": "",
-                            "sale_price": "",
-                            "status_of_title": "",
-                            "remarks": "From Security Bank PDF listing"
-                        }
-                        current_description_lines = []
-                        
-                        # Extract property type from this line
-                        property_type_match = re.search(r'^(Residential|Commercial|Agricultural|Industrial|Condominium)(?:\s+(?:Lot|Unit|Building|House|Condo|Property))?', line, re.IGNORECASE)
-                        if property_type_match:
-                            current_property["Property_type"] = property_type_match.group(0).strip()
-                        
-                        # Extract description (rest of the line after property type)
-                        description_start = line.find(current_property["Property_type"]) + len(current_property["Property_type"])
-                        if description_start < len(line):
-                            description_part = line[description_start:].strip()
-                            if description_part:
-                                current_description_lines.append(description_part)
-                    
-                    # Look for area information (sqms.)
-                    area_match = re.search(r'(\d+(?:,\d+)?(?:\.\d+)?)\s*sqms?\.', line)
-                    if area_match:
-                        if not current_property.get("Lot_area"):
-                            current_property["Lot_area"] = area_match.group(1) + " sqms."
-                        elif not current_property.get("Floor_area"):
-                            current_property["Floor_area"] = area_match.group(1) + " sqms."
-                    
-                    # Look for price information (PHP format)
-                    price_match = re.search(r'PHP\s+([\d,]+(?:\.\d+)?)', line)
-                    if price_match:
-                        if not current_property.get("suggested_price"):
-                            current_property["suggested_price"] = "PHP " + price_match.group(1)
-                        elif not current_property.get("sale_price"):
-                            current_property["sale_price"] = "PHP " + price_match.group(1)
-                    
-                    # Look for status information
-                    status_match = re.search(r'(CONSOLIDATED\s+UNDER\s+SBC|CONSOLIDATED)', line, re.IGNORECASE)
-                    if status_match and not current_property.get("status_of_title"):
-                        current_property["status_of_title"] = status_match.group(0).strip()
-                    
-                    # If this line doesn't start a new property and doesn't contain specific data, it might be continuation of description
-                    elif current_property and not any(keyword in line for keyword in ['sqms.', 'PHP', 'CONSOLIDATED', 'PROPERTY TYPE', 'PROPERTY DESCRIPTION']):
-                        # Only add to description if it's not empty and doesn't look like a header
-                        if line and len(line) > 3 and not line.isupper():
-                            current_description_lines.append(line)
-                
-                # Don't forget the last property
-                if current_property and current_property.get('Property_type'):
-                    # Clean up the description
-                    if current_description_lines:
-                        current_property["Property_description"] = " ".join(current_description_lines).strip()
-                        # Remove duplicate text patterns
-                        current_property["Property_description"] = re.sub(r'(Residential|Commercial|Agricultural|Industrial|Condominium)(?:\s+(?:Lot|Unit|Building|House|Condo|Property))?\s*', '', current_property["Property_description"])
-                        current_property["Property_description"] = re.sub(r'\s+', ' ', current_property["Property_description"]).strip()
-                    properties.append(current_property)
-                
-                # Filter out properties with empty descriptions or invalid data
-                filtered_properties = []
-                for prop in properties:
-                    if (prop.get("Property_type") and 
-                        prop.get("Property_description") and 
-                        len(prop.get("Property_description", "")) > 10 and
-                        not prop.get("Property_description", "").startswith("Residential")):
-                        filtered_properties.append(prop)
-                
-                properties = filtered_properties
-                
-            else:
-                print("No table header found in PDF text.")
-                print("Looking for alternative patterns...")
-                
-                # Try to find properties using alternative patterns
-                property_pattern = r'(Residential|Commercial|Agricultural|Industrial|Condominium)(?:\s+(?:Lot|Unit|Building|House|Condo|Property))?\s+([^0-9]+?)\s+(\d+(?:,\d+)?(?:\.\d+)?)\s*sqms\.\s+(?:\d+(?:,\d+)?(?:\.\d+)?\s*sqms\.\s+)?PHP\s+([\d,]+(?:\.\d+)?)'
-                matches = re.finditer(property_pattern, full_text, re.IGNORECASE)
-                
-                for match in matches:
-                    property_entry = {
-                        "Property_type": match.group(1).strip(),
-                        "Property_description": match.group(2).strip(),
-                        "Lot_area": match.group(3) + " sqms.",
-                        "Floor_area": "N/A",
-                        "suggested_price": "PHP " + match.group(4),
-                        "sale_price": "N/A",
-                        "status_of_title": "N/A",
-                        "remarks": "From Security Bank PDF listing"
-                    }
-                    properties.append(property_entry)
+                page_texts = (page.extract_text() for page in pdf_reader.pages)
+                properties = list(iter_security_bank_records(page_texts))
+                print(f"Extracted text from {len(pdf_reader.pages)} pages.")
             
             print(f"Extracted {len(properties)} properties from PDF.")
             return properties
@@ -185,5 +537,65 @@ class SecurityBankPDFScraper:
         self._save_results(properties)
         return properties
 
+    def scrape_batch(self, output_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """Extract every Security Bank PDF in pdf_input, several at once.
+
+        Each property is tagged with the PDF it came from and that PDF's
+        listing date, and a property found in several PDFs is kept once,
+        as listed in the newest one.
+
+        Args:
+            output_path: JSON file to write; defaults to the scraper's output path
+
+        Returns:
+            The merged properties
+        """
+        backend = self.backend if HAS_PDFPLUMBER else None
+        properties = run_batch(
+            PDF_PREFIX, partial(extract_security_bank_pdf, backend=backend),
+            BATCH_KEY_FIELDS, self.workers, self.pdf_folder, case_sensitive=True
+        )
+        with StreamingJSONWriter(output_path or self.output_path, key_fields=()) as writer:
+            for record in properties:
+                writer.write(record)
+        print(f"Saved {writer.written} properties to {writer.path}")
+        return properties
+
+
+def extract_security_bank_pdf(pdf_path: str, workers: int = 1, backend: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Extract the properties of one Security Bank PDF, e.g. in a batch worker process.
+
+    Args:
+        pdf_path: Path of the PDF
+        workers: Processes used to lay out the PDF's pages
+        backend: PDF backend; defaults to PDF_BACKEND
+
+    Returns:
+        Property records
+    """
+    return SecurityBankPDFScraper(workers=workers, backend=backend).extract_pdf(Path(pdf_path))
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Extract Security Bank foreclosed properties from the PDF")
+    parser.add_argument("--batch", action="store_true",
+                        help="Extract every Security Bank PDF in pdf_input, tagging and deduplicating the properties")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes used to lay out pages, or PDFs at once in batch mode (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the scraper and return a process exit code."""
+    args = parse_args(argv)
+    scraper = SecurityBankPDFScraper(workers=args.workers)
+    if args.batch:
+        scraper.scrape_batch()
+    else:
+        asyncio.run(scraper.scrape())
+    return 0
+
+
 if __name__ == "__main__":
-    asyncio.run(SecurityBankPDFScraper().scrape()) 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
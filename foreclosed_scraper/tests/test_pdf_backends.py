@@ -0,0 +1,109 @@
+"""Compare what the pdfium and pdfplumber backends read from a PDF.
+
+Run from the repository root:
+
+    python -m pytest foreclosed_scraper/tests
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from foreclosed_scraper.check_pdf_backends import PDF_BANKS, compare_records
+from foreclosed_scraper.utils.pdf_backends import BACKEND_PDFIUM, BACKEND_PDFPLUMBER, HAS_PDFIUM, open_pdf
+from foreclosed_scraper.utils.pdf_cache import PDFCache
+
+pytestmark = pytest.mark.skipif(not HAS_PDFIUM, reason="pypdfium2 is not installed")
+
+# Bank PDFs shipped with the repository
+BUNDLED_PDFS = sorted((Path(__file__).resolve().parent.parent / "pdf_input").glob("*.pdf"))
+
+# Largest difference, in points, between the two backends' coordinates
+TOLERANCE = 0.01
+
+# Filled rectangles, two rectangles in one path, a line, a curve, a closed
+# diamond, and rectangles and a line inside nested, transformed forms
+PAGE_CONTENT = b"""
+10 10 100 20 re f
+10 40 50 5 re 70 40 5 50 re f
+10 100 m 200 100 l S
+10 120 m 50 160 90 160 130 120 c S
+300 300 m 320 320 l 340 300 l 320 280 l h f
+q 2 0 0 2 10 10 cm /Outer Do Q
+"""
+OUTER_FORM = b"0 0 30 10 re f 0 20 m 40 20 l S /Inner Do"
+INNER_FORM = b"5 5 10 2 re f"
+
+
+def _write_pdf(path: Path) -> None:
+    """Write a one-page PDF drawing PAGE_CONTENT and its form XObjects."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /XObject << /Outer 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(PAGE_CONTENT), PAGE_CONTENT),
+        b"<< /Type /XObject /Subtype /Form /BBox [0 0 200 200] /Matrix [1 0 0 1 50 50] "
+        b"/Resources << /XObject << /Inner 6 0 R >> >> /Length %d >>\nstream\n%s\nendstream"
+        % (len(OUTER_FORM), OUTER_FORM),
+        b"<< /Type /XObject /Subtype /Form /BBox [0 0 100 100] /Matrix [3 0 0 3 0 0] "
+        b"/Length %d >>\nstream\n%s\nendstream" % (len(INNER_FORM), INNER_FORM),
+    ]
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(data)
+
+
+def _rect_boxes(pdf_path: Path, backend: str):
+    """Return each page's rectangles as sorted (x0, top, x1, bottom) tuples."""
+    with open_pdf(pdf_path, backend) as pdf:
+        pages = []
+        for page in pdf.pages:
+            pages.append(sorted((rect['x0'], rect['top'], rect['x1'], rect['bottom']) for rect in page.rects))
+            page.close()
+        return pages
+
+
+def _assert_same_rects(pdf_path: Path) -> None:
+    expected = _rect_boxes(pdf_path, BACKEND_PDFPLUMBER)
+    actual = _rect_boxes(pdf_path, BACKEND_PDFIUM)
+    assert len(actual) == len(expected)
+    for page_number, (expected_rects, actual_rects) in enumerate(zip(expected, actual), 1):
+        assert len(actual_rects) == len(expected_rects), f"page {page_number}"
+        for expected_rect, actual_rect in zip(expected_rects, actual_rects):
+            assert actual_rect == pytest.approx(expected_rect, abs=TOLERANCE), f"page {page_number}"
+
+
+def test_rects_skip_lines_and_curves_and_include_forms(tmp_path):
+    pdf_path = tmp_path / "shapes.pdf"
+    _write_pdf(pdf_path)
+    # Three rectangles on the page, one in the outer form, one in the inner form
+    assert len(_rect_boxes(pdf_path, BACKEND_PDFPLUMBER)[0]) == 5
+    _assert_same_rects(pdf_path)
+
+
+@pytest.mark.parametrize("pdf_path", BUNDLED_PDFS, ids=lambda path: path.name)
+def test_bundled_pdfs_have_same_rects(pdf_path):
+    _assert_same_rects(pdf_path)
+
+
+@pytest.mark.parametrize("bank, extract", PDF_BANKS, ids=[bank for bank, _ in PDF_BANKS])
+def test_bundled_pdfs_have_same_records(bank, extract, tmp_path):
+    records = {}
+    for backend in (BACKEND_PDFPLUMBER, BACKEND_PDFIUM):
+        # A throwaway cache per backend, so both extract from scratch
+        cache_dir = tmp_path / backend
+        cache = PDFCache(cache_dir / "pdf_cache.json", cache_dir / "records", cache_dir / "pages")
+        records[backend] = extract(backend, cache)
+    if not records[BACKEND_PDFPLUMBER]:
+        pytest.skip(f"no bundled {bank} PDF")
+    assert compare_records(records[BACKEND_PDFPLUMBER], records[BACKEND_PDFIUM]) == []
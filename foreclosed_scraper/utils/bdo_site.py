@@ -0,0 +1,61 @@
+# BDO assets-for-sale site details shared by the Selenium and Playwright
+# scrapers; free of browser-driver imports so either can use them alone
+
+BDO_URL = "https://www.bdo.com.ph/personal/assets-for-sale/real-estate/results-page"
+CRAWL_DELAY = 10  # 10 seconds as specified in robots.txt
+
+LISTING_ITEM_SELECTOR = ".pmu-productListing .item"
+LOADER_SELECTOR = ".loader.loader-visible"
+SHOW_MORE_SELECTOR = ".showMore.pmu-btn.secondaryBtn"
+
+# Candidate selectors per detail field, tried in order until one has text
+DETAIL_FIELD_SELECTORS = {
+    "full_address": [
+        ".property-address", ".address", ".location",
+        "[class*='address']", "[class*='location']"
+    ],
+    "detailed_description": [
+        ".description", ".details", ".summary", ".content",
+        "[class*='description']", "[class*='details']", "p"
+    ],
+    "property_features": [
+        ".features", ".amenities", ".specifications",
+        "[class*='feature']", "[class*='amenity']"
+    ],
+    "contact_info": [
+        ".contact", ".phone", ".email", ".inquiry",
+        "[class*='contact']", "[class*='phone']"
+    ],
+    "viewing_info": [
+        ".viewing", ".schedule", ".appointment",
+        "[class*='viewing']", "[class*='schedule']"
+    ],
+    "terms_conditions": [
+        ".terms", ".conditions", ".disclaimer",
+        "[class*='term']", "[class*='condition']"
+    ]
+}
+# Text must be longer than this to count (the description needs real content)
+DETAIL_MIN_LENGTHS = {"detailed_description": 50}
+
+# Runs the whole selector cascade inside the page and returns one dict.
+# A plain function expression, so both the Selenium and the Playwright
+# scraper can call it.
+DETAIL_EXTRACTION_FN = """
+(selectors, minLengths) => {
+    const result = {};
+    for (const [field, candidates] of Object.entries(selectors)) {
+        const minLength = minLengths[field] || 0;
+        result[field] = "NA";
+        for (const selector of candidates) {
+            const el = document.querySelector(selector);
+            const text = el ? (el.innerText || "").trim() : "";
+            if (text && text.length > minLength) {
+                result[field] = text;
+                break;
+            }
+        }
+    }
+    return result;
+}
+"""
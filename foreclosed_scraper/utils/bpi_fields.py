@@ -0,0 +1,153 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .html_parsing import only_classes
+
+# Labels of the Buena Mano detail page, in the order they take precedence
+# when a paragraph happens to contain more than one. A field of None marks
+# a label whose value is read elsewhere, so the paragraph is skipped.
+SUMMARY_LABELS: List[Tuple[str, Optional[str]]] = [
+    ("Location :", "location"),
+    ("Address:", None),
+    ("Lot Area (sqm) :", "lot_area_sqm"),
+    ("Floor Area (sqm) :", "floor_area_sqm"),
+    ("Price (Php) :", "price_php"),
+    ("Storeys :", "storeys"),
+    ("Bedrooms :", "bedrooms"),
+    ("Bathrooms :", "bathrooms"),
+    ("Usage Classification :", "usage_classification"),
+]
+
+LOCATION_LABELS: List[Tuple[str, Optional[str]]] = [
+    ("Property Classification:", "property_classification"),
+    ("Special Concerns:", None),
+    ("Sales Advisor :", "sales_advisor"),
+    ("Contact No. :", "contact_no"),
+    ("Alternate :", "alternate"),
+    ("Alternate's No. :", "alternate_no"),
+]
+
+SPECIAL_CONCERNS_LABEL = "Special Concerns:"
+
+SUMMARY_CLASS = "property-summary"
+LOCATION_CLASS = "property-location-content"
+
+# Parse only the two sections of a detail page that hold its fields
+DETAIL_REGIONS = only_classes(SUMMARY_CLASS, LOCATION_CLASS)
+
+
+class LabelTable:
+    """Classifies a paragraph by the label it contains with one regex search."""
+
+    def __init__(self, labels: List[Tuple[str, Optional[str]]]):
+        """Compile the labels into a single alternation.
+
+        Args:
+            labels: (label, field) pairs in order of precedence
+        """
+        self.fields = dict(labels)
+        self._priority = {label: i for i, (label, _) in enumerate(labels)}
+        self._pattern = re.compile("|".join(re.escape(label) for label, _ in labels))
+
+    def classify(self, text: str) -> Optional[str]:
+        """Return the label with the highest precedence found in the text.
+
+        Args:
+            text: Paragraph text
+
+        Returns:
+            The matched label, or None if the text contains no label
+        """
+        matches = self._pattern.findall(text)
+        if not matches:
+            return None
+        if len(matches) == 1:
+            return matches[0]
+        return min(matches, key=self._priority.__getitem__)
+
+
+SUMMARY_TABLE = LabelTable(SUMMARY_LABELS)
+LOCATION_TABLE = LabelTable(LOCATION_LABELS)
+
+
+def _extract_labelled(paragraphs, table: LabelTable, fields: Dict[str, str]) -> None:
+    """Fill fields from labelled paragraphs; later paragraphs overwrite earlier ones."""
+    for p in paragraphs:
+        text = p.get_text(strip=True)
+        label = table.classify(text)
+        if label is not None and table.fields[label] is not None:
+            fields[table.fields[label]] = text.replace(label, '').strip()
+
+
+def find_detail_sections(soup):
+    """Find the summary and location sections in one walk of the tree.
+
+    Equivalent to two ``soup.find('div', class_=...)`` calls, but the walk
+    stops as soon as both sections are found instead of searching twice.
+
+    Args:
+        soup: Parsed detail page
+
+    Returns:
+        (summary div, location div); either may be None
+    """
+    summary = location = None
+    for element in soup.descendants:
+        if element.name != 'div':
+            continue
+        classes = element.get('class') or ()
+        if summary is None and SUMMARY_CLASS in classes:
+            summary = element
+        if location is None and LOCATION_CLASS in classes:
+            location = element
+        if summary is not None and location is not None:
+            break
+    return summary, location
+
+
+def extract_detail_fields(soup, address_field: str = "address") -> Dict[str, str]:
+    """Extract the labelled fields of a Buena Mano property detail page.
+
+    Both sections are located in one walk of the tree, and each paragraph is
+    classified with a single regex search of the label table.
+
+    Args:
+        soup: Parsed detail page
+        address_field: Output key for the "Lot ... Block ..." address line
+
+    Returns:
+        Only the fields found on the page, in page order (title first)
+    """
+    fields: Dict[str, str] = {}
+    property_summary, property_location = find_detail_sections(soup)
+
+    if property_summary:
+        h3 = property_summary.find('h3')
+        if h3:
+            fields['title'] = h3.get_text(strip=True)
+
+        paragraphs = property_summary.find_all('p')
+        _extract_labelled(paragraphs, SUMMARY_TABLE, fields)
+
+        # The address is the first paragraph consisting of a single string
+        # that mentions both a lot and a block
+        for p in paragraphs:
+            if p.string and 'Lot' in p.string and 'Block' in p.string:
+                fields[address_field] = p.get_text(strip=True)
+                break
+
+    if property_location:
+        paragraphs = property_location.find_all('p')
+        _extract_labelled(paragraphs, LOCATION_TABLE, fields)
+
+        # The concerns themselves are in the element after the label
+        for p in paragraphs:
+            if p.string and SPECIAL_CONCERNS_LABEL in p.string:
+                next_elem = p.find_next_sibling()
+                if next_elem:
+                    concerns_text = next_elem.get_text(strip=True)
+                    if concerns_text and concerns_text != '-':
+                        fields['special_concerns'] = concerns_text
+                break
+
+    return fields
@@ -0,0 +1,62 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+
+class CrawlCheckpoint:
+    """Periodic on-disk snapshot of a long crawl's progress.
+
+    The state is a plain JSON-serializable dict. Writes go to a temporary
+    file that is then renamed over the checkpoint, so a crash mid-write
+    never leaves a truncated state file behind.
+    """
+
+    def __init__(self, path: Path, save_every: int = 10):
+        """Initialize the checkpoint.
+
+        Args:
+            path: Location of the state file
+            save_every: Number of progress marks between automatic saves
+        """
+        self.path = Path(path)
+        self.save_every = save_every
+        self.state: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._unsaved = 0
+
+    def load(self) -> bool:
+        """Load the state file if it exists.
+
+        Returns:
+            True if a checkpoint was loaded
+        """
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+            return True
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not read checkpoint {self.path}: {e}")
+            return False
+
+    def save(self) -> None:
+        """Write the current state to disk atomically."""
+        with self._lock:
+            self.state["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+
+    def mark_progress(self) -> None:
+        """Count one unit of work and save once ``save_every`` have accumulated."""
+        with self._lock:
+            self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self.save()
@@ -0,0 +1,73 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+# URL patterns for asset types that listing and detail pages don't need
+BLOCKED_ASSET_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav",
+]
+
+
+def build_chrome_options(headless: bool = False, block_assets: bool = False) -> Options:
+    """Build Chrome options for the Selenium scrapers.
+
+    Args:
+        headless: Run Chrome without a window
+        block_assets: Turn off image loading through Chrome prefs
+
+    Returns:
+        Configured Chrome options
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1366,768")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+    else:
+        chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    if block_assets:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    return chrome_options
+
+
+def block_asset_requests(driver) -> None:
+    """Block image, font and media requests through the DevTools protocol.
+
+    Chrome prefs only cover images, so fonts and media are dropped at the
+    network layer before they are fetched.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_ASSET_PATTERNS})
+    except Exception as e:
+        print(f"Warning: Could not enable asset blocking: {e}")
+
+
+def create_chrome_driver(headless: bool = False, block_assets: bool = False):
+    """Start a Chrome driver with the automation flags removed.
+
+    Args:
+        headless: Run Chrome without a window
+        block_assets: Skip images, fonts and media
+
+    Returns:
+        A Selenium Chrome WebDriver
+    """
+    driver = webdriver.Chrome(options=build_chrome_options(headless, block_assets))
+    if block_assets:
+        block_asset_requests(driver)
+
+    # Remove automation flags
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
@@ -20,6 +20,15 @@ USER_AGENT = os.getenv(
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
 )
 
+# Resident memory ceiling (MiB) for streaming PDF extraction; 0 disables it
+PDF_MEMORY_LIMIT_MB = float(os.getenv("PDF_MEMORY_LIMIT_MB", "0"))
+
+# BeautifulSoup tree builder of the HTML scrapers: "html.parser", "lxml" or "auto" (lxml when installed)
+HTML_PARSER = os.getenv("HTML_PARSER", "html.parser")
+
+# Layout engine of the PDF scrapers: "pdfplumber" or the faster "pdfium" (needs pypdfium2)
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfplumber")
+
 # Output Settings
 OUTPUT_DIRECTORY = os.getenv("OUTPUT_DIRECTORY", "./data")
 OUTPUT_PATH = Path(__file__).parent.parent / Path(OUTPUT_DIRECTORY.strip("./"))
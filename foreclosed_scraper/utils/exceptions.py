@@ -2,4 +2,10 @@ class ScrapingError(Exception):
     """
     Custom exception for errors encountered during scraping.
     """
-    pass 
\ No newline at end of file
+    pass 
+
+class MemoryLimitError(ScrapingError):
+    """
+    Raised when a scraper's memory use stays above its configured ceiling.
+    """
+    pass
@@ -0,0 +1,170 @@
+import os
+import time
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional
+
+# Threads parsing HTML for the scrapers of one event loop
+HTML_THREADS = 4
+
+# Seconds between two event-loop lag samples
+LAG_SAMPLE_INTERVAL = 0.05
+
+# A callback this many seconds late is reported as a stall
+LAG_WARN_SECONDS = 0.5
+
+_lock = threading.Lock()
+_process_pool: Optional[ProcessPoolExecutor] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+
+
+def process_pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by all PDF scrapers, starting it on first use."""
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _process_pool
+
+
+def thread_pool() -> ThreadPoolExecutor:
+    """Return the thread pool shared by all HTML parsing, starting it on first use."""
+    global _thread_pool
+    with _lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=HTML_THREADS, thread_name_prefix="html-parse")
+        return _thread_pool
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut the shared pools down; they are started again when next used.
+
+    Args:
+        wait: Wait for running work to finish
+    """
+    global _process_pool, _thread_pool
+    with _lock:
+        pools = [pool for pool in (_process_pool, _thread_pool) if pool is not None]
+        _process_pool = _thread_pool = None
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+async def run_in_process(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run CPU-bound work, such as parsing a PDF, in the shared process pool.
+
+    The function and its arguments must be picklable, i.e. defined at
+    module level, and so must its result. The pool already has a process
+    per CPU, so the work must not start processes of its own (PDF
+    extractors are called with ``workers=1``).
+
+    Args:
+        func: Function to call
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        What the function returned
+    """
+    global _process_pool
+    pool = process_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, partial(func, *args, **kwargs))
+    except BrokenProcessPool:
+        # A worker died; later calls get a fresh pool
+        with _lock:
+            if _process_pool is pool:
+                _process_pool = None
+        raise
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run blocking work, such as parsing HTML, in the shared thread pool.
+
+    Args:
+        func: Function to call
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+
+    Returns:
+        What the function returned
+    """
+    return await asyncio.get_running_loop().run_in_executor(thread_pool(), partial(func, *args, **kwargs))
+
+
+class LoopLagMonitor:
+    """Measure how late the event loop wakes up a sleeping task.
+
+    While the monitor runs, a task sleeps for ``interval`` seconds in a
+    loop; any time beyond that is lag, i.e. time the loop spent in a
+    callback that did not yield. Long stalls are printed as they happen.
+
+    Usage::
+
+        async with LoopLagMonitor() as monitor:
+            await asyncio.gather(...)
+        print(monitor.summary())
+    """
+
+    def __init__(self, interval: float = LAG_SAMPLE_INTERVAL, warn_after: float = LAG_WARN_SECONDS):
+        """Initialize the monitor.
+
+        Args:
+            interval: Seconds between two samples
+            warn_after: Lag in seconds above which a stall is printed
+        """
+        self.interval = interval
+        self.warn_after = warn_after
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sample(self) -> None:
+        """Sleep repeatedly and record how late each wake-up is."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            self.samples.append(lag)
+            if lag > self.warn_after:
+                print(f"Event loop stalled for {lag * 1000:.0f} ms")
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._sample())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def max_lag(self) -> float:
+        """Largest lag seen, in seconds."""
+        return max(self.samples, default=0.0)
+
+    @property
+    def mean_lag(self) -> float:
+        """Average lag, in seconds."""
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def summary(self) -> str:
+        """Describe the lag measured so far."""
+        stalls = sum(1 for lag in self.samples if lag > self.warn_after)
+        return (f"Event loop lag: max {self.max_lag * 1000:.0f} ms, mean {self.mean_lag * 1000:.1f} ms "
+                f"over {len(self.samples)} samples, {stalls} stall(s) above {self.warn_after * 1000:.0f} ms")
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import bs4
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    import lxml  # only BeautifulSoup's tree builder uses it
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Part of every cached parser version, as the trees built change between releases
+HTML_PARSING_VERSION = f"beautifulsoup4 {bs4.__version__}" + (f", lxml {lxml.__version__}" if HAS_LXML else "")
+
+# Tree builders accepted by the HTML_PARSER setting; html.parser is the
+# default and "auto" picks lxml when it is installed
+PARSER_HTML = "html.parser"
+PARSER_LXML = "lxml"
+PARSER_AUTO = "auto"
+HTML_PARSERS = (PARSER_AUTO, PARSER_LXML, PARSER_HTML)
+
+
+def resolve_parser(parser: Optional[str] = None) -> str:
+    """Return the BeautifulSoup tree builder to use.
+
+    Args:
+        parser: One of HTML_PARSERS, e.g. the HTML_PARSER setting; empty for html.parser
+
+    Returns:
+        PARSER_LXML or PARSER_HTML
+    """
+    parser = (parser or PARSER_HTML).strip().lower()
+    if parser not in HTML_PARSERS:
+        raise ValueError(f"Unknown HTML parser {parser!r}; choose one of {', '.join(HTML_PARSERS)}")
+    if parser == PARSER_HTML:
+        return PARSER_HTML
+    if not HAS_LXML:
+        if parser == PARSER_LXML:
+            print("lxml not installed, using html.parser. Install with: pip install lxml")
+        return PARSER_HTML
+    return PARSER_LXML
+
+
+def only_classes(*class_names: str, name: str = 'div', prefix: bool = False) -> SoupStrainer:
+    """Restrict parsing to elements carrying one of the given classes, with their content.
+
+    While parsing, a strainer sees the raw ``class`` attribute, so a plain
+    ``class_=`` filter would miss ``class="col result-each"``; the classes
+    are split here before they are compared.
+
+    Args:
+        class_names: CSS classes of the regions to keep
+        name: Tag name of the regions
+        prefix: Also keep classes that merely start with one of the names
+
+    Returns:
+        A strainer for ``parse_html``
+    """
+    wanted = frozenset(class_names)
+
+    def matches(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        if prefix:
+            return any(cls.startswith(class_names) for cls in classes)
+        return not wanted.isdisjoint(classes)
+
+    return SoupStrainer(name, class_=matches)
+
+
+def parse_html(html: str, only: Optional[SoupStrainer] = None, parser: Optional[str] = None) -> BeautifulSoup:
+    """Parse a page, optionally building only the regions a scraper reads.
+
+    Regions that match ``only`` become top-level elements of the returned
+    tree, each with all of its content; everything else is dropped while
+    parsing, so scripts, navigation and footers never become objects.
+
+    Args:
+        html: Page source
+        only: Strainer from ``only_classes`` or ``bs4.SoupStrainer``; the
+            whole page by default
+        parser: Tree builder, see ``resolve_parser``
+
+    Returns:
+        The parsed tree
+    """
+    return BeautifulSoup(html, resolve_parser(parser), parse_only=only)
+
+
+@contextmanager
+def parsed_html(html: str, only: Optional[SoupStrainer] = None, parser: Optional[str] = None) -> Iterator[BeautifulSoup]:
+    """Parse a page with ``parse_html`` and decompose the tree when the block ends.
+
+    Decomposing breaks the tree's parent/child reference cycles, so its
+    memory is returned at once instead of at the next garbage collection.
+    Extracted values must be plain strings (``get_text()``, attribute
+    values), not elements or ``NavigableString`` objects, which would keep
+    the tree alive or be emptied by the decomposition.
+
+    Args:
+        html: Page source
+        only: Regions to build, see ``parse_html``
+        parser: Tree builder, see ``resolve_parser``
+
+    Yields:
+        The parsed tree
+    """
+    soup = parse_html(html, only, parser)
+    try:
+        yield soup
+    finally:
+        # Decomposing follows next_element, which does not link the regions
+        # of a strained tree to each other, so each one is released on its own
+        for region in list(soup.contents):
+            if isinstance(region, Tag):
+                region.decompose()
+        soup.decompose()
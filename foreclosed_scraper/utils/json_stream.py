@@ -0,0 +1,103 @@
+import os
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Set
+
+# Unique records buffered before they are encoded and written together
+FLUSH_EVERY = 64
+
+
+class StreamingJSONWriter:
+    """Write a JSON array of records one at a time, dropping duplicates.
+
+    Records go straight to a temporary file as they are produced; on close
+    the array is terminated and the file renamed over the target, so readers
+    never see a half-written result. The output is byte-identical to
+    ``json.dump(records, f, indent=2, ensure_ascii=False)``.
+
+    Duplicates are detected with an index instead of a second pass: the
+    first key field with a real value (not empty and not ``"NA"``) decides,
+    and records without any key are always written.
+    """
+
+    def __init__(self, path: Path, key_fields: Sequence[str] = ("property_id", "detail_url"), indent: int = 2):
+        """Open the temporary output file.
+
+        Args:
+            path: Final location of the JSON file
+            key_fields: Fields used for deduplication, in order of preference
+            indent: Indentation of the JSON output
+        """
+        self.path = Path(path)
+        self.key_fields = tuple(key_fields)
+        # Encoding a list and slicing off its brackets yields the elements
+        # already indented one level, exactly as json.dump would write them
+        self._encoder = json.JSONEncoder(indent=indent, ensure_ascii=False)
+        self.written = 0
+        self.duplicates = 0
+        self._seen: Dict[str, Set[Any]] = {field: set() for field in self.key_fields}
+        self._pending: List[Dict[str, Any]] = []
+        self._flushed = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._file.write("[")
+
+    def __enter__(self) -> "StreamingJSONWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """Append a record unless it duplicates one already written.
+
+        Args:
+            record: JSON-serializable record
+
+        Returns:
+            True if the record was written, False if it was a duplicate
+        """
+        for field in self.key_fields:
+            value = record.get(field)
+            if value and value != "NA":
+                if value in self._seen[field]:
+                    self.duplicates += 1
+                    return False
+                self._seen[field].add(value)
+                break
+
+        self._pending.append(record)
+        self.written += 1
+        if len(self._pending) >= FLUSH_EVERY:
+            self._flush()
+        return True
+
+    def _flush(self) -> None:
+        """Encode and write the buffered records."""
+        if not self._pending:
+            return
+        items = self._encoder.encode(self._pending)[2:-2]
+        self._file.write((",\n" if self._flushed else "\n") + items)
+        self._flushed += len(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        """Terminate the array and atomically replace the target file."""
+        if self._file.closed:
+            return
+        self._flush()
+        self._file.write("\n]" if self.written else "]")
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """Discard the output and leave any existing target file untouched."""
+        self._pending = []
+        if not self._file.closed:
+            self._file.close()
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
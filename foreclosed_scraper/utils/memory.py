@@ -0,0 +1,124 @@
+import gc
+import os
+from typing import List, Optional
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+from .exceptions import MemoryLimitError
+
+
+def _statm_rss_mb(pid: str) -> float:
+    """Read the resident memory of a process from ``/proc/<pid>/statm``, in MiB."""
+    with open(f'/proc/{pid}/statm', 'r') as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def _child_pids() -> List[str]:
+    """Return the pids of this process's descendants, read from ``/proc``."""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # The command name may contain spaces; fields resume after its ")"
+                parents[entry] = f.read().rsplit(')', 1)[1].split()[1]
+        except (OSError, IndexError):
+            continue
+    descendants = []
+    pending = [str(os.getpid())]
+    while pending:
+        parent = pending.pop()
+        children = [pid for pid, ppid in parents.items() if ppid == parent]
+        descendants.extend(children)
+        pending.extend(children)
+    return descendants
+
+
+def rss_mb(include_children: bool = False) -> Optional[float]:
+    """Return the resident memory of this process in MiB.
+
+    Uses psutil when it is installed and ``/proc`` otherwise.
+
+    Args:
+        include_children: Add the memory of child processes, such as the
+            workers extracting PDF pages
+
+    Returns:
+        The resident set size, or None where it cannot be read
+    """
+    if HAS_PSUTIL:
+        process = psutil.Process()
+        used = process.memory_info().rss
+        if include_children:
+            for child in process.children(recursive=True):
+                try:
+                    used += child.memory_info().rss
+                except psutil.Error:
+                    pass  # exited since it was listed
+        return used / 2**20
+    try:
+        used = _statm_rss_mb('self')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    if include_children:
+        try:
+            pids = _child_pids()
+        except OSError:
+            return used
+        for pid in pids:
+            try:
+                used += _statm_rss_mb(pid)
+            except (OSError, ValueError, IndexError):
+                pass  # exited since it was listed
+    return used
+
+
+class MemoryCeiling:
+    """Stop a long-running extraction before it exhausts the machine's memory.
+
+    ``check`` is called between units of work (e.g. after every PDF page).
+    The resident memory of worker processes counts towards the limit, as
+    pages extracted in parallel are held there. When it is above the limit, a garbage collection gets
+    one chance to bring it back under; if it does not, ``MemoryLimitError``
+    is raised.
+    """
+
+    def __init__(self, limit_mb: Optional[float] = None):
+        """Set the ceiling.
+
+        Args:
+            limit_mb: Largest resident memory in MiB; None or 0 disables the checks
+        """
+        self.limit_mb = limit_mb or None
+        self.peak_mb = 0.0
+
+    def check(self, where: str) -> None:
+        """Raise if the process uses more memory than the ceiling allows.
+
+        Args:
+            where: Description of the work just finished, for the error message
+
+        Raises:
+            MemoryLimitError: If the memory stays above the ceiling
+        """
+        if self.limit_mb is None:
+            return
+        used = rss_mb(include_children=True)
+        if used is None:
+            return
+        self.peak_mb = max(self.peak_mb, used)
+        if used <= self.limit_mb:
+            return
+
+        gc.collect()
+        used = rss_mb(include_children=True)
+        if used is not None and used > self.limit_mb:
+            raise MemoryLimitError(
+                f"Memory use of {used:.0f} MiB after {where} exceeds the {self.limit_mb:.0f} MiB ceiling"
+            )
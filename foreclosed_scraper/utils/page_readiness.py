@@ -0,0 +1,157 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# The Playwright scraper only needs the scripts and StepTimer
+try:
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+    HAS_SELENIUM = True
+except ImportError:
+    HAS_SELENIUM = False
+
+# Resolves once the subtree under the selector has had no mutations for
+# quietMs milliseconds, or once timeoutMs has passed.
+DOM_SETTLED_SCRIPT = """
+const [selector, quietMs, timeoutMs, done] = arguments;
+const root = document.querySelector(selector) || document.body;
+const started = performance.now();
+let quietTimer = null;
+const finish = (settled) => {
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done({settled: settled, elapsed_ms: performance.now() - started});
+};
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+observer.observe(root, {childList: true, subtree: true, characterData: true});
+quietTimer = setTimeout(() => finish(true), quietMs);
+const hardTimer = setTimeout(() => finish(false), timeoutMs);
+"""
+
+COUNT_INCREASED_SCRIPT = """
+const [itemSelector, previous, loaderSelector, doneSelector] = arguments;
+if (loaderSelector && document.querySelector(loaderSelector)) {
+    return false;
+}
+const count = document.querySelectorAll(itemSelector).length;
+if (count > previous) {
+    return count;
+}
+if (doneSelector) {
+    const more = document.querySelector(doneSelector);
+    if (!more || more.offsetParent === null) {
+        return count;
+    }
+}
+return false;
+"""
+
+
+class StepTimer:
+    """Thread-safe recorder of how long each named step of a crawl takes."""
+
+    def __init__(self):
+        """Initialize an empty timer."""
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one measurement for a step.
+
+        Args:
+            name: Step name
+            seconds: Duration of this occurrence
+        """
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0.0) + seconds
+            self._counts[name] = self._counts.get(name, 0) + 1
+
+    @contextmanager
+    def step(self, name: str):
+        """Time the body of a ``with`` block as one occurrence of a step."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, total and mean seconds per step."""
+        with self._lock:
+            return {
+                name: {
+                    "count": self._counts[name],
+                    "total_s": round(total, 3),
+                    "mean_s": round(total / self._counts[name], 3),
+                }
+                for name, total in self._totals.items()
+            }
+
+    def print_summary(self) -> None:
+        """Print the per-step timings."""
+        print("\nStep timings:")
+        for name, stats in self.summary().items():
+            print(f"   - {name}: {stats['count']}x, total {stats['total_s']:.1f}s, mean {stats['mean_s']:.2f}s")
+
+
+def wait_for_count_increase(driver, item_selector: str, previous: int, loader_selector: Optional[str] = None,
+                            done_selector: Optional[str] = None, timeout: float = 30) -> int:
+    """Wait until more items are in the DOM than before.
+
+    The wait also ends when the loader is gone and the "load more" control
+    (``done_selector``) has disappeared, which means there is nothing left
+    to load.
+
+    Args:
+        driver: Selenium WebDriver
+        item_selector: CSS selector of the repeated item
+        previous: Item count before the action
+        loader_selector: CSS selector that matches only while loading
+        done_selector: CSS selector of the control that loads more items
+        timeout: Maximum number of seconds to wait
+
+    Returns:
+        The item count when the condition was met, or the current count on timeout
+    """
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script(COUNT_INCREASED_SCRIPT, item_selector, previous,
+                                       loader_selector, done_selector)
+        )
+    except TimeoutException:
+        return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", item_selector)
+
+
+def wait_for_dom_settled(driver, selector: str = "body", quiet_ms: int = 500, timeout: float = 10) -> bool:
+    """Wait until the DOM under a selector stops changing.
+
+    Uses a MutationObserver inside the page, so the wait ends as soon as
+    client-side rendering goes quiet instead of after a fixed sleep.
+
+    Args:
+        driver: Selenium WebDriver
+        selector: Root element to observe
+        quiet_ms: Milliseconds without mutations that count as settled
+        timeout: Maximum number of seconds to wait
+
+    Returns:
+        True if the DOM settled, False if the timeout was reached
+    """
+    # The script resolves itself at the timeout; the driver's limit is only a
+    # backstop and is put back afterwards for the caller's own scripts
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(timeout + 5)
+    try:
+        result = driver.execute_async_script(DOM_SETTLED_SCRIPT, selector, quiet_ms, int(timeout * 1000))
+        return bool(result and result.get("settled"))
+    except TimeoutException:
+        return False
+    finally:
+        driver.set_script_timeout(previous_timeout)
+
@@ -0,0 +1,282 @@
+import ctypes
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pdfplumber
+from pdfplumber.utils.text import WordExtractor
+
+try:
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_raw
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
+# Backend names accepted by open_pdf and the PDF_BACKEND setting
+BACKEND_PDFPLUMBER = "pdfplumber"
+BACKEND_PDFIUM = "pdfium"
+BACKENDS = (BACKEND_PDFPLUMBER, BACKEND_PDFIUM)
+
+# pdfium reports a hyphen it takes for a line-end hyphen as this control code
+PDFIUM_HYPHEN = 0x02
+# pdfium page object type of a path (line, rectangle, curve)
+PDFIUM_PATH_OBJECT = 2
+# Deepest nesting of form XObjects searched for drawn rectangles
+PDFIUM_MAX_FORM_DEPTH = 15
+
+
+def resolve_backend(backend: Optional[str]) -> str:
+    """Return the PDF backend to use, falling back to pdfplumber when pdfium is missing.
+
+    Args:
+        backend: Backend name, e.g. the PDF_BACKEND setting; empty for pdfplumber
+
+    Returns:
+        BACKEND_PDFPLUMBER or BACKEND_PDFIUM
+    """
+    backend = (backend or BACKEND_PDFPLUMBER).strip().lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}; choose one of {', '.join(BACKENDS)}")
+    if backend == BACKEND_PDFIUM and not HAS_PDFIUM:
+        print("pypdfium2 not installed, using pdfplumber. Install with: pip install pypdfium2")
+        return BACKEND_PDFPLUMBER
+    return backend
+
+
+def open_pdf(pdf_path, backend: str = BACKEND_PDFPLUMBER):
+    """Open a PDF for layout extraction with the given backend.
+
+    Both backends return a document usable as a context manager whose
+    ``pages`` hold objects with the pdfplumber page attributes the PDF
+    scrapers read: ``chars``, ``rects``, ``extract_words``,
+    ``extract_tables`` and ``close``.
+
+    Args:
+        pdf_path: Path of the PDF
+        backend: BACKEND_PDFPLUMBER or BACKEND_PDFIUM, see ``resolve_backend``
+
+    Returns:
+        A pdfplumber PDF, or a ``PdfiumDocument``
+    """
+    if backend == BACKEND_PDFIUM:
+        return PdfiumDocument(pdf_path)
+    return pdfplumber.open(pdf_path)
+
+
+def _page_matrix(obj):
+    """Return the matrix taking a pdfium page object's coordinates onto the page.
+
+    An object inside a form XObject is placed by its own matrix and then by
+    the matrix of every form around it.
+    """
+    matrix = obj.get_matrix()
+    container = obj.container
+    while container is not None:
+        matrix = matrix.multiply(container.get_matrix())
+        container = container.container
+    return matrix
+
+
+def _path_rectangles(obj) -> Iterator[Tuple[float, float, float, float]]:
+    """Yield the rectangles among the subpaths of a pdfium path object.
+
+    Mirrors pdfminer's ``paint_path``: a subpath is a rectangle if it is a
+    move and four lines (the last one may be the implicit closing line)
+    that end where they started, with edges parallel to the page axes.
+
+    Args:
+        obj: A pdfium path object
+
+    Yields:
+        (left, bottom, right, top) of each rectangle, in PDF page space
+    """
+    matrix = _page_matrix(obj)
+    x, y = ctypes.c_float(), ctypes.c_float()
+    subpaths = []
+    for i in range(pdfium_raw.FPDFPath_CountSegments(obj)):
+        segment = pdfium_raw.FPDFPath_GetPathSegment(obj, i)
+        kind = pdfium_raw.FPDFPathSegment_GetType(segment)
+        if kind == pdfium_raw.FPDF_SEGMENT_MOVETO or not subpaths:
+            # Points, whether every segment is a line, whether it is closed
+            subpaths.append([[], True, False])
+        subpath = subpaths[-1]
+        pdfium_raw.FPDFPathSegment_GetPoint(segment, x, y)
+        subpath[0].append(matrix.on_point(x.value, y.value))
+        subpath[1] = subpath[1] and kind != pdfium_raw.FPDF_SEGMENT_BEZIERTO
+        subpath[2] = subpath[2] or bool(pdfium_raw.FPDFPathSegment_GetClose(segment))
+
+    for points, straight, closed in subpaths:
+        if closed and points[-1] != points[0]:
+            points.append(points[0])
+        if not straight or len(points) != 5 or points[4] != points[0]:
+            continue
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3), _ = points
+        if (x0 == x1 and y1 == y2 and x2 == x3 and y3 == y0) or (y0 == y1 and x1 == x2 and y2 == y3 and x3 == x0):
+            yield min(x0, x2), min(y0, y2), max(x0, x2), max(y0, y2)
+
+
+class PdfiumPage:
+    """One page read with pdfium, shaped like the pdfplumber page the scrapers expect.
+
+    Characters are placed the way pdfminer places them (loose glyph box;
+    top is the baseline descent plus the font size) and words are grouped
+    by pdfplumber's own WordExtractor, so the layout code downstream runs
+    unchanged. Table finding has no pdfium counterpart and is delegated to
+    pdfplumber for this page.
+    """
+
+    def __init__(self, document: 'PdfiumDocument', index: int, doctop: float):
+        """Load the page.
+
+        Args:
+            document: The open document
+            index: Zero-based page number
+            doctop: Distance from the top of the document to the top of the page
+        """
+        self.document = document
+        self.index = index
+        self.page_number = index + 1
+        self.doctop = doctop
+        self._page = document.pdf[index]
+        self.width, self.height = self._page.get_size()
+        self.rotation = self._page.get_rotation()
+        self._chars: Optional[List[Dict[str, Any]]] = None
+        self._rects: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def chars(self) -> List[Dict[str, Any]]:
+        """Characters in content order, with pdfplumber's position keys."""
+        if self._chars is None:
+            self._chars = self._read_chars()
+        return self._chars
+
+    @property
+    def rects(self) -> List[Dict[str, Any]]:
+        """Rectangles drawn on the page, with pdfplumber's position keys.
+
+        Paths inside form XObjects are included, and only subpaths that
+        pdfminer would report as a rectangle count: four straight edges,
+        closed and axis-aligned once transformed onto the page. Lines and
+        curves are left out, as they are from pdfplumber's ``rects``.
+        """
+        if self._rects is None:
+            self._rects = []
+            for obj in self._page.get_objects(filter=[PDFIUM_PATH_OBJECT], max_depth=PDFIUM_MAX_FORM_DEPTH):
+                for left, bottom, right, top in _path_rectangles(obj):
+                    self._rects.append({
+                        'x0': left, 'x1': right,
+                        'top': self.height - top, 'bottom': self.height - bottom,
+                        'width': right - left, 'height': top - bottom
+                    })
+        return self._rects
+
+    def _read_chars(self) -> List[Dict[str, Any]]:
+        """Read the page's characters from its pdfium text page."""
+        textpage = self._page.get_textpage()
+        box = pdfium_raw.FS_RECTF()
+        chars = []
+        try:
+            for i in range(textpage.count_chars()):
+                # Spaces and line breaks pdfium infers are not in the content stream
+                if pdfium_raw.FPDFText_IsGenerated(textpage, i):
+                    continue
+                code = pdfium_raw.FPDFText_GetUnicode(textpage, i)
+                text = "-" if code == PDFIUM_HYPHEN else chr(code)
+                pdfium_raw.FPDFText_GetLooseCharBox(textpage, i, box)
+                size = pdfium_raw.FPDFText_GetFontSize(textpage, i)
+                top = self.height - (box.bottom + size)
+                chars.append({
+                    'text': text, 'size': size, 'upright': True,
+                    'x0': box.left, 'x1': box.right,
+                    'top': top, 'bottom': self.height - box.bottom,
+                    'doctop': self.doctop + top,
+                    'width': box.right - box.left, 'height': size
+                })
+        finally:
+            textpage.close()
+        return chars
+
+    def extract_words(self, **kwargs) -> List[Dict[str, Any]]:
+        """Group the characters into words, taking pdfplumber's ``extract_words`` options."""
+        return WordExtractor(**kwargs).extract_words(self.chars)
+
+    def extract_tables(self, table_settings: Optional[Dict[str, Any]] = None) -> List[List[List[Optional[str]]]]:
+        """Find the page's tables with pdfplumber."""
+        page = self.document.plumber_pdf().pages[self.index]
+        try:
+            return page.extract_tables(table_settings)
+        finally:
+            page.close()
+
+    def close(self) -> None:
+        """Release the page's characters and pdfium handle."""
+        self._chars = None
+        self._rects = None
+        self._page.close()
+
+
+class _PdfiumPages:
+    """Lazy page sequence of a ``PdfiumDocument``; every access loads a fresh page."""
+
+    def __init__(self, document: 'PdfiumDocument'):
+        self.document = document
+        # Page tops in document space, as pdfplumber's doctop counts them
+        self.doctops = []
+        doctop = 0.0
+        for index in range(len(document.pdf)):
+            self.doctops.append(doctop)
+            doctop += document.pdf.get_page_size(index)[1]
+
+    def __len__(self) -> int:
+        return len(self.doctops)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        page = PdfiumPage(self.document, index, self.doctops[index])
+        # pdfium's text page coordinates ignore /Rotate; let pdfplumber handle rotated pages
+        if page.rotation:
+            page.close()
+            return self.document.plumber_pdf().pages[index]
+        return page
+
+    def __iter__(self) -> Iterator:
+        for index in range(len(self)):
+            yield self[index]
+
+
+class PdfiumDocument:
+    """A PDF opened with pdfium, with pdfplumber opened alongside only if a page needs it."""
+
+    def __init__(self, pdf_path):
+        """Open the PDF.
+
+        Args:
+            pdf_path: Path of the PDF
+        """
+        if not HAS_PDFIUM:
+            raise ImportError("pypdfium2 is required for the pdfium backend: pip install pypdfium2")
+        self.path = str(pdf_path)
+        self.pdf = pdfium.PdfDocument(self.path)
+        self.pages = _PdfiumPages(self)
+        self._plumber = None
+
+    def plumber_pdf(self):
+        """Return the same PDF opened with pdfplumber, opening it on first use."""
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(self.path)
+        return self._plumber
+
+    def close(self) -> None:
+        """Close pdfium and, if it was opened, pdfplumber."""
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        self.pdf.close()
+
+    def __enter__(self) -> 'PdfiumDocument':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,210 @@
+import re
+from datetime import date, datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pdfplumber
+
+# Bank PDFs are dropped here, named after the bank (e.g. METROBANK_..., SEC_...)
+PDF_INPUT_DIR = Path(__file__).parent.parent / "pdf_input"
+
+# Month names and abbreviations used in file names
+MONTHS = {
+    month: number
+    for number, names in enumerate([
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december")
+    ], start=1)
+    for month in names
+}
+# Dates in bank file names: MAY-22-2025, 22-MAY-2025, 2025-05-22 or 20250522
+MONTH_DAY_YEAR_PATTERN = re.compile(r'(?<![a-z])([a-z]{3,9})[-_ .]?(\d{1,2})[-_ .,]+(\d{4})(?!\d)', re.IGNORECASE)
+DAY_MONTH_YEAR_PATTERN = re.compile(r'(?<!\d)(\d{1,2})[-_ .]?([a-z]{3,9})[-_ .,]+(\d{4})(?!\d)', re.IGNORECASE)
+ISO_DATE_PATTERN = re.compile(r'(?<!\d)(\d{4})[-_.]?(\d{2})[-_.]?(\d{2})(?!\d)')
+# PDF date strings: D:YYYYMMDDHHmmSS...
+PDF_DATE_PATTERN = re.compile(r'^(?:D:)?(\d{4})(\d{2})(\d{2})')
+
+Record = Dict[str, Any]
+
+
+def _valid_date(year: str, month: Any, day: str) -> Optional[date]:
+    """Return the date if the parts form one, else None."""
+    try:
+        return date(int(year), int(month), int(day))
+    except (TypeError, ValueError):
+        return None
+
+
+def date_from_name(name: str) -> Optional[date]:
+    """Read the listing date from a PDF's file name.
+
+    Args:
+        name: File name, e.g. ``SEC_UPDATED-LIST-...-AS-OF-MAY-22-2025.pdf``
+
+    Returns:
+        The date, or None if the name has none
+    """
+    for match in MONTH_DAY_YEAR_PATTERN.finditer(name):
+        found = _valid_date(match.group(3), MONTHS.get(match.group(1).lower()), match.group(2))
+        if found:
+            return found
+    for match in DAY_MONTH_YEAR_PATTERN.finditer(name):
+        found = _valid_date(match.group(3), MONTHS.get(match.group(2).lower()), match.group(1))
+        if found:
+            return found
+    for match in ISO_DATE_PATTERN.finditer(name):
+        found = _valid_date(*match.groups())
+        if found:
+            return found
+    return None
+
+
+def listing_date(pdf_path: Path) -> str:
+    """Date a bank PDF: from its file name, else its PDF metadata, else its file time.
+
+    Args:
+        pdf_path: Path of the PDF
+
+    Returns:
+        ISO date string
+    """
+    pdf_path = Path(pdf_path)
+    found = date_from_name(pdf_path.name)
+    if found is None:
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                metadata = pdf.metadata
+        except Exception as e:
+            print(f"Could not read the metadata of {pdf_path.name}: {e}")
+            metadata = {}
+        for field in ("ModDate", "CreationDate"):
+            match = PDF_DATE_PATTERN.match(str(metadata.get(field, "")))
+            found = match and _valid_date(*match.groups())
+            if found:
+                break
+    if not found:
+        found = datetime.fromtimestamp(pdf_path.stat().st_mtime).date()
+    return found.isoformat()
+
+
+def find_bank_pdfs(prefix: str, folder: Path = PDF_INPUT_DIR, case_sensitive: bool = False) -> List[Tuple[Path, str]]:
+    """Find every PDF of a bank, newest listing first.
+
+    Args:
+        prefix: Start of the bank's file names, e.g. "metrobank"
+        folder: Folder to search
+        case_sensitive: Match the prefix and the ".pdf" extension exactly,
+            like a ``glob("<prefix>*.pdf")``, instead of in any case
+
+    Returns:
+        (path, listing date) of each PDF, by listing date then name, newest first
+    """
+    folder = Path(folder)
+    if not folder.is_dir():
+        return []
+    def fold(text: str) -> str:
+        return text if case_sensitive else text.lower()
+
+    pdf_paths = [
+        path for path in folder.iterdir()
+        if path.is_file() and fold(path.name).startswith(fold(prefix)) and fold(path.suffix) == ".pdf"
+    ]
+    dated = [(path, listing_date(path)) for path in pdf_paths]
+    return sorted(dated, key=lambda item: (item[1], item[0].name), reverse=True)
+
+
+def _extract_file(extract: Callable[[str, int], List[Record]], pdf_path: str, workers: int) -> List[Record]:
+    """Extract one PDF, reporting failures instead of raising them."""
+    try:
+        return extract(pdf_path, workers)
+    except Exception as e:
+        print(f"Error extracting {Path(pdf_path).name}: {e}")
+        return []
+
+
+def extract_pdfs(pdf_paths: Sequence[Path], extract: Callable[[str, int], List[Record]], workers: int = 1) -> Iterator[Tuple[Path, List[Record]]]:
+    """Extract several PDFs, one per worker process.
+
+    Args:
+        pdf_paths: PDFs to extract
+        extract: Module-level function returning the records of a PDF path,
+            given the number of processes it may use for the PDF's pages
+        workers: Number of processes
+
+    Yields:
+        (path, records) of each PDF, in the order given
+    """
+    if min(workers, len(pdf_paths)) <= 1:
+        # A lone PDF spreads its pages over the workers instead
+        for pdf_path in pdf_paths:
+            yield pdf_path, _extract_file(extract, str(pdf_path), workers)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(pdf_paths))) as executor:
+        # map() returns results in submission order; each PDF uses one process
+        results = executor.map(
+            _extract_file, [extract] * len(pdf_paths), [str(path) for path in pdf_paths], [1] * len(pdf_paths)
+        )
+        for pdf_path, records in zip(pdf_paths, results):
+            yield pdf_path, records
+
+
+def merge_pdf_records(files: Iterator[Tuple[Path, str, List[Record]]], key_fields: Sequence[str]) -> List[Record]:
+    """Tag records with their source and drop those already listed by a newer PDF.
+
+    Records are compared on ``key_fields`` across files only; two equal
+    records in one PDF are separate listings and both kept. Records whose
+    key fields are all empty are always kept.
+
+    Args:
+        files: (path, listing date, records) of each PDF, newest first
+        key_fields: Fields identifying a property
+
+    Returns:
+        The tagged records, newest PDF first
+    """
+    merged = []
+    listed_by: Dict[Tuple[Any, ...], str] = {}
+    duplicates = 0
+    for pdf_path, date_listed, records in files:
+        source_file = Path(pdf_path).name
+        for record in records:
+            key = tuple(record.get(field) for field in key_fields)
+            if any(value not in (None, "", "NA") for value in key):
+                if listed_by.setdefault(key, source_file) != source_file:
+                    duplicates += 1
+                    continue
+            merged.append({**record, "source_file": source_file, "listing_date": date_listed})
+    if duplicates:
+        print(f"Dropped {duplicates} properties already listed in a newer PDF")
+    return merged
+
+
+def run_batch(prefix: str, extract: Callable[[str, int], List[Record]], key_fields: Sequence[str], workers: int = 1, folder: Path = PDF_INPUT_DIR, case_sensitive: bool = False) -> List[Record]:
+    """Extract every PDF of a bank concurrently and merge the records.
+
+    Args:
+        prefix: Start of the bank's file names
+        extract: Module-level function returning the records of a PDF path,
+            given the number of processes it may use for the PDF's pages
+        key_fields: Fields identifying a property across PDFs
+        workers: Number of PDFs extracted at once
+        folder: Folder to search
+        case_sensitive: Match the file names exactly, see ``find_bank_pdfs``
+
+    Returns:
+        Records of all PDFs tagged with ``source_file`` and ``listing_date``,
+        each property once, as listed in the newest PDF
+    """
+    dated = find_bank_pdfs(prefix, folder, case_sensitive)
+    if not dated:
+        print(f"No PDF file starting with '{prefix.upper()}' found in {folder}")
+        return []
+    print(f"Extracting {len(dated)} PDF(s) with {min(workers, len(dated))} worker process(es)")
+    listing_dates = dict(dated)
+    files = (
+        (pdf_path, listing_dates[pdf_path], records)
+        for pdf_path, records in extract_pdfs([path for path, _ in dated], extract, workers)
+    )
+    return merge_pdf_records(files, key_fields)
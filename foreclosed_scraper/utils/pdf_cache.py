@@ -0,0 +1,327 @@
+import os
+import json
+import inspect
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+try:
+    import msvcrt
+    HAS_MSVCRT = True
+except ImportError:
+    HAS_MSVCRT = False
+
+from .json_stream import StreamingJSONWriter
+
+# Shared by all PDF scrapers; entries are keyed by the PDF's content hash
+CACHE_FILE = Path(__file__).parent.parent / "data" / "pdf_cache.json"
+# Extracted records of each PDF and parser, one JSON file per pair
+RECORDS_DIR = CACHE_FILE.parent / "pdf_records"
+# Extraction results of single pages, one JSON file per parser
+PAGES_DIR = CACHE_FILE.parent / "pdf_pages"
+# Page results not reused for this many days are dropped from the page store
+PAGE_MAX_AGE_DAYS = 90
+
+Record = Dict[str, Any]
+
+# Serializes the read-merge-write of cache files between threads of this
+# process; the lock file next to each cache file does so between processes
+_save_lock = threading.Lock()
+
+
+def sha256_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    """Return the content of a JSON file, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a cache file while it is read, merged and rewritten.
+
+    Args:
+        path: The cache file; the lock is taken on ``<path>.lock`` next to it
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _save_lock, open(path.with_name(f"{path.name}.lock"), 'a+b') as lock_file:
+        if HAS_FCNTL:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        elif HAS_MSVCRT:
+            lock_file.seek(0)
+            while True:
+                try:
+                    # Retries for 10 seconds before giving up; keep waiting
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            elif HAS_MSVCRT:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_json(path: Path, data: Any, **dump_options: Any) -> None:
+    """Write a JSON file atomically through a unique temporary file in its directory.
+
+    Args:
+        path: File to replace
+        data: JSON-serializable content
+        dump_options: Passed to ``json.dump``
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, **dump_options)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def parser_version(*parts: Any) -> str:
+    """Fingerprint the code that turns a PDF into records.
+
+    Args:
+        parts: Classes or functions, whose whole defining module is hashed,
+            and plain strings such as library versions
+
+    Returns:
+        A short digest that changes whenever any of the parts changes
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            digest.update(part.encode('utf-8'))
+        else:
+            with open(inspect.getsourcefile(part), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class PDFCache:
+    """Per-document facts about the PDFs in pdf_input, keyed by content hash.
+
+    A renamed or re-downloaded copy of the same PDF finds its entry again,
+    while a republished PDF gets a fresh one. The index is a single JSON
+    file written atomically; extracted records live in separate files
+    under RECORDS_DIR. A file whose name, size and modification time match
+    an entry is not hashed again.
+    """
+
+    def __init__(self, cache_file: Path = CACHE_FILE, records_dir: Path = RECORDS_DIR, pages_dir: Path = PAGES_DIR):
+        """Load the cache file if it exists.
+
+        Args:
+            cache_file: Location of the JSON cache
+            records_dir: Directory of the cached records
+            pages_dir: Directory of the page stores, see ``page_store``
+        """
+        self.cache_file = Path(cache_file)
+        self.records_dir = Path(records_dir)
+        self.pages_dir = Path(pages_dir)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable PDF cache {self.cache_file}: {e}")
+
+    def entry(self, pdf_path: Path) -> Dict[str, Any]:
+        """Return the mutable cache entry for a PDF's current content.
+
+        Args:
+            pdf_path: Path of the PDF
+
+        Returns:
+            The entry, created empty apart from the file name if the
+            content has not been seen before
+        """
+        entry = self.entries.setdefault(self.digest(pdf_path), {})
+        stat = Path(pdf_path).stat()
+        entry.update(file=Path(pdf_path).name, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        return entry
+
+    def digest(self, pdf_path: Path) -> str:
+        """Return the SHA-256 of a PDF, trusting a known file that is unchanged on disk.
+
+        Args:
+            pdf_path: Path of the PDF
+
+        Returns:
+            The hex digest, which is also the key of the PDF's entry
+        """
+        path = Path(pdf_path)
+        stat = path.stat()
+        for sha256, entry in self.entries.items():
+            if (entry.get('file') == path.name and entry.get('size') == stat.st_size
+                    and entry.get('mtime_ns') == stat.st_mtime_ns):
+                return sha256
+        return sha256_file(path)
+
+    def records(self, pdf_path: Path, parser: str, version: str, extract: Callable[[], Iterable[Record]]) -> Iterator[Record]:
+        """Yield a PDF's records from the cache, or extract and cache them.
+
+        The stored records are used only if they were produced by the same
+        parser version. Otherwise the records of ``extract()`` are passed
+        through while being written to the cache; the new entry is
+        registered only once they have all been produced, so an
+        interrupted or partially consumed extraction leaves no entry.
+
+        Args:
+            pdf_path: Path of the PDF
+            parser: Name of the parser, e.g. the bank
+            version: Version of the parser, see ``parser_version``
+            extract: Produces the records when they are not cached
+
+        Yields:
+            The records of the PDF
+        """
+        entry = self.entry(pdf_path)
+        stored = entry.get('records', {}).get(parser)
+        records_file = self.records_dir / f"{self.digest(pdf_path)}.{parser}.json"
+        if stored is not None and stored.get('version') == version and records_file.exists():
+            try:
+                with open(records_file, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable cached records {records_file}: {e}")
+            else:
+                print(f"Loaded {len(records)} cached {parser} records for unchanged {entry['file']}")
+                yield from records
+                return
+
+        with StreamingJSONWriter(records_file, key_fields=()) as writer:
+            for record in extract():
+                writer.write(record)
+                yield record
+        entry.setdefault('records', {})[parser] = {'version': version, 'count': writer.written}
+        self.save()
+
+    def page_store(self, parser: str, version: str) -> 'PageResultStore':
+        """Return the page results a parser version stored next to this cache.
+
+        Args:
+            parser: Name of the parser, e.g. the bank
+            version: Version of the parser and of any settings all pages share
+
+        Returns:
+            The parser's ``PageResultStore``
+        """
+        return PageResultStore(parser, version, self.pages_dir)
+
+    def save(self) -> None:
+        """Write the cache atomically, keeping entries other threads and processes saved meanwhile."""
+        with _locked(self.cache_file):
+            on_disk = _read_json(self.cache_file) or {}
+            for sha256, entry in on_disk.items():
+                mine = self.entries.setdefault(sha256, entry)
+                if mine is not entry:
+                    # Records cached by another parser run stay registered
+                    mine['records'] = {**entry.get('records', {}), **mine.get('records', {})}
+            _write_json(self.cache_file, self.entries, indent=2)
+
+
+class PageResultStore:
+    """Extraction results of single pages, kept across versions of a PDF.
+
+    Banks republish their full list with only a few pages changed. Results
+    are keyed by page fingerprint (``pdf_pages.page_fingerprint``), so the
+    unchanged pages of a new PDF need not be extracted again. A store
+    belongs to one parser version and starts empty when the version changes.
+    """
+
+    def __init__(self, parser: str, version: str, pages_dir: Path = PAGES_DIR):
+        """Load the parser's stored page results.
+
+        Args:
+            parser: Name of the parser, e.g. the bank
+            version: Version of the parser, see ``parser_version``; may also
+                cover settings every page depends on, such as learned columns
+            pages_dir: Directory of the page stores
+        """
+        self.path = Path(pages_dir) / f"{parser}.json"
+        self.version = version
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self._today = date.today().isoformat()
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == version:
+                    self.pages = data['pages']
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Ignoring unreadable page store {self.path}: {e}")
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self.pages
+
+    def get(self, fingerprint: str) -> Optional[Any]:
+        """Return the stored result of a page and mark it as still in use.
+
+        Args:
+            fingerprint: Fingerprint of the page
+
+        Returns:
+            The result, or None if the page is unknown
+        """
+        page = self.pages.get(fingerprint)
+        if page is None:
+            return None
+        page['seen'] = self._today
+        return page['result']
+
+    def put(self, fingerprint: str, result: Any) -> None:
+        """Store the JSON-serializable result of a page.
+
+        Args:
+            fingerprint: Fingerprint of the page
+            result: What the parser extracted from it
+        """
+        self.pages[fingerprint] = {'seen': self._today, 'result': result}
+
+    def save(self) -> None:
+        """Drop results unused for PAGE_MAX_AGE_DAYS and write the store atomically.
+
+        Pages another thread or process stored for the same version meanwhile are kept.
+        """
+        with _locked(self.path):
+            on_disk = _read_json(self.path) or {}
+            if on_disk.get('version') == self.version:
+                self.pages = {**on_disk.get('pages', {}), **self.pages}
+            oldest = (date.today() - timedelta(days=PAGE_MAX_AGE_DAYS)).isoformat()
+            self.pages = {
+                fingerprint: page for fingerprint, page in self.pages.items()
+                if page['seen'] >= oldest
+            }
+            _write_json(self.path, {'version': self.version, 'pages': self.pages})
@@ -0,0 +1,110 @@
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Words whose tops differ by no more than this (in points) share a text line
+ROW_TOLERANCE = 2.0
+
+Word = Dict[str, Any]
+
+
+def group_rows(words: Iterable[Word], tolerance: float = ROW_TOLERANCE) -> List[List[Word]]:
+    """Group pdfplumber words into text lines by their vertical position.
+
+    Args:
+        words: Words from ``page.extract_words()``
+        tolerance: Largest difference in ``top`` within one line
+
+    Returns:
+        Lines from top to bottom, each sorted left to right
+    """
+    rows: List[List[Word]] = []
+    row_top = None
+    for word in sorted(words, key=lambda w: (w['top'], w['x0'])):
+        if row_top is None or word['top'] - row_top > tolerance:
+            rows.append([word])
+            row_top = word['top']
+        else:
+            rows[-1].append(word)
+    for row in rows:
+        row.sort(key=lambda w: w['x0'])
+    return rows
+
+
+def find_header_spans(row: Sequence[Word], labels: Sequence[str]) -> Optional[List[Tuple[float, float]]]:
+    """Locate each column label of a header line.
+
+    Args:
+        row: One text line, sorted left to right
+        labels: Column labels in left-to-right order, e.g. "LOT AREA"
+
+    Returns:
+        The (x0, x1) extent of every label, or None if the line is not the header
+    """
+    texts = [word['text'] for word in row]
+    spans = []
+    position = 0
+    for label in labels:
+        parts = label.split()
+        while position + len(parts) <= len(texts) and texts[position:position + len(parts)] != parts:
+            position += 1
+        if position + len(parts) > len(texts):
+            return None
+        spans.append((row[position]['x0'], row[position + len(parts) - 1]['x1']))
+        position += len(parts)
+    return spans
+
+
+def column_boundaries(header_spans: Sequence[Tuple[float, float]], data_words: Iterable[Word]) -> List[float]:
+    """Find the x positions that separate the columns of a whitespace table.
+
+    Header labels are usually centred over their columns while the values
+    are left-aligned, so the label extents alone do not bound the data.
+    Between two adjacent labels, the boundary is placed in the middle of
+    the widest vertical strip that no data word crosses.
+
+    Args:
+        header_spans: (x0, x1) of each header label, left to right
+        data_words: Words of the table body
+
+    Returns:
+        One boundary between each pair of adjacent columns
+    """
+    extents = sorted((word['x0'], word['x1']) for word in data_words)
+    boundaries = []
+    for (_, left_end), (right_start, _) in zip(header_spans, header_spans[1:]):
+        if right_start <= left_end:
+            boundaries.append((left_end + right_start) / 2)
+            continue
+
+        # Walk the word extents overlapping the window between the labels
+        best_gap, best_boundary = -1.0, (left_end + right_start) / 2
+        cursor = left_end
+        for x0, x1 in extents:
+            if x1 <= cursor or x0 >= right_start:
+                continue
+            if x0 > cursor and x0 - cursor > best_gap:
+                best_gap, best_boundary = x0 - cursor, (cursor + x0) / 2
+            cursor = max(cursor, x1)
+            if cursor >= right_start:
+                break
+        if right_start > cursor and right_start - cursor > best_gap:
+            best_boundary = (cursor + right_start) / 2
+        boundaries.append(best_boundary)
+    return boundaries
+
+
+def split_row(row: Sequence[Word], boundaries: Sequence[float]) -> List[str]:
+    """Bucket the words of a text line into column cells.
+
+    Args:
+        row: One text line, sorted left to right
+        boundaries: Column boundaries from ``column_boundaries``
+
+    Returns:
+        The text of each column; empty for columns without words
+    """
+    cells: List[List[str]] = [[] for _ in range(len(boundaries) + 1)]
+    for word in row:
+        center = (word['x0'] + word['x1']) / 2
+        cells[bisect_right(boundaries, center)].append(word['text'])
+    return [' '.join(cell) for cell in cells]
@@ -0,0 +1,339 @@
+import re
+import hashlib
+from collections import deque
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+from pdfplumber.utils import extract_text
+
+from .pdf_backends import BACKEND_PDFPLUMBER, open_pdf
+
+# Part of every parser version, as table finding changes between releases
+PDFPLUMBER_VERSION = f"pdfplumber {pdfplumber.__version__}"
+
+# Page runs handed out per worker process; a few runs each even out pages
+# that take longer than others, while every run opens the PDF only once
+RUNS_PER_WORKER = 4
+
+# Runs submitted ahead of the one being consumed, per worker; finished runs
+# wait in this process until their turn, so this bounds the tables held here
+RUNS_IN_FLIGHT_PER_WORKER = 2
+
+# Filled rectangles no thicker than this (in points) are drawn ruling lines
+RULE_THICKNESS = 2.0
+
+# Page kinds assigned by the triage pass
+PAGE_SKIP = "skip"          # nothing written or drawn
+PAGE_METADATA = "metadata"  # text without any painted path: cover, notes, disclaimers
+PAGE_TABLE = "table"        # painted paths, so table finding may find a table
+
+# Literal and hex strings, removed before a content stream is scanned for operators
+STRING_PATTERN = re.compile(rb'\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>')
+# Operators that paint a path; clipping paths end with "n" and are never drawn
+PAINT_PATTERN = re.compile(rb'(?<![\w/*.])[fFSsBb]\*?(?![\w*])')
+# Operators that show text
+TEXT_PATTERN = re.compile(rb'(?<![\w/])(?:Tj|TJ|\'|")(?![\w])')
+
+Table = List[List[Optional[str]]]
+
+
+def split_page_runs(page_count: int, runs: int) -> List[List[int]]:
+    """Split the pages of a document into contiguous runs of similar length.
+
+    Args:
+        page_count: Number of pages
+        runs: Number of runs wanted
+
+    Returns:
+        Zero-based page numbers of each run, in page order
+    """
+    if page_count <= 0:
+        return []
+    runs = max(1, min(runs, page_count))
+    run_length = -(-page_count // runs)
+    pages = list(range(page_count))
+    return [pages[i:i + run_length] for i in range(0, page_count, run_length)]
+
+
+def classify_page(page) -> str:
+    """Classify a page from its raw content stream, without laying it out.
+
+    pdfplumber's default table finding builds tables from ruling lines,
+    rectangles and curves, which only exist where a path is painted. A page
+    that paints no path therefore cannot yield a table, and scanning the
+    content stream for operators is far cheaper than parsing its characters.
+
+    Args:
+        page: A pdfplumber page
+
+    Returns:
+        PAGE_SKIP, PAGE_METADATA or PAGE_TABLE
+    """
+    page_obj = page.page_obj
+    resources = resolve1(page_obj.resources) or {}
+    for xobject in (resolve1(resources.get('XObject')) or {}).values():
+        # Form XObjects carry their own content; do not guess what they draw
+        subtype = resolve1(xobject).get('Subtype')
+        if subtype is not None and getattr(subtype, 'name', None) == 'Form':
+            return PAGE_TABLE
+
+    content = b"\n".join(resolve1(stream).get_data() for stream in page_obj.contents)
+    content = STRING_PATTERN.sub(b" ", content)
+    if PAINT_PATTERN.search(content):
+        return PAGE_TABLE
+    if TEXT_PATTERN.search(content):
+        return PAGE_METADATA
+    return PAGE_SKIP
+
+
+def page_fingerprint(page) -> str:
+    """Fingerprint what a page shows, independently of where it sits in the file.
+
+    Covers the page size, the content streams, the font behind each font
+    resource name and the content of form XObjects. Object numbers are left
+    out, so an unchanged page of a republished PDF keeps its fingerprint;
+    subset fonts carry a per-document tag in their name, so a re-subsetted
+    font (whose glyph codes may differ) counts as a change.
+
+    Args:
+        page: A pdfplumber page
+
+    Returns:
+        SHA-256 hex digest
+    """
+    page_obj = page.page_obj
+    digest = hashlib.sha256(repr(page_obj.mediabox).encode())
+    for stream in page_obj.contents:
+        digest.update(resolve1(stream).get_data())
+
+    resources = resolve1(page_obj.resources) or {}
+    for name, font in sorted((resolve1(resources.get('Font')) or {}).items()):
+        font = resolve1(font)
+        base_font = getattr(font.get('BaseFont'), 'name', None)
+        encoding = getattr(resolve1(font.get('Encoding')), 'name', None)
+        digest.update(f"/{name} {base_font} {encoding}".encode('utf-8'))
+    for name, xobject in sorted((resolve1(resources.get('XObject')) or {}).items()):
+        xobject = resolve1(xobject)
+        if getattr(xobject.get('Subtype'), 'name', None) == 'Form':
+            digest.update(f"/{name}".encode('utf-8') + xobject.get_data())
+    return digest.hexdigest()
+
+
+def scan_pages(pdf_path: str, cache=None) -> Tuple[List[str], List[str]]:
+    """Classify and fingerprint every page of a PDF in one pass over its content streams.
+
+    Args:
+        pdf_path: Path of the PDF
+        cache: Optional ``PDFCache``; both lists are saved in the PDF's entry
+
+    Returns:
+        The kind and the fingerprint of each page, in page order
+    """
+    entry = cache.entry(pdf_path) if cache is not None else None
+    if entry is not None and 'page_kinds' in entry and 'page_fingerprints' in entry:
+        return entry['page_kinds'], entry['page_fingerprints']
+
+    with pdfplumber.open(pdf_path) as pdf:
+        page_kinds = [classify_page(page) for page in pdf.pages]
+        page_fingerprints = [page_fingerprint(page) for page in pdf.pages]
+
+    if entry is not None:
+        entry['page_kinds'] = page_kinds
+        entry['page_fingerprints'] = page_fingerprints
+        cache.save()
+    return page_kinds, page_fingerprints
+
+
+def triage_pages(pdf_path: str, cache=None) -> List[str]:
+    """Classify every page of a PDF, reusing the result stored in the PDF cache.
+
+    Args:
+        pdf_path: Path of the PDF
+        cache: Optional ``PDFCache``; the kinds are saved in the PDF's entry
+
+    Returns:
+        The kind of each page, in page order
+    """
+    return scan_pages(pdf_path, cache)[0]
+
+
+def reuse_page_results(page_numbers: Iterable[int], fingerprints: Sequence[str], store, extract: Callable[[List[int]], Iterable[Tuple[int, Any]]]) -> Iterator[Tuple[int, Any]]:
+    """Yield the result of each page, extracting only pages not seen before.
+
+    A page whose fingerprint is in the store reuses the stored result, so a
+    republished PDF costs time in proportion to the pages that changed.
+    Newly extracted results are added to the store, which is saved when
+    the iteration ends, even if it ends early.
+
+    Args:
+        page_numbers: Zero-based pages wanted, in order
+        fingerprints: Fingerprint of every page, see ``page_fingerprint``
+        store: ``PageResultStore`` of the parser
+        extract: Called once with the zero-based pages to extract; yields
+            (one-based page number, result) in page order
+
+    Yields:
+        (one-based page number, result), in page order
+    """
+    page_numbers = list(page_numbers)
+    missing = [page_number for page_number in page_numbers if fingerprints[page_number] not in store]
+    print(f"Reusing {len(page_numbers) - len(missing)} unchanged pages, extracting {len(missing)}")
+    missing_pages = set(missing)
+    fresh = iter(extract(missing)) if missing else iter(())
+    try:
+        for page_number in page_numbers:
+            fingerprint = fingerprints[page_number]
+            if page_number in missing_pages:
+                _, result = next(fresh)
+                store.put(fingerprint, result)
+            else:
+                result = store.get(fingerprint)
+            yield page_number + 1, result
+    finally:
+        store.save()
+
+
+def ruling_lines(page, thickness: float = RULE_THICKNESS) -> Tuple[List[float], List[float]]:
+    """Read the table rules a page draws as thin filled rectangles.
+
+    Args:
+        page: A pdfplumber page
+        thickness: Largest width (or height) of a rule
+
+    Returns:
+        Sorted x positions of the vertical rules and y positions of the
+        horizontal rules
+    """
+    vertical = set()
+    horizontal = set()
+    for rect in page.rects:
+        width = rect['x1'] - rect['x0']
+        height = rect['bottom'] - rect['top']
+        if width <= thickness < height:
+            vertical.add((rect['x0'] + rect['x1']) / 2)
+        elif height <= thickness < width:
+            horizontal.add((rect['top'] + rect['bottom']) / 2)
+    return sorted(vertical), sorted(horizontal)
+
+
+def extract_grid(page, vertical_lines: List[float], horizontal_lines: List[float]) -> Table:
+    """Extract the table bounded by known column and row lines.
+
+    Gives the same cell text as ``page.extract_tables()`` on a fully ruled
+    table, but each character is placed by bisecting the lines once instead
+    of being tested against every row and cell. Unlike table finding,
+    spanning cells are split at every column line.
+
+    Args:
+        page: A pdfplumber page
+        vertical_lines: Sorted x positions of the column lines
+        horizontal_lines: Sorted y positions of the row lines
+
+    Returns:
+        The rows of the table, top to bottom
+    """
+    column_count = len(vertical_lines) - 1
+    row_count = len(horizontal_lines) - 1
+    cells = [[[] for _ in range(column_count)] for _ in range(row_count)]
+    for char in page.chars:
+        column = bisect_right(vertical_lines, (char['x0'] + char['x1']) / 2) - 1
+        row = bisect_right(horizontal_lines, (char['top'] + char['bottom']) / 2) - 1
+        if 0 <= column < column_count and 0 <= row < row_count:
+            cells[row][column].append(char)
+    return [[extract_text(cell) if cell else "" for cell in row] for row in cells]
+
+
+def _iter_page_tables(pdf, page_numbers: List[int], table_settings: Optional[Dict[str, Any]], ruled_grid: bool = False) -> Iterator[List[Table]]:
+    """Yield the tables of each page, releasing the page's cached layout objects after use."""
+    for page_number in page_numbers:
+        page = pdf.pages[page_number]
+        vertical_lines, horizontal_lines = ruling_lines(page) if ruled_grid else ([], [])
+        if len(vertical_lines) > 1 and len(horizontal_lines) > 1:
+            tables = [extract_grid(page, vertical_lines, horizontal_lines)]
+        else:
+            tables = page.extract_tables(table_settings)
+        page.close()
+        yield tables
+
+
+def _extract_tables_worker(pdf_path: str, page_numbers: List[int], table_settings: Optional[Dict[str, Any]] = None, ruled_grid: bool = False, backend: str = BACKEND_PDFPLUMBER) -> List[List[Table]]:
+    """Extract the tables of a run of pages in a worker process.
+
+    The worker opens the PDF itself and returns plain row lists.
+
+    Args:
+        pdf_path: Path of the PDF
+        page_numbers: Zero-based page numbers, in order
+        table_settings: pdfplumber table settings, or None for the defaults
+        ruled_grid: Read one table per page from its ruling lines
+        backend: PDF backend, see ``pdf_backends.open_pdf``
+
+    Returns:
+        The tables of each page
+    """
+    with open_pdf(pdf_path, backend) as pdf:
+        return list(_iter_page_tables(pdf, page_numbers, table_settings, ruled_grid))
+
+
+def _yield_run(run: List[int], future) -> Iterator[Tuple[int, List[Table]]]:
+    """Wait for a run submitted by ``extract_page_tables`` and yield its pages."""
+    for page_number, tables in zip(run, future.result()):
+        yield page_number + 1, tables
+
+
+def extract_page_tables(pdf_path: str, workers: int = 1, table_settings: Optional[Dict[str, Any]] = None, ruled_grid: bool = False, page_numbers: Optional[Sequence[int]] = None, backend: str = BACKEND_PDFPLUMBER) -> Iterator[Tuple[int, List[Table]]]:
+    """Extract every page's tables, spreading the pages over worker processes.
+
+    Args:
+        pdf_path: Path of the PDF
+        workers: Number of processes; 1 extracts in this process
+        table_settings: pdfplumber table settings, or None for the defaults
+        ruled_grid: Read each page's table straight from its ruling lines
+            with ``extract_grid``, skipping table finding; pages without
+            rules fall back to ``extract_tables``
+        page_numbers: Zero-based pages to extract, e.g. the table pages
+            found by ``triage_pages``; all pages by default
+        backend: PDF backend, see ``pdf_backends.open_pdf``; table finding
+            itself always runs on pdfplumber
+
+    Yields:
+        (one-based page number, tables of the page), in page order
+    """
+    with open_pdf(pdf_path, backend) as pdf:
+        if page_numbers is None:
+            page_numbers = range(len(pdf.pages))
+        page_numbers = list(page_numbers)
+        workers = min(workers, len(page_numbers))
+        if workers <= 1:
+            tables = _iter_page_tables(pdf, page_numbers, table_settings, ruled_grid)
+            for page_number, page_tables in zip(page_numbers, tables):
+                yield page_number + 1, page_tables
+            return
+
+    runs = [
+        [page_numbers[i] for i in run]
+        for run in split_page_runs(len(page_numbers), workers * RUNS_PER_WORKER)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Runs are submitted a few at a time and consumed in submission
+        # order, so pages stay in order and a slow consumer (e.g. a
+        # streaming writer) never has every run's tables waiting in memory
+        pending = deque()
+        queued = iter(runs)
+        try:
+            for run in queued:
+                pending.append((run, executor.submit(
+                    _extract_tables_worker, str(pdf_path), run, table_settings, ruled_grid, backend
+                )))
+                if len(pending) < workers * RUNS_IN_FLIGHT_PER_WORKER:
+                    continue
+                yield from _yield_run(*pending.popleft())
+            while pending:
+                yield from _yield_run(*pending.popleft())
+        finally:
+            for _, future in pending:
+                future.cancel()
+
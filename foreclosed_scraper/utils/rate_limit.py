@@ -0,0 +1,68 @@
+import time
+import asyncio
+import threading
+
+
+class CrawlDelayLimiter:
+    """Thread-safe limiter that spaces requests by a fixed crawl delay.
+
+    All workers sharing one limiter together make at most one request per
+    ``delay`` seconds, which keeps a pool of drivers inside the host's
+    robots.txt crawl-delay budget.
+    """
+
+    def __init__(self, delay: float):
+        """Initialize the limiter.
+
+        Args:
+            delay: Minimum number of seconds between two requests
+        """
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> float:
+        """Block until the caller may make its next request.
+
+        Returns:
+            The number of seconds the caller waited
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.delay
+        waited = slot - now
+        if waited > 0:
+            time.sleep(waited)
+        return waited
+
+
+class AsyncCrawlDelayLimiter:
+    """asyncio counterpart of CrawlDelayLimiter for coroutines in one event loop.
+
+    Slots are handed out in call order, so concurrent pages and contexts
+    sharing one limiter together stay within the crawl delay.
+    """
+
+    def __init__(self, delay: float):
+        """Initialize the limiter.
+
+        Args:
+            delay: Minimum number of seconds between two requests
+        """
+        self.delay = delay
+        self._next_slot = 0.0
+
+    async def wait(self) -> float:
+        """Sleep until the caller may make its next request.
+
+        Returns:
+            The number of seconds the caller waited
+        """
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.delay
+        waited = slot - now
+        if waited > 0:
+            await asyncio.sleep(waited)
+        return waited